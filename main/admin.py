@@ -1,16 +1,50 @@
+from functools import reduce
+from operator import or_
+
 from django.contrib import admin
+from django.db.models import Q
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import Project, Experience, Education, Skill, About, Certificate
+from django.utils.text import smart_split, unescape_string_literal
+from . import analytics, images, search
+from .admin_tools import EstimatedCountPaginator, ScalableAdminMixin, cached_choices_filter
+from .models import Project, Experience, Education, Skill, About, Certificate, ContactMessage, DailyStat
+
+
+class FullTextSearchMixin:
+    """
+    Answer changelist searches from the FTS5 index instead of icontains scans.
+
+    Search fields that are not in the index (e.g. a certificate's credential
+    ID) are still matched with Django's icontains lookups.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term or not search.is_available():
+            return super().get_search_results(request, queryset, search_term)
+        indexed = search.indexed_fields(self.model)
+        unindexed = [name for name in self.get_search_fields(request) if name.lstrip('^=@') not in indexed]
+        condition = search.match_condition(self.model, search_term)
+        if unindexed:
+            # Split terms like ModelAdmin does: quoted phrases stay whole
+            terms = [unescape_string_literal(term) if term[0] in '"\'' and term[0] == term[-1] else term
+                     for term in smart_split(search_term)]
+            fallback = Q()
+            for term in terms:
+                fallback &= reduce(or_, (Q(**{f"{name.lstrip('^=@')}__icontains": term}) for name in unindexed))
+            condition = fallback if condition is None else condition | fallback
+        if condition is None:
+            return queryset.none(), False
+        return queryset.filter(condition), False
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(ScalableAdminMixin, FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['title', 'date_created', 'is_featured', 'order', 'has_github', 'has_demo', 'image_preview']
     list_filter = ['is_featured', 'date_created']
     search_fields = ['title', 'description', 'technologies']
-    list_editable = ['is_featured', 'order']
+    list_editable = ['is_featured']
     ordering = ['order', '-date_created']
-    date_hierarchy = 'date_created'
     
     fieldsets = (
         ('Basic Information', {
@@ -36,19 +70,21 @@ class ProjectAdmin(admin.ModelAdmin):
 
     def image_preview(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" />', obj.image.url)
+            thumbnail = images.smallest(obj.image_renditions)
+            if obj.image_renditions.get('name') != obj.image.name or not thumbnail:
+                thumbnail = obj.image.name
+            return format_html('<img src="{}" style="max-height: 50px; max-width: 50px;" loading="lazy" />',
+                               obj.image.storage.url(thumbnail))
         return '-'
     image_preview.short_description = 'Image'
 
 
 @admin.register(Experience)
-class ExperienceAdmin(admin.ModelAdmin):
+class ExperienceAdmin(ScalableAdminMixin, FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['position', 'company', 'start_date', 'end_date', 'is_current', 'order']
-    list_filter = ['company', 'start_date']
+    list_filter = [cached_choices_filter('company'), 'start_date']
     search_fields = ['position', 'company', 'description', 'achievements']
-    list_editable = ['order']
     ordering = ['order', '-start_date']
-    date_hierarchy = 'start_date'
     
     fieldsets = (
         ('Position Information', {
@@ -69,13 +105,11 @@ class ExperienceAdmin(admin.ModelAdmin):
 
 
 @admin.register(Education)
-class EducationAdmin(admin.ModelAdmin):
+class EducationAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ['degree', 'field_of_study', 'institution', 'start_date', 'end_date', 'gpa', 'order']
-    list_filter = ['institution', 'degree', 'start_date']
+    list_filter = [cached_choices_filter('institution'), cached_choices_filter('degree'), 'start_date']
     search_fields = ['institution', 'degree', 'field_of_study', 'description']
-    list_editable = ['order']
     ordering = ['order', '-start_date']
-    date_hierarchy = 'start_date'
     
     fieldsets = (
         ('Academic Information', {
@@ -94,13 +128,11 @@ class EducationAdmin(admin.ModelAdmin):
 
 
 @admin.register(Certificate)
-class CertificateAdmin(admin.ModelAdmin):
+class CertificateAdmin(ScalableAdminMixin, FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['title', 'issuing_organization', 'issue_date', 'expiry_date', 'has_credential_id', 'has_image', 'order']
-    list_filter = ['issuing_organization', 'issue_date']
+    list_filter = [cached_choices_filter('issuing_organization', 'issuing organization'), 'issue_date']
     search_fields = ['title', 'issuing_organization', 'credential_id', 'description']
-    list_editable = ['order']
     ordering = ['order', '-issue_date']
-    date_hierarchy = 'issue_date'
     
     fieldsets = (
         ('Certificate Information', {
@@ -132,11 +164,11 @@ class CertificateAdmin(admin.ModelAdmin):
 
 
 @admin.register(Skill)
-class SkillAdmin(admin.ModelAdmin):
+class SkillAdmin(ScalableAdminMixin, FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['name', 'category', 'proficiency', 'proficiency_bar', 'order']
     list_filter = ['category', 'proficiency']
     search_fields = ['name']
-    list_editable = ['category', 'proficiency', 'order']
+    list_editable = ['category', 'proficiency']
     ordering = ['category', 'order', 'name']
     
     fieldsets = (
@@ -186,6 +218,59 @@ class AboutAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(ContactMessage)
+class ContactMessageAdmin(admin.ModelAdmin):
+    list_display = ['name', 'email', 'subject', 'status', 'attempts', 'created_at', 'sent_at']
+    list_filter = ['status']
+    search_fields = ['name', 'email', 'subject']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    readonly_fields = ['name', 'email', 'subject', 'message', 'status', 'attempts', 'next_attempt_at',
+                       'last_error', 'sent_at', 'created_at']
+    actions = ['retry_delivery']
+
+    fieldsets = (
+        ('Message', {
+            'fields': ('name', 'email', 'subject', 'message', 'created_at')
+        }),
+        ('Delivery', {
+            'fields': ('status', 'attempts', 'next_attempt_at', 'sent_at', 'last_error')
+        }),
+    )
+
+    def has_add_permission(self, request):
+        # Messages only come in through the contact form
+        return False
+
+    @admin.action(description='Retry delivery of selected messages')
+    def retry_delivery(self, request, queryset):
+        count = queryset.exclude(status=ContactMessage.STATUS_SENT).update(
+            status=ContactMessage.STATUS_PENDING, attempts=0, next_attempt_at=timezone.now(), last_error='')
+        self.message_user(request, f'{count} message(s) queued for delivery.')
+
+
+@admin.register(DailyStat)
+class DailyStatAdmin(admin.ModelAdmin):
+    change_list_template = 'admin/main/analytics_change_list.html'
+    list_display = ['date', 'kind', 'key', 'project', 'count']
+    list_filter = ['kind', 'date']
+    list_select_related = ['project']
+    date_hierarchy = 'date'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        # Rows are only written by main.analytics
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {**(extra_context or {}), 'dashboard': analytics.dashboard()}
+        return super().changelist_view(request, extra_context)
+
+
 # Customize admin site headers
 admin.site.site_header = 'Portfolio Admin'
 admin.site.site_title = 'Portfolio Admin'
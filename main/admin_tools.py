@@ -0,0 +1,314 @@
+"""
+Admin changelist helpers for large content tables.
+
+* ``EstimatedCountPaginator`` avoids a full COUNT(*) on big tables.
+* ``cached_choices_filter`` builds list filters whose distinct values come
+  from an indexed column and are cached until the model changes.
+* ``ScalableAdminMixin`` adds keyset ("seek") pagination on the default
+  ordering and a drag-and-drop reorder endpoint that persists the ``order``
+  field with a single ``bulk_update``, shifting the rows after the page in
+  one UPDATE when they would otherwise interleave with it.
+"""
+
+import base64
+import json
+
+from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, PermissionDenied, ValidationError
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.db.models import F, Max, Min, Q
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.urls import path
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
+from django.views.decorators.http import require_POST
+
+from . import cache as page_cache
+
+CURSOR_VAR = 'cursor'
+
+# Above this many rows counts are estimated (unfiltered) or capped (filtered)
+COUNT_THRESHOLD = 10000
+
+CHOICES_TIMEOUT = 60 * 60
+
+# Field names with cached filter choices, registered when the admin is imported
+_choice_fields = set()
+
+
+def estimate_row_count(model):
+    """Cheap row count estimate for a whole table, or None if the backend has none"""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            # MAX(rowid) is an index lookup; exact unless rows were deleted
+            cursor.execute(f'SELECT MAX({connection.ops.quote_name(model._meta.pk.column)}) FROM '
+                           f'{connection.ops.quote_name(table)}')
+        elif connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [table])
+        else:
+            return None
+        row = cursor.fetchone()
+    return row[0] if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that never counts more than COUNT_THRESHOLD rows"""
+
+    is_estimate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model)
+            if estimate is not None and estimate > COUNT_THRESHOLD:
+                self.is_estimate = True
+                return estimate
+        count = queryset.order_by()[:COUNT_THRESHOLD + 1].count()
+        if count > COUNT_THRESHOLD:
+            self.is_estimate = True
+        return count
+
+
+def _choices_key(model, field_name):
+    return f'admin:choices:{model._meta.label_lower}:{field_name}'
+
+
+def invalidate_choices(model):
+    """Drop cached filter choices of a model after it changes"""
+    field_names = {f.name for f in model._meta.concrete_fields} & _choice_fields
+    if field_names:
+        cache.delete_many([_choices_key(model, field_name) for field_name in field_names])
+
+
+def cached_choices_filter(field_name, title=None, limit=500):
+    """Return a list filter over the distinct values of an (indexed) column, cached in the shared cache"""
+    _choice_fields.add(field_name)
+
+    def lookups(self, request, model_admin):
+        model = model_admin.model
+        key = _choices_key(model, field_name)
+        values = cache.get(key)
+        if values is None:
+            values = list(
+                model.objects.order_by(field_name).values_list(field_name, flat=True).distinct()[:limit]
+            )
+            cache.set(key, values, CHOICES_TIMEOUT)
+        return [(value, value) for value in values]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{field_name: self.value()})
+        return queryset
+
+    return type(f'{field_name.title().replace("_", "")}CachedFilter', (admin.SimpleListFilter,), {
+        'title': title or field_name.replace('_', ' '),
+        'parameter_name': field_name,
+        'lookups': lookups,
+        'queryset': queryset,
+    })
+
+
+def _encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def _decode_cursor(token):
+    padded = token + '=' * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+class KeysetChangeList(ChangeList):
+    """
+    ChangeList that pages with ``?cursor=`` (WHERE on the sort key) instead of OFFSET.
+
+    Only used when every ordering term is a non-null concrete field, which
+    holds for the models' default orderings; otherwise falls back to the
+    regular page-number pagination.
+    """
+
+    keyset = None
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def _keyset_fields(self):
+        keys = []
+        for term in self.queryset.query.order_by:
+            if not isinstance(term, str):
+                return None
+            name = term.lstrip('-')
+            try:
+                field = self.opts.pk if name == 'pk' else self.opts.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if field.null or not field.concrete:
+                return None
+            keys.append((field, term.startswith('-')))
+        return keys or None
+
+    def get_results(self, request):
+        keys = self._keyset_fields()
+        if keys is None or self.show_all:
+            return super().get_results(request)
+
+        queryset = self.queryset
+        token = request.GET.get(CURSOR_VAR)
+        if token:
+            try:
+                values = [field.to_python(value) for (field, _desc), value in zip(keys, _decode_cursor(token))]
+            except (ValueError, TypeError, ValidationError):
+                values = None
+            if values and len(values) == len(keys):
+                queryset = queryset.filter(self._after(keys, values))
+
+        # Keep a (sliced) queryset: list_editable formsets need one
+        result_list = queryset[:self.list_per_page]
+        rows = list(result_list)
+        next_url = None
+        if len(rows) == self.list_per_page:
+            last = [field.value_from_object(rows[-1]) for field, _desc in keys]
+            if queryset.filter(self._after(keys, last)).exists():
+                next_url = self.get_query_string(
+                    {CURSOR_VAR: _encode_cursor([field.value_to_string(rows[-1]) for field, _desc in keys])}
+                )
+
+        paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        self.result_count = paginator.count
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.result_list = result_list
+        self.can_show_all = False
+        self.multi_page = bool(next_url or token)
+        self.paginator = paginator
+
+        self.keyset = {
+            'next_url': next_url,
+            'first_url': self.get_query_string(remove=[CURSOR_VAR]) if token else None,
+            'count_is_estimate': getattr(paginator, 'is_estimate', False),
+        }
+
+    @staticmethod
+    def _after(keys, values):
+        """WHERE clause selecting rows that sort after the given key values"""
+        condition = Q()
+        for i, (field, descending) in enumerate(keys):
+            step = Q(**{f'{field.attname}__{"lt" if descending else "gt"}': values[i]})
+            for (prev_field, _desc), prev_value in zip(keys[:i], values[:i]):
+                step &= Q(**{prev_field.attname: prev_value})
+            condition |= step
+        return condition
+
+
+class ScalableAdminMixin:
+    """Estimated counts, keyset pagination and drag-and-drop reordering for a ModelAdmin"""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    change_list_template = 'admin/main/scalable_change_list.html'
+    reorder_field = 'order'
+
+    class Media:
+        js = ('js/admin-reorder.js',)
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path('reorder/', self.admin_site.admin_view(self.reorder_view), name='%s_%s_reorder' % info),
+        ] + super().get_urls()
+
+    @staticmethod
+    def _parse_ids(request):
+        try:
+            ids = [int(pk) for pk in json.loads(request.body)['ids']]
+        except (ValueError, KeyError, TypeError):
+            return None
+        return ids if ids and len(ids) == len(set(ids)) else None
+
+    def _order_keys(self, request):
+        """
+        Split the changelist ordering around the reorder field.
+
+        Returns the fields sorted on before it (rows are only reordered among
+        rows sharing their values, e.g. Skill's category) and the
+        (field, descending) keys from the reorder field on, ending with the pk.
+        """
+        opts = self.model._meta
+        ordering = [term for term in (self.get_ordering(request) or opts.ordering) if isinstance(term, str)]
+        names = [term.lstrip('-') for term in ordering]
+        index = names.index(self.reorder_field) if self.reorder_field in names else len(names)
+        partition = names[:index]
+        terms = ordering[index:] or [self.reorder_field]
+        keys = [(opts.pk if term.lstrip('-') == 'pk' else opts.get_field(term.lstrip('-')), term.startswith('-'))
+                for term in terms]
+        if not any(field.primary_key for field, _desc in keys):
+            keys.append((opts.pk, False))
+        return partition, keys
+
+    @transaction.atomic
+    def _save_order(self, request, ids):
+        partition, keys = self._order_keys(request)
+        objs = list(self.model.objects.filter(pk__in=ids).only('pk', self.reorder_field, *partition))
+        if len(objs) != len(ids):
+            return 0
+        position = {pk: i for i, pk in enumerate(ids)}
+        groups = {}
+        for obj in objs:
+            groups.setdefault(tuple(getattr(obj, name) for name in partition), []).append(obj)
+        now = timezone.now()
+        for values, group in groups.items():
+            self._renumber(dict(zip(partition, values)), keys, sorted(group, key=lambda obj: position[obj.pk]), now)
+        return len(objs)
+
+    def _renumber(self, partition, keys, objs, now):
+        """
+        Give ``objs`` consecutive order values in their new order.
+
+        They take the slot right after the rows that sorted before the first
+        of them; the rows after are shifted up in one UPDATE where they would
+        otherwise tie or interleave with them.
+        """
+        field = self.reorder_field
+        moved = [obj.pk for obj in objs]
+        first = self.model.objects.filter(pk__in=moved).order_by(
+            *[f'-{f.attname}' if desc else f.attname for f, desc in keys]).first()
+        others = self.model.objects.filter(**partition).exclude(pk__in=moved)
+        after_first = KeysetChangeList._after(keys, [f.value_from_object(first) for f, _desc in keys])
+        before_max = others.exclude(after_first).aggregate(value=Max(field))['value']
+        start = before_max + 1 if before_max is not None else min(getattr(obj, field) for obj in objs)
+        for i, obj in enumerate(objs):
+            setattr(obj, field, start + i)
+            obj.updated_at = now
+        self.model.objects.bulk_update(objs, [field, 'updated_at'])
+
+        after = others.filter(after_first)
+        after_min = after.aggregate(value=Min(field))['value']
+        end = start + len(objs) - 1
+        if after_min is not None and after_min <= end:
+            after.update(**{field: F(field) + (end + 1 - after_min), 'updated_at': now})
+
+    @method_decorator(require_POST)
+    def reorder_view(self, request):
+        """Persist the posted order of ids with one bulk_update (plus one UPDATE to make room)"""
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        ids = self._parse_ids(request)
+        if ids is None:
+            return HttpResponseBadRequest('Expected {"ids": [...]} with unique integer ids')
+        updated = self._save_order(request, ids)
+        if not updated:
+            return HttpResponseBadRequest('Unknown ids')
+        # bulk_update sends no signals
+        page_cache.invalidate_model(self.model.__name__)
+        return JsonResponse({'updated': updated})
@@ -0,0 +1,245 @@
+"""
+First-party page view and outbound click analytics.
+
+Recording a hit only bumps a counter in this process's ``HitBuffer``: no
+query, no cache round trip. A daemon thread flushes the buffer every
+``ANALYTICS_FLUSH_INTERVAL`` seconds (sooner once it holds
+``ANALYTICS_MAX_PENDING`` distinct counters) as one batched upsert into
+``DailyStat``, the daily roll-up, adding to the day's existing rows with
+``INSERT ... ON CONFLICT DO UPDATE``. Every worker process flushes its own
+counts, and the additions commute, so no coordination is needed. Counts
+that fail to flush are kept for the next attempt; a worker that is killed
+loses at most one interval of hits.
+
+Page views are counted per URL name by ``AnalyticsMiddleware``; clicks on
+project GitHub/demo links are reported by ``main.js`` with
+``navigator.sendBeacon`` to the ``track_click`` view, so the links
+themselves point straight at their targets.
+"""
+
+import atexit
+import logging
+import re
+import threading
+from datetime import timedelta
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from .models import DailyStat, Project
+
+logger = logging.getLogger(__name__)
+
+CLICK_LINKS = ('github', 'demo')
+
+DASHBOARD_DAYS = 30
+
+# Views whose hits are counted
+TRACKED_VIEWS = {
+    'main:home', 'main:projects', 'main:resume', 'main:resume_json', 'main:contact', 'main:search',
+    'main:projects_feed',
+}
+
+# Primary keys are 64-bit; 18 digits always fit
+_PROJECT_ID = re.compile(r'[0-9]{1,18}')
+MAX_PROJECT_ID = 2 ** 63 - 1
+
+_BOT = re.compile(r'bot|crawl|spider|slurp|preview|monitor|curl|wget|python-requests', re.IGNORECASE)
+
+
+class HitBuffer:
+    """Thread-safe in-memory counters keyed by (date, kind, key, project id)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def add(self, key, count=1):
+        """Count a hit; return the number of distinct pending counters"""
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + count
+            return len(self._counts)
+
+    def drain(self):
+        """Take every pending count, leaving the buffer empty"""
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        return counts
+
+    def restore(self, counts):
+        """Put counts that could not be flushed back"""
+        for key, count in counts.items():
+            self.add(key, count)
+
+
+buffer = HitBuffer()
+
+
+def is_bot(request):
+    return bool(_BOT.search(request.headers.get('User-Agent', '')))
+
+
+def parse_project_id(value):
+    """The project id a beacon names, or None if it is not a valid primary key"""
+    if not _PROJECT_ID.fullmatch(value):
+        return None
+    project_id = int(value)
+    return project_id if 0 < project_id <= MAX_PROJECT_ID else None
+
+
+def record_view(url_name):
+    _record((timezone.localdate(), DailyStat.KIND_VIEW, url_name, None))
+
+
+def record_click(project_id, link):
+    _record((timezone.localdate(), DailyStat.KIND_CLICK, f'{project_id}:{link}', project_id))
+
+
+def _record(key):
+    pending = buffer.add(key)
+    flusher = _flusher or _start_flusher()
+    if flusher and pending >= getattr(settings, 'ANALYTICS_MAX_PENDING', 10000):
+        flusher.wake.set()
+
+
+def _upsert_sql(connection):
+    qn = connection.ops.quote_name
+    table = qn(DailyStat._meta.db_table)
+    columns = ', '.join(qn(column) for column in ('date', 'kind', 'key', 'project_id', 'count'))
+    return (
+        f'INSERT INTO {table} ({columns}) VALUES (%s, %s, %s, %s, %s) '
+        f'ON CONFLICT ({qn("date")}, {qn("kind")}, {qn("key")}) '
+        f'DO UPDATE SET {qn("count")} = {table}.{qn("count")} + excluded.{qn("count")}'
+    )
+
+
+def flush():
+    """Write pending counts to DailyStat in one transaction; return the number of rows upserted"""
+    counts = buffer.drain()
+    if not counts:
+        return 0
+    try:
+        # Beacons can name any id; only count clicks on projects that exist
+        clicked = {key[3] for key in counts if key[3] is not None}
+        existing = set(Project.objects.filter(pk__in=clicked).values_list('pk', flat=True)) if clicked else set()
+        rows = [
+            (date, kind, key, project_id, count)
+            for (date, kind, key, project_id), count in counts.items()
+            if project_id is None or project_id in existing
+        ]
+        connection = connections[DEFAULT_DB_ALIAS]
+        with transaction.atomic(using=DEFAULT_DB_ALIAS), connection.cursor() as cursor:
+            cursor.executemany(_upsert_sql(connection), rows)
+    except BaseException:
+        buffer.restore(counts)
+        raise
+    return len(rows)
+
+
+class Flusher(threading.Thread):
+    """Daemon thread flushing the buffer on an interval, with its own database connection"""
+
+    def __init__(self, interval):
+        super().__init__(name='analytics-flusher', daemon=True)
+        self.interval = interval
+        self.wake = threading.Event()
+        self.database = connections[DEFAULT_DB_ALIAS].settings_dict['NAME']
+
+    def run(self):
+        while True:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            self.flush()
+
+    def flush(self):
+        if not connections[DEFAULT_DB_ALIAS].settings_dict['NAME'] == self.database == _database:
+            return
+        try:
+            flush()
+        except Exception:
+            # Counts were kept; log and try again next interval, never stop the thread
+            logger.exception('Flushing analytics failed')
+        finally:
+            try:
+                connections.close_all()
+            except Exception:
+                logger.exception('Closing analytics connections failed')
+
+
+_flusher = None
+_flusher_lock = threading.Lock()
+# The database at startup: the test runner swaps in its own under a running
+# process (and back before exit), and hits recorded by tests must never be
+# flushed, to either database
+_database = connections[DEFAULT_DB_ALIAS].settings_dict['NAME']
+
+
+def _start_flusher():
+    """Start this process's flusher on the first hit; None if analytics are flushed by hand"""
+    global _flusher
+    interval = getattr(settings, 'ANALYTICS_FLUSH_INTERVAL', 30)
+    if interval <= 0:
+        return None
+    with _flusher_lock:
+        if _flusher is None:
+            flusher = Flusher(interval)
+            flusher.start()
+            atexit.register(flusher.flush)
+            _flusher = flusher
+    return _flusher
+
+
+def dashboard(days=DASHBOARD_DAYS):
+    """Totals for the admin dashboard over the last `days` days, from the daily roll-up"""
+    since = timezone.localdate() - timedelta(days=days - 1)
+    # Range scans on the (date, kind, key) unique index
+    stats = DailyStat.objects.filter(date__gte=since)
+    views = stats.filter(kind=DailyStat.KIND_VIEW)
+    clicks = stats.filter(kind=DailyStat.KIND_CLICK)
+    return {
+        'days': days,
+        'pages': views.values('key').annotate(total=Sum('count')).order_by('-total', 'key'),
+        'projects': clicks.values('project__title').annotate(total=Sum('count')).order_by('-total')[:10],
+        'daily': stats.values('date').annotate(
+            views=Sum('count', filter=Q(kind=DailyStat.KIND_VIEW), default=0),
+            clicks=Sum('count', filter=Q(kind=DailyStat.KIND_CLICK), default=0),
+        ).order_by('-date'),
+    }
+
+
+class AnalyticsMiddleware:
+    """Count views of the public pages by people (not bots) in the in-memory buffer"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self._record(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        # Memory only: safe to do on the event loop
+        self._record(request, response)
+        return response
+
+    @staticmethod
+    def _record(request, response):
+        match = getattr(request, 'resolver_match', None)
+        if (
+            match is not None and match.view_name in TRACKED_VIEWS
+            and request.method == 'GET' and response.status_code in (200, 304)
+            and getattr(settings, 'ANALYTICS_ENABLED', True) and not is_bot(request)
+        ):
+            record_view(match.view_name)
@@ -0,0 +1,190 @@
+"""
+Async versions of the public views, served when ``ASYNC_VIEWS`` is on
+(the default under ``portfolio_project/asgi.py``).
+
+Django's async ORM still runs every query on the request's single sync
+thread, one after another. ``fetch_concurrently`` instead runs independent
+queries on a small thread pool, where each worker thread has its own database
+connection, so e.g. the five querysets behind ``resume`` are read in parallel
+while the event loop keeps serving other requests.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django.shortcuts import redirect, render
+from django.views.decorators.csrf import ensure_csrf_cookie
+
+from . import json_resume
+from . import metrics as request_metrics
+from . import routers, views
+from . import search as search_index
+from .cache import cache_page_view
+from .conditional import conditional_view
+from .forms import ContactForm
+from .models import Project, Experience, Education, Skill, About, Certificate, Technology
+
+DEFAULT_WORKERS = 8
+
+_executor = None
+
+arender = sync_to_async(render)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'ASYNC_ORM_WORKERS', DEFAULT_WORKERS),
+            thread_name_prefix='orm',
+        )
+    return _executor
+
+
+def _run_on_worker(func, stats, replica):
+    with request_metrics.collecting(stats), routers.read_from(replica):
+        try:
+            return func()
+        finally:
+            # Same connection lifetime rules as the end of a request (CONN_MAX_AGE)
+            for conn in connections.all(initialized_only=True):
+                conn.close_if_unusable_or_obsolete()
+
+
+async def fetch_concurrently(*funcs):
+    """
+    Call independent, blocking ORM functions in parallel and return their results in order.
+
+    Inside a transaction (e.g. ATOMIC_REQUESTS or a test case) other connections
+    cannot see its writes, so the functions then run one by one on the
+    request's own connection instead.
+    """
+    if any(conn.in_atomic_block for conn in connections.all(initialized_only=True)):
+        return [await sync_to_async(func)() for func in funcs]
+
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    stats = request_metrics.current_stats()
+    replica = routers.current_replica()
+    # run_in_executor does not copy the context, so workers use their own connections
+    return await asyncio.gather(*(
+        loop.run_in_executor(executor, _run_on_worker, func, stats, replica) for func in funcs
+    ))
+
+
+@conditional_view('home')
+@cache_page_view('home')
+async def home(request):
+    """Homepage with intro and featured projects"""
+    about, featured_projects = await fetch_concurrently(
+        About.get_solo,
+        lambda: list(Project.objects.filter(is_featured=True)[:3]),
+    )
+
+    context = {
+        'about': about,
+        'featured_projects': featured_projects,
+    }
+    return await arender(request, 'home.html', context)
+
+
+@conditional_view('projects')
+@cache_page_view('projects')
+async def projects(request):
+    """Projects page with all projects and filtering"""
+    all_projects = Project.objects.all()
+
+    tech_filter = request.GET.get('tech', '')
+    if tech_filter:
+        all_projects = all_projects.filter(tech_catalogue__name=tech_filter)
+
+    project_list, all_techs = await fetch_concurrently(
+        lambda: list(all_projects),
+        lambda: list(Technology.objects.values_list('name', flat=True)),
+    )
+
+    context = {
+        'projects': project_list,
+        'all_techs': all_techs,
+        'current_tech': tech_filter,
+    }
+    return await arender(request, 'projects.html', context)
+
+
+@conditional_view('resume')
+@cache_page_view('resume')
+async def resume(request):
+    """Resume page with experience, education, certificates, and skills"""
+    experiences, education, certificates, skills, about = await fetch_concurrently(
+        lambda: list(Experience.objects.all()),
+        lambda: list(Education.objects.all()),
+        lambda: list(Certificate.objects.all()),
+        lambda: list(Skill.objects.all()),
+        About.get_solo,
+    )
+
+    # Group skills by category
+    skills_by_category = {}
+    for skill in skills:
+        skills_by_category.setdefault(skill.get_category_display(), []).append(skill)
+
+    context = {
+        'experiences': experiences,
+        'education': education,
+        'certificates': certificates,
+        'skills_by_category': skills_by_category,
+        'about': about,
+    }
+    return await arender(request, 'resume.html', context)
+
+
+@conditional_view('resume_json')
+@cache_page_view('resume_json')
+async def resume_json(request):
+    """Resume in the JSON Resume schema, for recruiters' tools and other sites"""
+    about, experiences, education, certificates, skills = await fetch_concurrently(
+        About.get_solo,
+        lambda: list(Experience.objects.all()),
+        lambda: list(Education.objects.all()),
+        lambda: list(Certificate.objects.all()),
+        lambda: list(Skill.objects.all()),
+    )
+    resume = json_resume.build(about, experiences, education, certificates, skills, json_resume.base_url(request))
+    return HttpResponse(json_resume.dumps(resume), content_type='application/json')
+
+
+@ensure_csrf_cookie
+@conditional_view('contact')
+@cache_page_view('contact')
+async def contact(request):
+    """Contact page with contact information and a form queued for background delivery"""
+    form = ContactForm(request.POST or None)
+    if request.method == 'POST' and await sync_to_async(form.is_valid)():
+        if not form.is_spam():
+            await sync_to_async(form.save)()
+        return redirect(views.contact_sent_url())
+
+    about = await sync_to_async(About.get_solo)()
+
+    context = {
+        'about': about,
+        'form': form,
+        'sent': 'sent' in request.GET,
+    }
+    return await arender(request, 'contact.html', context)
+
+
+async def search(request):
+    """Full-text search across projects, experience, certificates and skills"""
+    query = request.GET.get('q', '').strip()
+    results = await sync_to_async(search_index.search)(query) if query else []
+
+    context = {
+        'query': query,
+        'results': results,
+    }
+    return await arender(request, 'search.html', context)
@@ -0,0 +1,231 @@
+"""
+Per-view performance benchmark.
+
+Seeds synthetic datasets of increasing size, drives the public views through
+the Django test client and records latency percentiles, SQL query counts and
+template render time. Used by the ``benchmark_views`` management command and
+by the query-count regression tests in ``main/tests.py``.
+
+``compare_handlers`` drives the same views concurrently through Django's WSGI
+handler (sync views, one thread per client) and its ASGI handler (async
+views, one task per client) to compare throughput and tail latency.
+"""
+
+import asyncio
+import importlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from asgiref.sync import ThreadSensitiveContext
+from django.conf import settings
+from django.db import connection, connections
+from django.template import base as template_base
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import clear_url_caches, reverse
+
+from . import sample_data
+
+# (label, url name, query string)
+SCENARIOS = [
+    ('home', 'main:home', ''),
+    ('projects', 'main:projects', ''),
+    ('projects?tech', 'main:projects', 'tech=Python'),
+    ('resume', 'main:resume', ''),
+    ('resume.json', 'main:resume_json', ''),
+    ('contact', 'main:contact', ''),
+    ('sitemap.xml', 'main:sitemap', ''),
+    ('feed.xml', 'main:projects_feed', ''),
+]
+
+
+def seed(size):
+    """Replace all content with ``size`` synthetic rows per model"""
+    sample_data.clear()
+    sample_data.generate(projects=size, experiences=size, educations=size, skills=size,
+                         certificates=size, seed=size, rebuild_search=False)
+
+
+@contextmanager
+def template_timer():
+    """Accumulate wall time spent rendering top-level templates into ``timer['seconds']``"""
+    timer = {'seconds': 0.0, 'depth': 0}
+    original = template_base.Template._render
+
+    def timed_render(self, context):
+        timer['depth'] += 1
+        started = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            timer['depth'] -= 1
+            if timer['depth'] == 0:
+                timer['seconds'] += time.perf_counter() - started
+
+    template_base.Template._render = timed_render
+    try:
+        yield timer
+    finally:
+        template_base.Template._render = original
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+@override_settings(PAGE_CACHE_ENABLED=False, THROTTLE_ENABLED=False)
+def measure(url, repeat=20):
+    """Request ``url`` ``repeat`` times after one warm-up and summarize the samples"""
+    client = Client()
+    response = client.get(url)
+    if response.status_code != 200:
+        raise RuntimeError(f'{url} returned {response.status_code}')
+
+    latencies, render_times, query_counts = [], [], []
+    for _ in range(repeat):
+        with template_timer() as timer, CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            client.get(url)
+            latencies.append(time.perf_counter() - started)
+        render_times.append(timer['seconds'])
+        query_counts.append(len(queries))
+
+    return {
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'render_ms': percentile(render_times, 50) * 1000,
+        'queries': max(query_counts),
+    }
+
+
+def run(sizes, repeat=20):
+    """Benchmark every scenario at every size; returns {size: {label: stats}}"""
+    results = {}
+    for size in sizes:
+        seed(size)
+        results[size] = {}
+        for label, url_name, query in SCENARIOS:
+            url = reverse(url_name) + (f'?{query}' if query else '')
+            results[size][label] = measure(url, repeat)
+    return results
+
+
+def find_regressions(results, baseline=None, tolerance=1.5):
+    """
+    Return a list of human-readable failures.
+
+    A view fails if its query count differs between dataset sizes (N+1), or
+    if its p95 latency exceeds ``tolerance`` times the baseline for that size.
+    """
+    failures = []
+    sizes = sorted(results)
+    for label, _url_name, _query in SCENARIOS:
+        counts = {size: results[size][label]['queries'] for size in sizes}
+        if len(set(counts.values())) > 1:
+            failures.append(f'{label}: query count grows with dataset size {counts}')
+
+    for size in sizes:
+        for label, stats in results[size].items():
+            previous = (baseline or {}).get(str(size), {}).get(label)
+            if previous and stats['p95_ms'] > previous['p95_ms'] * tolerance:
+                failures.append(
+                    f"{label} @ {size}: p95 {stats['p95_ms']:.1f}ms exceeds baseline "
+                    f"{previous['p95_ms']:.1f}ms x {tolerance}"
+                )
+    return failures
+
+
+def _reload_urlconf():
+    importlib.reload(importlib.import_module('main.urls'))
+    importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+    clear_url_caches()
+
+
+@contextmanager
+def serving_mode(async_views):
+    """Route the public views to their sync or async versions for the duration"""
+    with override_settings(ASYNC_VIEWS=async_views, PAGE_CACHE_ENABLED=False, THROTTLE_ENABLED=False):
+        _reload_urlconf()
+        try:
+            yield
+        finally:
+            clear_url_caches()
+    _reload_urlconf()
+
+
+def _summarize(latencies, elapsed):
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def load_wsgi(url, concurrency, requests):
+    """Send ``requests`` GETs from ``concurrency`` threads through the WSGI handler"""
+    per_client = max(1, requests // concurrency)
+
+    def client_loop():
+        client = Client()
+        samples = []
+        try:
+            for _ in range(per_client):
+                started = time.perf_counter()
+                response = client.get(url)
+                samples.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise RuntimeError(f'{url} returned {response.status_code}')
+        finally:
+            connections.close_all()
+        return samples
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _i: client_loop(), range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return _summarize([sample for samples in results for sample in samples], elapsed)
+
+
+def load_asgi(url, concurrency, requests):
+    """Send ``requests`` GETs from ``concurrency`` tasks through the ASGI handler"""
+    per_client = max(1, requests // concurrency)
+
+    async def client_loop():
+        client = AsyncClient()
+        samples = []
+        for _ in range(per_client):
+            started = time.perf_counter()
+            # Like ASGIHandler: each request gets its own thread for sync work
+            async with ThreadSensitiveContext():
+                response = await client.get(url)
+            samples.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f'{url} returned {response.status_code}')
+        return samples
+
+    async def main():
+        return await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+
+    started = time.perf_counter()
+    results = asyncio.run(main())
+    elapsed = time.perf_counter() - started
+    return _summarize([sample for samples in results for sample in samples], elapsed)
+
+
+def compare_handlers(size, concurrency=16, requests=400):
+    """Seed ``size`` rows per model and load every scenario under WSGI and ASGI; returns {label: {mode: stats}}"""
+    seed(size)
+    results = {}
+    for mode, async_views, load in (('wsgi', False, load_wsgi), ('asgi', True, load_asgi)):
+        with serving_mode(async_views):
+            for label, url_name, query in SCENARIOS:
+                url = reverse(url_name) + (f'?{query}' if query else '')
+                # Warm up templates, the About cache and connections
+                load(url, 1, 1)
+                results.setdefault(label, {})[mode] = load(url, concurrency, requests)
+    return results
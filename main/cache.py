@@ -0,0 +1,171 @@
+"""
+Full-page cache for the public views.
+
+Each cached page is keyed by view name, a per-view version number and a hash
+of the query string. Saving or deleting content bumps the version of every
+view that renders it once the transaction commits (see ``main.signals``), so
+stale pages are never served and simply age out of the cache. Next to each version the cache keeps when
+it was last bumped, which the views send as Last-Modified.
+
+Serving a cached page only reads from the cache. Hits and misses are counted
+per worker by ``main.metrics`` (``portfolio_page_cache_total`` on /metrics).
+"""
+
+import hashlib
+import math
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from . import compression, routers
+
+KEY_PREFIX = 'pagecache'
+
+# Which public views render which models
+VIEW_DEPENDENCIES = {
+    'Project': ['home', 'projects', 'projects_feed', 'sitemap'],
+    'Experience': ['resume', 'resume_json', 'sitemap'],
+    'Education': ['resume', 'resume_json', 'sitemap'],
+    'Certificate': ['resume', 'resume_json', 'sitemap'],
+    'Skill': ['resume', 'resume_json', 'sitemap'],
+    'About': ['home', 'resume', 'resume_json', 'contact', 'projects_feed', 'sitemap'],
+}
+
+def _version_key(view_name):
+    return f'{KEY_PREFIX}:version:{view_name}'
+
+
+def _modified_key(view_name):
+    return f'{KEY_PREFIX}:modified:{view_name}'
+
+
+def get_view_version(view_name):
+    """Return the current content version of a view"""
+    key = _version_key(view_name)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses old keys
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_view_modified(view_name):
+    """Return when a view's content last changed, in whole Unix seconds"""
+    key = _modified_key(view_name)
+    modified = cache.get(key)
+    if modified is None:
+        # Unknown (first request or evicted): now is the only time that can't move backwards
+        cache.add(key, math.ceil(time.time()), timeout=None)
+        modified = cache.get(key)
+    return modified
+
+
+def _touch_modified(view_names):
+    """Move the modification time of views forward, by at least a second"""
+    keys = [_modified_key(view_name) for view_name in view_names]
+    previous = cache.get_many(keys)
+    now = math.ceil(time.time())
+    # HTTP dates have one second resolution: two changes in one second must still differ
+    cache.set_many({key: max(now, previous.get(key, 0) + 1) for key in keys}, timeout=None)
+
+
+def invalidate_views(view_names):
+    """Bump the version of each view so its cached pages are skipped"""
+    # Re-render the new pages from the primary, not a replica that may lag
+    routers.record_write()
+    # Before the versions: validators memoized under a new version must see the new time
+    _touch_modified(view_names)
+    for view_name in view_names:
+        key = _version_key(view_name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def invalidate_model(model_name):
+    """Invalidate every view that renders the given model"""
+    invalidate_views(VIEW_DEPENDENCIES.get(model_name, []))
+
+
+def page_key(view_name, request):
+    """Build the cache key for a request to a view"""
+    # Pages may embed absolute URLs, so the host is part of the variant
+    variant = f"{request.META.get('HTTP_HOST', '')}?{request.META.get('QUERY_STRING', '')}"
+    query = hashlib.md5(variant.encode()).hexdigest()
+    return f'{KEY_PREFIX}:page:{view_name}:{get_view_version(view_name)}:{query}'
+
+
+def _cached_response(view_name, request):
+    """Return (key, cached response or None); key is None when the request bypasses the cache"""
+    if not getattr(settings, 'PAGE_CACHE_ENABLED', True) or request.method not in ('GET', 'HEAD'):
+        return None, None
+
+    key = page_key(view_name, request)
+    cached = cache.get(key)
+    if cached is None:
+        return key, None
+
+    content, content_type = cached
+    response = HttpResponse(content, content_type=content_type)
+    response['X-Page-Cache'] = 'HIT'
+    # Pages are stored minified; compressed copies live under this key too
+    response.minified = True
+    response.page_cache_key = key
+    return key, response
+
+
+def _store_response(key, response):
+    if response.status_code == 200 and not response.streaming and not response.cookies:
+        compression.minify_response(response)
+        cache.set(key, (response.content, response['Content-Type']), _timeout())
+        response.page_cache_key = key
+    response['X-Page-Cache'] = 'MISS'
+    return response
+
+
+def get_encoded(key, encoding):
+    """Return the page under ``key`` compressed with ``encoding``, if cached"""
+    return cache.get(f'{key}:{encoding}')
+
+
+def set_encoded(key, encoding, content):
+    """Cache a compressed copy of the page under ``key``; it is versioned with the page"""
+    cache.set(f'{key}:{encoding}', content, _timeout())
+
+
+def _timeout():
+    return getattr(settings, 'PAGE_CACHE_TIMEOUT', 5 * 60)
+
+
+def cache_page_view(view_name):
+    """Serve a view from the page cache, rendering it only on a miss"""
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                key, response = await sync_to_async(_cached_response)(view_name, request)
+                if response is not None:
+                    return response
+                response = await view_func(request, *args, **kwargs)
+                if key is None:
+                    return response
+                return await sync_to_async(_store_response)(key, response)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            key, response = _cached_response(view_name, request)
+            if response is not None:
+                return response
+            response = view_func(request, *args, **kwargs)
+            if key is None:
+                return response
+            return _store_response(key, response)
+        return wrapper
+    return decorator
@@ -0,0 +1,51 @@
+"""
+Deployment checks.
+
+The page cache, the About singleton and the throttle keep their versions and
+counters in the default cache. A per-process backend would leave every
+worker but the one that handled an edit serving stale pages; a file cache
+scans its directory on every write and culls version keys at random. The
+throttle also needs atomic ``add``/``incr``: elsewhere they are a read then a
+write, so concurrent requests overshoot the burst.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Backends every worker process, on any host, shares
+SHARED_BACKENDS = {
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+    'django_redis.cache.RedisCache',
+}
+
+# Backends whose add/incr/decr are atomic (LocMemCache under a process-wide lock)
+ATOMIC_BACKENDS = SHARED_BACKENDS | {'django.core.cache.backends.locmem.LocMemCache'}
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """`check --deploy` fails unless the default cache is Redis or Memcached"""
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend in SHARED_BACKENDS:
+        return []
+    return [Error(
+        f'The default cache ({backend}) is not a shared Redis or Memcached server.',
+        hint='Set CACHE_BACKEND and CACHE_LOCATION to Redis or Memcached so every worker sees content '
+             'changes; if exactly one process serves the site, silence main.E001.',
+        id='main.E001',
+    )]
+
+
+@register(Tags.caches, deploy=True)
+def check_throttle_cache(app_configs, **kwargs):
+    """`check --deploy` fails if throttling is on and the default cache can't count atomically"""
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if not getattr(settings, 'THROTTLE_ENABLED', True) or backend in ATOMIC_BACKENDS:
+        return []
+    return [Error(
+        f'Throttling is enabled but the default cache ({backend}) has no atomic add/incr.',
+        hint='Use Redis or Memcached, or set THROTTLE_ENABLED=False.',
+        id='main.E002',
+    )]
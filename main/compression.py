@@ -0,0 +1,215 @@
+"""
+Minified, compressed responses.
+
+``minify_html`` collapses the whitespace runs and comments the templates are
+full of, leaving ``<pre>``, ``<textarea>``, ``<script>`` and ``<style>``
+contents and everything inside tags untouched. The page cache stores pages
+already minified (see ``main.cache``), so that is paid once per content
+version.
+
+``CompressionMiddleware`` then encodes responses with brotli or gzip,
+whichever ``Accept-Encoding`` prefers. For pages from the page cache the
+encoded body is cached next to the page, so each content version is
+compressed once per encoding, at the highest level; other responses use a
+faster level. Streaming responses are compressed chunk by chunk. Admin pages
+are left alone: they embed CSRF tokens, which compression would expose to
+BREACH-style attacks.
+"""
+
+import gzip
+import re
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+
+from . import cache as page_cache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - Brotli is in requirements.txt
+    brotli = None
+
+MIN_LENGTH = 200
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/xml', 'application/atom+xml',
+    'application/javascript', 'image/svg+xml',
+)
+
+# (level for cached pages, level for everything else)
+LEVELS = {
+    'br': (11, 5),
+    'gzip': (9, 6),
+}
+
+# Elements whose contents are whitespace-sensitive or not HTML
+_RAW_BLOCK = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.IGNORECASE | re.DOTALL)
+# A tag, with quoted attribute values that may contain '>'
+_TAG = re.compile(r'''(<(?:[^>"']|"[^"]*"|'[^']*')*>)''')
+_COMMENT = re.compile(r'<!--(?!\[if|<!|>).*?-->', re.DOTALL)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _collapse(match):
+    # One whitespace character renders exactly like a run of them
+    return '\n' if '\n' in match.group() else ' '
+
+
+def minify_html(html):
+    """Drop comments and collapse whitespace in text, outside raw blocks and tags"""
+    parts = _RAW_BLOCK.split(html)
+    out = []
+    # split() yields text, then (block, tag name) pairs for each raw block
+    for index in range(0, len(parts), 3):
+        text = _COMMENT.sub('', parts[index])
+        out.extend(
+            chunk if chunk.startswith('<') else _WHITESPACE.sub(_collapse, chunk)
+            for chunk in _TAG.split(text)
+        )
+        if index + 1 < len(parts):
+            out.append(parts[index + 1])
+    return ''.join(out)
+
+
+def minify_response(response):
+    """Minify an HTML response in place, once"""
+    if (
+        getattr(response, 'minified', False) or response.streaming
+        or not getattr(settings, 'HTML_MINIFY', True)
+        or not response.get('Content-Type', '').startswith('text/html')
+    ):
+        return response
+    charset = response.charset
+    response.content = minify_html(response.content.decode(charset)).encode(charset)
+    response.minified = True
+    return response
+
+
+def accepted_encoding(header):
+    """Preferred supported encoding in an Accept-Encoding header, or None"""
+    accepted = {}
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in ('br', 'gzip'):
+        if encoding == 'br' and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+def compress(data, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class StreamEncoder:
+    """Incremental compressor that flushes after every chunk, so streams keep streaming"""
+
+    def __init__(self, encoding, level):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=level)
+            self._process, self._flush, self._finish = compressor.process, compressor.flush, compressor.finish
+        else:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._process = compressor.compress
+            self._flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = compressor.flush
+
+    def encode(self, chunk):
+        return self._process(chunk) + self._flush()
+
+    def finish(self):
+        return self._finish()
+
+    def wrap(self, chunks):
+        for chunk in chunks:
+            if data := self.encode(chunk):
+                yield data
+        yield self.finish()
+
+    async def awrap(self, chunks):
+        async for chunk in chunks:
+            if data := self.encode(chunk):
+                yield data
+        yield self.finish()
+
+
+class CompressionMiddleware:
+    """Minify HTML and compress responses with brotli or gzip"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if getattr(response, 'page_cache_key', None):
+            # Cached variants need cache round trips; cache backends are sync
+            return await sync_to_async(self.process_response)(request, response)
+        return self.process_response(request, response)
+
+    @staticmethod
+    def _compressible(request, response):
+        return (
+            getattr(settings, 'COMPRESSION_ENABLED', True)
+            and not response.has_header('Content-Encoding')
+            and response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES)
+            and not request.path.startswith(reverse('admin:index'))
+        )
+
+    def process_response(self, request, response):
+        if response.status_code != 200 or not self._compressible(request, response):
+            return response
+        minify_response(response)
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = accepted_encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            encoder = StreamEncoder(encoding, LEVELS[encoding][1])
+            if response.is_async:
+                response.streaming_content = encoder.awrap(response.streaming_content)
+            else:
+                response.streaming_content = encoder.wrap(response.streaming_content)
+            del response['Content-Length']
+        else:
+            if len(response.content) < MIN_LENGTH:
+                return response
+            key = getattr(response, 'page_cache_key', None)
+            body = page_cache.get_encoded(key, encoding) if key else None
+            if body is None:
+                body = compress(response.content, encoding, LEVELS[encoding][0 if key else 1])
+                if key:
+                    page_cache.set_encoded(key, encoding, body)
+            response.content = body
+            response['Content-Length'] = str(len(body))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # The encoded body differs byte for byte from the identity one
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
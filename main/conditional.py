@@ -0,0 +1,79 @@
+"""
+Conditional GET support for the public views.
+
+The ETag is derived from the row count and latest ``updated_at`` of every
+model a view renders. Last-Modified is when the view's page cache version
+was last bumped, not the latest ``updated_at``: that moves backwards when
+the most recently edited row is deleted, and clients revalidating with
+If-Modified-Since would keep a stale page. Validators are memoized in the
+cache under the view's version, so a revalidation that ends in a 304 costs
+no queries until content changes.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+
+from . import cache as page_cache
+
+# Invert the page cache dependency map: view name -> model names
+VIEW_MODELS = {}
+for _model_name, _views in page_cache.VIEW_DEPENDENCIES.items():
+    for _view in _views:
+        VIEW_MODELS.setdefault(_view, []).append(_model_name)
+
+
+def compute_validators(view_name):
+    """Return (etag_seed, last_modified) for a view by querying its models"""
+    # Read first: if content changes meanwhile, the time is older, never newer, than the rows
+    last_modified = datetime.fromtimestamp(page_cache.get_view_modified(view_name), tz=timezone.utc)
+    parts = [view_name]
+    for model_name in sorted(VIEW_MODELS.get(view_name, [])):
+        model = apps.get_model('main', model_name)
+        stats = model.objects.order_by().aggregate(count=Count('pk'), latest=Max('updated_at'))
+        latest = stats['latest']
+        parts.append(f"{model_name}:{stats['count']}:{latest.isoformat() if latest else ''}")
+    return hashlib.md5('|'.join(parts).encode()).hexdigest(), last_modified
+
+
+def get_validators(view_name):
+    """Return cached (etag_seed, last_modified) for the view's current content version"""
+    key = f'{page_cache.KEY_PREFIX}:validators:{view_name}:{page_cache.get_view_version(view_name)}'
+    validators = cache.get(key)
+    if validators is None:
+        validators = compute_validators(view_name)
+        cache.set(key, validators, timeout=None)
+    return validators
+
+
+def conditional_view(view_name):
+    """Answer If-None-Match / If-Modified-Since with 304 before the view runs"""
+    def validators(request):
+        # Async views look them up ahead of time, off the event loop
+        return getattr(request, '_page_validators', None) or get_validators(view_name)
+
+    def etag(request, *args, **kwargs):
+        seed = validators(request)[0]
+        # Query string variants (e.g. ?tech=) render different bodies
+        return hashlib.md5(f"{seed}?{request.META.get('QUERY_STRING', '')}".encode()).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        return validators(request)[1]
+
+    def decorator(view_func):
+        conditional = condition(etag_func=etag, last_modified_func=last_modified)(view_func)
+        if not iscoroutinefunction(view_func):
+            return conditional
+
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            request._page_validators = await sync_to_async(get_validators)(view_name)
+            return await conditional(request, *args, **kwargs)
+        return async_wrapper
+    return decorator
@@ -0,0 +1,85 @@
+"""
+sitemap.xml and the Atom feed of projects.
+
+Both are rendered to bytes here and served through the page cache (see the
+``sitemap`` and ``projects_feed`` views), so crawlers polling them cost a
+cache lookup, or a 304, until content changes.
+"""
+
+import datetime
+from urllib.parse import urlencode, urljoin
+
+from django.db.models import Max
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import feedgenerator, timezone
+
+from .conditional import get_validators
+from .models import Project, About, Technology
+
+SITEMAP_PAGES = [
+    # (view name, change frequency, priority)
+    ('home', 'weekly', '1.0'),
+    ('projects', 'weekly', '0.8'),
+    ('resume', 'monthly', '0.8'),
+    ('contact', 'yearly', '0.5'),
+]
+
+FEED_ITEMS = 50
+
+
+def sitemap_entries(root):
+    """Yield dicts with loc, lastmod, changefreq and priority for every public page"""
+    for view_name, changefreq, priority in SITEMAP_PAGES:
+        yield {
+            'loc': urljoin(root, reverse(f'main:{view_name}')),
+            'lastmod': get_validators(view_name)[1],
+            'changefreq': changefreq,
+            'priority': priority,
+        }
+
+    projects_url = urljoin(root, reverse('main:projects'))
+    techs = Technology.objects.annotate(lastmod=Max('projects__updated_at')).order_by('name')
+    for tech in techs:
+        yield {
+            'loc': f"{projects_url}?{urlencode({'tech': tech.name})}",
+            'lastmod': tech.lastmod,
+            'changefreq': 'weekly',
+            'priority': '0.6',
+        }
+
+
+def render_sitemap(root):
+    return render_to_string('sitemap.xml', {'urls': sitemap_entries(root)}).encode()
+
+
+def _published(project):
+    return timezone.make_aware(datetime.datetime.combine(project.date_created, datetime.time()),
+                               datetime.timezone.utc)
+
+
+def render_projects_feed(root):
+    """Atom feed of the newest projects by creation date"""
+    about = About.get_solo()
+    projects_url = urljoin(root, reverse('main:projects'))
+    feed = feedgenerator.Atom1Feed(
+        title=f'{about.name} – Projects',
+        link=projects_url,
+        description=about.tagline,
+        subtitle=about.tagline,
+        author_name=about.name,
+        feed_url=urljoin(root, reverse('main:projects_feed')),
+        language='en',
+    )
+    for project in Project.objects.order_by('-date_created', '-pk')[:FEED_ITEMS]:
+        feed.add_item(
+            title=project.title,
+            link=project.demo_link or project.github_link or f'{projects_url}#project-{project.pk}',
+            description=project.description,
+            unique_id=f'{projects_url}#project-{project.pk}',
+            unique_id_is_permalink=False,
+            pubdate=_published(project),
+            updateddate=project.updated_at,
+            categories=project.get_tech_list(),
+        )
+    return feed.writeString('utf-8').encode()
@@ -0,0 +1,25 @@
+from django import forms
+
+from .models import ContactMessage
+
+
+class ContactForm(forms.ModelForm):
+    """Contact form; submissions are queued for background delivery"""
+
+    # Honeypot: hidden from people, filled in by naive bots
+    website = forms.CharField(required=False, widget=forms.TextInput(attrs={
+        'tabindex': '-1', 'autocomplete': 'off',
+    }))
+
+    class Meta:
+        model = ContactMessage
+        fields = ['name', 'email', 'subject', 'message']
+        widgets = {
+            'name': forms.TextInput(attrs={'autocomplete': 'name', 'placeholder': 'Your name'}),
+            'email': forms.EmailInput(attrs={'autocomplete': 'email', 'placeholder': 'you@example.com'}),
+            'subject': forms.TextInput(attrs={'placeholder': 'What is it about?'}),
+            'message': forms.Textarea(attrs={'rows': 6, 'placeholder': 'Your message'}),
+        }
+
+    def is_spam(self):
+        return bool(self.cleaned_data.get('website'))
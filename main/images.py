@@ -0,0 +1,165 @@
+"""
+Responsive image derivatives.
+
+When a Project, Certificate or About image is uploaded, resized WebP and
+JPEG copies are written next to the original (under ``<dir>/renditions/``)
+and described in a JSON field on the model, e.g. ``Project.image_renditions``::
+
+    {"name": "projects/shot.png", "width": 1920, "height": 1080,
+     "webp": [[320, "projects/renditions/shot.png-1a2b3c4d5e6f-320w.webp"], ...],
+     "jpeg": [[320, "projects/renditions/shot.png-1a2b3c4d5e6f-320w.jpg"], ...]}
+
+Derivative names carry the full original name and a hash of its content (and
+the encoder settings), so they never collide and existing files are reused
+as they are. Rows sharing an original share its derivatives; files are only
+deleted once no row lists them.
+
+Templates render them with ``{% responsive_image %}`` (see
+``main/templatetags/images.py``) without touching storage.
+"""
+
+import hashlib
+import os
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+DEFAULT_WIDTHS = [160, 320, 640, 960, 1280]
+
+# Model name -> (image field, renditions field)
+IMAGE_FIELDS = {
+    'Project': ('image', 'image_renditions'),
+    'Certificate': ('certificate_image', 'certificate_image_renditions'),
+    'About': ('profile_image', 'profile_image_renditions'),
+}
+
+FORMATS = {
+    'webp': ('WEBP', '.webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', '.jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def get_widths():
+    return sorted(getattr(settings, 'IMAGE_RENDITION_WIDTHS', DEFAULT_WIDTHS))
+
+
+def content_digest(data):
+    """Short hash of an original image and the settings its derivatives are encoded with"""
+    return hashlib.sha256(repr(FORMATS).encode() + data).hexdigest()[:12]
+
+
+def rendition_name(name, digest, width, fmt):
+    """Storage name of one derivative of an original image"""
+    directory, filename = os.path.split(name)
+    return os.path.join(directory, 'renditions', f'{filename}-{digest}-{width}w{FORMATS[fmt][1]}')
+
+
+def _target_widths(original_width):
+    widths = get_widths()
+    targets = [w for w in widths if w < original_width]
+    # Never upscale; the largest derivative is the original width capped at the largest size
+    targets.append(min(original_width, widths[-1]))
+    return sorted(set(targets))
+
+
+def _flatten(image):
+    """Return an RGB copy, compositing any transparency onto white for JPEG"""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def generate_renditions(name, storage=None):
+    """Write derivatives for the stored image ``name`` and return their metadata"""
+    storage = storage or default_storage
+    with storage.open(name, 'rb') as fh:
+        data = fh.read()
+    digest = content_digest(data)
+    original = ImageOps.exif_transpose(Image.open(BytesIO(data)))
+    original.load()
+
+    width, height = original.size
+    meta = {'name': name, 'width': width, 'height': height}
+    webp_source = original if original.mode in ('RGB', 'RGBA') else original.convert('RGBA')
+    jpeg_source = _flatten(original)
+
+    for fmt, (pil_format, _ext, options) in FORMATS.items():
+        source = webp_source if fmt == 'webp' else jpeg_source
+        variants = []
+        for target in _target_widths(width):
+            out_name = rendition_name(name, digest, target, fmt)
+            if storage.exists(out_name):
+                # Same original, same settings: the file already holds this derivative
+                variants.append([target, out_name])
+                continue
+            resized = source.resize((target, max(1, round(height * target / width))), Image.LANCZOS)
+            buffer = BytesIO()
+            resized.save(buffer, pil_format, **options)
+            variants.append([target, storage.save(out_name, ContentFile(buffer.getvalue()))])
+        meta[fmt] = variants
+    return meta
+
+
+def rendition_files(meta):
+    """Storage names of the derivatives listed in a renditions dict"""
+    return {name for fmt in FORMATS for _width, name in (meta or {}).get(fmt, [])}
+
+
+def delete_renditions(meta, storage=None):
+    """
+    Remove the derivative files listed in a renditions dict that no row lists.
+
+    Call it once the owner no longer lists them (after updating or deleting
+    it); other rows with the same original keep their files.
+    """
+    storage = storage or default_storage
+    names = rendition_files(meta)
+    if not names:
+        return
+    for model_name, (_image_field, meta_field) in IMAGE_FIELDS.items():
+        rows = apps.get_model('main', model_name).objects.filter(**{f'{meta_field}__name': meta.get('name')})
+        for other in rows.values_list(meta_field, flat=True):
+            names -= rendition_files(other)
+    for name in names:
+        storage.delete(name)
+
+
+def refresh_instance(instance):
+    """
+    Regenerate derivatives if the image changed since they were built.
+
+    Returns True when the renditions field was updated.
+    """
+    image_field, meta_field = IMAGE_FIELDS[instance.__class__.__name__]
+    image = getattr(instance, image_field)
+    meta = getattr(instance, meta_field) or {}
+    name = image.name if image else ''
+    if meta.get('name', '') == name:
+        return False
+
+    try:
+        new_meta = generate_renditions(name, image.storage) if name else {}
+    except OSError:
+        # Missing or unreadable file (e.g. imported without its media): remember the
+        # name so we don't retry on every save; templates fall back to the original
+        new_meta = {'name': name}
+    setattr(instance, meta_field, new_meta)
+    # Queryset update: no signals, no updated_at bump
+    instance.__class__.objects.filter(pk=instance.pk).update(**{meta_field: new_meta})
+    if meta:
+        # Only now that this row lists the new files
+        delete_renditions(meta, image.storage)
+    return True
+
+
+def smallest(meta, fmt='jpeg'):
+    """Return the storage name of the smallest derivative, or None"""
+    variants = meta.get(fmt) if meta else None
+    return variants[0][1] if variants else None
@@ -0,0 +1,106 @@
+"""
+Resume in the JSON Resume schema (https://jsonresume.org/schema).
+
+``build`` maps About, Experience, Education, Certificate and Skill onto the
+schema; the ``resume_json`` view serves the serialized bytes through the page
+cache, so they are built once per content change.
+"""
+
+import json
+from urllib.parse import urljoin, urlparse
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.urls import reverse
+
+SCHEMA_URL = 'https://raw.githubusercontent.com/jsonresume/resume-schema/v1.0.0/schema.json'
+
+# JSON Resume profile network -> About field
+PROFILES = [
+    ('GitHub', 'github_url'),
+    ('LinkedIn', 'linkedin_url'),
+    ('Twitter', 'twitter_url'),
+]
+
+
+def base_url(request):
+    """Absolute site root: SITE_URL if configured, else the requested host"""
+    return getattr(settings, 'SITE_URL', '') or request.build_absolute_uri('/')
+
+
+def _date(value):
+    return value.isoformat() if value else None
+
+
+def _clean(data):
+    """Drop empty values; the schema prefers absent keys to nulls"""
+    return {key: value for key, value in data.items() if value not in (None, '', [], {})}
+
+
+def _basics(about, root):
+    if about is None:
+        return {}
+    profiles = []
+    for network, field in PROFILES:
+        url = getattr(about, field)
+        if url:
+            username = urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+            profiles.append(_clean({'network': network, 'username': username, 'url': url}))
+    return _clean({
+        'name': about.name,
+        'label': about.tagline,
+        'image': urljoin(root, about.profile_image.url) if about.profile_image else None,
+        'email': about.email,
+        'phone': about.phone,
+        'url': about.website_url or root,
+        'summary': about.bio,
+        'location': _clean({'address': about.location}),
+        'profiles': profiles,
+    })
+
+
+def build(about, experiences, education, certificates, skills, root):
+    """Return the resume as a JSON Resume dict; ``root`` is the absolute site URL"""
+    updated = [obj.updated_at for group in (experiences, education, certificates, skills) for obj in group]
+    if about is not None:
+        updated.append(about.updated_at)
+
+    return {
+        '$schema': SCHEMA_URL,
+        'basics': _basics(about, root),
+        'work': [_clean({
+            'name': experience.company,
+            'position': experience.position,
+            'startDate': _date(experience.start_date),
+            'endDate': _date(experience.end_date),
+            'summary': experience.description,
+            'highlights': experience.get_achievements_list(),
+        }) for experience in experiences],
+        'education': [_clean({
+            'institution': item.institution,
+            'area': item.field_of_study,
+            'studyType': item.degree,
+            'startDate': _date(item.start_date),
+            'endDate': _date(item.end_date),
+            'score': item.gpa,
+        }) for item in education],
+        'certificates': [_clean({
+            'name': certificate.title,
+            'date': _date(certificate.issue_date),
+            'issuer': certificate.issuing_organization,
+            'url': certificate.credential_url,
+        }) for certificate in certificates],
+        'skills': [_clean({
+            'name': skill.name,
+            'level': skill.get_proficiency_display(),
+            'keywords': [skill.get_category_display()],
+        }) for skill in skills],
+        'meta': _clean({
+            'canonical': urljoin(root, reverse('main:resume_json')),
+            'lastModified': max(updated).isoformat() if updated else None,
+        }),
+    }
+
+
+def dumps(resume):
+    return json.dumps(resume, cls=DjangoJSONEncoder, ensure_ascii=False, indent=2).encode()
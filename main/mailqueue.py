@@ -0,0 +1,147 @@
+"""
+Background delivery of contact form messages.
+
+The contact view only stores a ``ContactMessage`` and redirects; nothing on
+the request path talks to the mail server. ``manage.py
+deliver_contact_messages`` calls ``deliver`` in a loop (or once, from cron):
+it claims a batch of due messages, sends them over a single mail connection
+no faster than CONTACT_MAIL_RATE per minute, and reschedules failures with
+exponential backoff until CONTACT_MAIL_MAX_ATTEMPTS is reached.
+
+Claiming a message moves its ``next_attempt_at`` forward by a lease, so two
+workers never send the same message, and messages held by a worker that dies
+mid-batch are picked up again once the lease runs out.
+"""
+
+import random
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import About, ContactMessage
+
+LEASE_SECONDS = 300
+
+
+class RateLimiter:
+    """Space sends at least 60 / per_minute seconds apart; 0 means unlimited"""
+
+    def __init__(self, per_minute, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 60 / per_minute if per_minute else 0
+        self.clock = clock
+        self.sleep = sleep
+        self._next = None
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = self.clock()
+        if self._next is not None and now < self._next:
+            self.sleep(self._next - now)
+            now = self._next
+        self._next = now + self.interval
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next attempt: doubling from the base delay, capped, with jitter"""
+    base = getattr(settings, 'CONTACT_MAIL_RETRY_DELAY', 60)
+    cap = getattr(settings, 'CONTACT_MAIL_MAX_RETRY_DELAY', 6 * 60 * 60)
+    delay = min(base * 2 ** (attempts - 1), cap)
+    # Jitter keeps messages that failed together from retrying together
+    return delay * random.uniform(0.5, 1.0)
+
+
+def recipients():
+    return list(getattr(settings, 'CONTACT_RECIPIENTS', [])) or [About.get_solo().email]
+
+
+def build_email(message, to, connection=None):
+    # Headers must not contain line breaks; form input can
+    subject = ' '.join(f'Contact form: {message.subject or message.name}'.split())
+    body = (
+        f'From: {message.name} <{message.email}>\n'
+        f'Sent: {message.created_at:%Y-%m-%d %H:%M %Z}\n\n'
+        f'{message.message}\n'
+    )
+    return EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, to,
+                        reply_to=[message.email], connection=connection)
+
+
+def claim_batch(size, lease_seconds=LEASE_SECONDS):
+    """Lease up to ``size`` due messages to this worker and return them, oldest first"""
+    now = timezone.now()
+    due = (ContactMessage.objects
+           .filter(status=ContactMessage.STATUS_PENDING, next_attempt_at__lte=now)
+           .order_by('next_attempt_at')
+           .values_list('pk', 'next_attempt_at')[:size])
+    claimed = [
+        pk for pk, due_at in due
+        # Only one worker can move the lease on from the value it read
+        if ContactMessage.objects.filter(pk=pk, status=ContactMessage.STATUS_PENDING, next_attempt_at=due_at)
+                                 .update(next_attempt_at=now + timedelta(seconds=lease_seconds))
+    ]
+    return list(ContactMessage.objects.filter(pk__in=claimed).order_by('created_at', 'pk'))
+
+
+def _record_sent(message):
+    message.attempts += 1
+    message.status = ContactMessage.STATUS_SENT
+    message.sent_at = timezone.now()
+    message.last_error = ''
+    message.save(update_fields=['attempts', 'status', 'sent_at', 'last_error'])
+    return 'sent'
+
+
+def _record_failure(message, exc):
+    """Reschedule a failed message, or give up on it; return the outcome"""
+    message.attempts += 1
+    message.last_error = f'{type(exc).__name__}: {exc}'[:1000]
+    if message.attempts >= getattr(settings, 'CONTACT_MAIL_MAX_ATTEMPTS', 6):
+        message.status = ContactMessage.STATUS_FAILED
+        outcome = 'failed'
+    else:
+        message.next_attempt_at = timezone.now() + timedelta(seconds=retry_delay(message.attempts))
+        outcome = 'retrying'
+    message.save(update_fields=['attempts', 'status', 'next_attempt_at', 'last_error'])
+    return outcome
+
+
+def deliver(batch_size=None, limiter=None):
+    """Send one batch of due messages; return counts of sent, retrying and failed messages"""
+    batch_size = batch_size or getattr(settings, 'CONTACT_MAIL_BATCH_SIZE', 20)
+    limiter = limiter or RateLimiter(getattr(settings, 'CONTACT_MAIL_RATE', 30))
+    counts = {'sent': 0, 'retrying': 0, 'failed': 0}
+
+    # The lease must outlast a rate-limited batch
+    messages = claim_batch(batch_size, LEASE_SECONDS + batch_size * limiter.interval)
+    if not messages:
+        return counts
+
+    to = recipients()
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:
+        for message in messages:
+            counts[_record_failure(message, exc)] += 1
+        return counts
+
+    try:
+        for message in messages:
+            limiter.wait()
+            try:
+                build_email(message, to, connection).send()
+            except Exception as exc:
+                counts[_record_failure(message, exc)] += 1
+            else:
+                counts[_record_sent(message)] += 1
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            # Everything is already recorded; a failed QUIT loses nothing
+            pass
+    return counts
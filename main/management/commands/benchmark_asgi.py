@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from main import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare throughput and tail latency of the public views served through the WSGI handler '
+        '(sync views) and the ASGI handler (async views), in-process, against a throwaway test database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=1000, help='Rows per model (default: 1000)')
+        parser.add_argument('--concurrency', type=int, default=16, help='Concurrent clients (default: 16)')
+        parser.add_argument('--requests', type=int, default=400, help='Requests per view and mode (default: 400)')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = benchmark.compare_handlers(options['size'], options['concurrency'], options['requests'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'view':<14}{'mode':<6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for label, modes in results.items():
+            for mode, stats in modes.items():
+                self.stdout.write(
+                    f"{label:<14}{mode:<6}{stats['rps']:>9.1f}{stats['p50_ms']:>9.2f}"
+                    f"{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+                )
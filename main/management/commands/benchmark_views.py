@@ -0,0 +1,65 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from main import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the public views against synthetic datasets in a throwaway test database. '
+        'Fails if query counts grow with dataset size or p95 latency regresses past the baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,1000,100000',
+                            help='Comma-separated rows per model (default: 10,1000,100000)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed requests per view (default: 20)')
+        parser.add_argument('--baseline', default=os.path.join(settings.BASE_DIR, 'benchmark_baseline.json'),
+                            help='Baseline JSON file to compare against')
+        parser.add_argument('--save-baseline', action='store_true', help='Write these results as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=1.5,
+                            help='Allowed p95 slowdown factor over the baseline (default: 1.5)')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = benchmark.run(sizes, options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self._print(results)
+
+        baseline = None
+        if os.path.exists(options['baseline']):
+            with open(options['baseline']) as fh:
+                baseline = json.load(fh)
+
+        if options['save_baseline']:
+            with open(options['baseline'], 'w') as fh:
+                json.dump({str(size): stats for size, stats in results.items()}, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['baseline']}"))
+            baseline = None
+
+        failures = benchmark.find_regressions(results, baseline, options['tolerance'])
+        if failures:
+            raise CommandError('Performance regressions:\n  ' + '\n  '.join(failures))
+        self.stdout.write(self.style.SUCCESS('No regressions'))
+
+    def _print(self, results):
+        header = f"{'size':>8}  {'view':<14}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'render ms':>11}{'queries':>9}"
+        self.stdout.write(header)
+        for size, views in results.items():
+            for label, stats in views.items():
+                self.stdout.write(
+                    f"{size:>8}  {label:<14}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}"
+                    f"{stats['p99_ms']:>9.2f}{stats['render_ms']:>11.2f}{stats['queries']:>9}"
+                )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main import sprite
+
+
+class Command(BaseCommand):
+    help = (
+        'Combine the SVG icons in main/icons/ into the sprite main/static/icons/sprite.svg '
+        'used by the {% icon %} template tag. Run it after adding or editing an icon, before collectstatic.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Only check that the sprite is up to date; fail if it is not')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            if not sprite.SPRITE_PATH.exists() or sprite.SPRITE_PATH.read_text() != sprite.render():
+                raise CommandError(f'{sprite.SPRITE_PATH} is out of date; run build_icon_sprite')
+            self.stdout.write(self.style.SUCCESS('Icon sprite is up to date'))
+            return
+        changed = sprite.build()
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Wrote' if changed else 'Unchanged:'} {sprite.SPRITE_PATH} ({len(sprite.icon_names())} icons)"))
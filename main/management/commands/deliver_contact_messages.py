@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from main import mailqueue
+
+
+class Command(BaseCommand):
+    help = (
+        'Email queued contact form messages: batches over one mail connection, at most '
+        'CONTACT_MAIL_RATE per minute, retrying failures with exponential backoff. '
+        'Runs until interrupted; use --once from cron or a scheduled task.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Deliver everything that is due, then exit')
+        parser.add_argument('--interval', type=float, default=10,
+                            help='Seconds to wait for new messages when the queue is empty (default: 10)')
+        parser.add_argument('--batch-size', type=int, default=settings.CONTACT_MAIL_BATCH_SIZE,
+                            help='Messages sent per mail connection (default: CONTACT_MAIL_BATCH_SIZE)')
+
+    def handle(self, *args, **options):
+        limiter = mailqueue.RateLimiter(settings.CONTACT_MAIL_RATE)
+        try:
+            while True:
+                close_old_connections()
+                counts = mailqueue.deliver(options['batch_size'], limiter)
+                if any(counts.values()):
+                    self.stdout.write(', '.join(f'{count} {outcome}' for outcome, count in counts.items()))
+                if sum(counts.values()) < options['batch_size']:
+                    # Queue drained
+                    if options['once']:
+                        break
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS('Contact message delivery stopped'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from main import transfer
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream all portfolio content to JSON Lines (one file) or CSV (a directory with one file per model). '
+        'File fields are exported as storage names; copy MEDIA_ROOT separately.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Output .jsonl file, or directory for --format csv')
+        parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+
+    def handle(self, *args, **options):
+        if options['format'] == 'csv':
+            counts = transfer.export_csv(options['output'])
+        else:
+            counts = transfer.export_jsonl(options['output'])
+        for name, count in counts.items():
+            self.stdout.write(f'{name:<12} {count}')
+        self.stdout.write(self.style.SUCCESS(f"Exported to {options['output']}"))
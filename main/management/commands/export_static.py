@@ -0,0 +1,137 @@
+import json
+import os
+import shutil
+from pathlib import Path
+from urllib.parse import quote, urlencode
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from main.conditional import compute_validators
+from main.models import Technology
+
+MANIFEST_NAME = '.export-manifest.json'
+
+# Public pages and where they are written inside the output directory
+PAGES = {
+    'home': 'index.html',
+    'projects': 'projects/index.html',
+    'resume': 'resume/index.html',
+    'resume_json': 'resume.json',
+    'contact': 'contact/index.html',
+    'sitemap': 'sitemap.xml',
+    'projects_feed': 'projects/feed.xml',
+}
+
+
+def tech_page_path(tech):
+    """Output path of the projects page filtered by one technology"""
+    return f"projects/tech/{quote(tech, safe='')}/index.html"
+
+
+def copy_if_changed(src, dst):
+    """Copy a file unless the destination already has the same size and mtime"""
+    try:
+        src_stat, dst_stat = os.stat(src), os.stat(dst)
+        if src_stat.st_size == dst_stat.st_size and int(src_stat.st_mtime) == int(dst_stat.st_mtime):
+            return dst
+    except FileNotFoundError:
+        pass
+    return shutil.copy2(src, dst)
+
+
+class Command(BaseCommand):
+    help = (
+        'Pre-render the public pages, every ?tech= projects variant, the 404 page and '
+        'static/media files into a directory that any plain web server can serve. '
+        'Only pages whose content changed since the last export are re-rendered. '
+        'Filtered project listings are written to projects/tech/<name>/index.html; '
+        'map ?tech= onto them in the web server, e.g. for nginx: '
+        'if ($arg_tech) { rewrite ^/projects/$ /projects/tech/$arg_tech/ last; } '
+        'Set SITE_URL so absolute links in resume.json, sitemap.xml and the feed point at the real site.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=os.path.join(settings.BASE_DIR, 'site'),
+                            help='Output directory (default: <BASE_DIR>/site)')
+        parser.add_argument('--force', action='store_true',
+                            help='Re-render every page, e.g. after editing templates')
+        parser.add_argument('--skip-assets', action='store_true',
+                            help='Do not collect and copy static and media files')
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        output.mkdir(parents=True, exist_ok=True)
+        manifest_path = output / MANIFEST_NAME
+        manifest = {} if options['force'] else self._load_manifest(manifest_path)
+        factory = RequestFactory()
+
+        validators = {view: compute_validators(view)[0] for view in PAGES}
+        rendered = 0
+
+        for view_name, path in PAGES.items():
+            if manifest.get('pages', {}).get(view_name) == validators[view_name] and (output / path).exists():
+                continue
+            self._write(output / path, self._render_view(factory, view_name))
+            rendered += 1
+
+        # Filtered project listings share the projects validator
+        techs = list(Technology.objects.values_list('name', flat=True))
+        previous_techs = set(manifest.get('techs', []))
+        projects_changed = manifest.get('pages', {}).get('projects') != validators['projects']
+        for tech in techs:
+            path = output / tech_page_path(tech)
+            if projects_changed or tech not in previous_techs or not path.exists():
+                self._write(path, self._render_view(factory, 'projects', {'tech': tech}))
+                rendered += 1
+        for tech in previous_techs - set(techs):
+            shutil.rmtree((output / tech_page_path(tech)).parent, ignore_errors=True)
+
+        not_found = output / '404.html'
+        if options['force'] or not not_found.exists():
+            self._write(not_found, render_to_string('404.html').encode())
+            rendered += 1
+
+        if not options['skip_assets']:
+            self._copy_assets(output)
+
+        manifest = {'pages': validators, 'techs': techs}
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+        self.stdout.write(self.style.SUCCESS(f'Rendered {rendered} page(s) into {output}'))
+
+    def _render_view(self, factory, view_name, params=None):
+        path = reverse(f'main:{view_name}')
+        request = factory.get(f"{path}?{urlencode(params)}" if params else path)
+        match = resolve(path)
+        request.resolver_match = match
+        view = match.func
+        if iscoroutinefunction(view):
+            # ASYNC_VIEWS routes the public pages to main.async_views
+            view = async_to_sync(view)
+        response = view(request, *match.args, **match.kwargs)
+        if response.status_code != 200:
+            raise RuntimeError(f'{path} returned {response.status_code}')
+        return response.content
+
+    @staticmethod
+    def _write(path, content):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+    @staticmethod
+    def _load_manifest(path):
+        try:
+            return json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _copy_assets(self, output):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        for url, root in ((settings.STATIC_URL, settings.STATIC_ROOT), (settings.MEDIA_URL, settings.MEDIA_ROOT)):
+            if root and os.path.isdir(root):
+                shutil.copytree(root, output / url.strip('/'), dirs_exist_ok=True, copy_function=copy_if_changed)
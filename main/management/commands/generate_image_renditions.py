@@ -0,0 +1,69 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from main import images
+from main import cache as page_cache
+
+
+def _init_worker():
+    # Spawned (non-forked) workers need their own Django setup
+    if not apps.ready:
+        django.setup()
+
+
+def _render(name):
+    return name, images.generate_renditions(name)
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive image derivatives for existing uploads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Worker processes (default: number of CPUs)')
+        parser.add_argument('--force', action='store_true',
+                            help='Regenerate derivatives that are already up to date')
+
+    def handle(self, *args, **options):
+        # name -> list of (model, pk, renditions field, old renditions) using that file
+        pending = {}
+        for model_name, (image_field, meta_field) in images.IMAGE_FIELDS.items():
+            model = apps.get_model('main', model_name)
+            rows = model.objects.exclude(**{image_field: ''}).exclude(**{f'{image_field}__isnull': True})
+            for pk, name, meta in rows.values_list('pk', image_field, meta_field).iterator():
+                if options['force'] or (meta or {}).get('name') != name:
+                    pending.setdefault(name, []).append((model, pk, meta_field, meta))
+
+        if not pending:
+            self.stdout.write('All image derivatives are up to date')
+            return
+
+        done = failed = 0
+        touched = set()
+        replaced = []
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+            futures = [pool.submit(_render, name) for name in pending]
+            for future in as_completed(futures):
+                try:
+                    name, meta = future.result()
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f'Failed: {exc}')
+                    continue
+                for model, pk, meta_field, old_meta in pending[name]:
+                    model.objects.filter(pk=pk).update(**{meta_field: meta})
+                    touched.add(model.__name__)
+                    if old_meta:
+                        replaced.append(old_meta)
+                done += 1
+
+        # Files of replaced renditions that no row lists any more
+        for old_meta in replaced:
+            images.delete_renditions(old_meta)
+
+        for model_name in touched:
+            page_cache.invalidate_model(model_name)
+        self.stdout.write(self.style.SUCCESS(f'Generated derivatives for {done} image(s), {failed} failed'))
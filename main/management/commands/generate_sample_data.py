@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from main import sample_data
+
+
+class Command(BaseCommand):
+    help = 'Generate large volumes of synthetic portfolio content with bulk inserts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=1000)
+        parser.add_argument('--experiences', type=int, default=100)
+        parser.add_argument('--educations', type=int, default=20)
+        parser.add_argument('--skills', type=int, default=200)
+        parser.add_argument('--certificates', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=0, help='RNG seed, for reproducible datasets')
+        parser.add_argument('--images', type=int, default=0,
+                            help='Number of distinct placeholder images to generate and share across projects')
+        parser.add_argument('--batch-size', type=int, default=sample_data.BATCH_SIZE)
+        parser.add_argument('--clear', action='store_true', help='Delete existing content first')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['clear']:
+            sample_data.clear()
+        created = sample_data.generate(
+            projects=options['projects'],
+            experiences=options['experiences'],
+            educations=options['educations'],
+            skills=options['skills'],
+            certificates=options['certificates'],
+            seed=options['seed'],
+            placeholder_images=options['images'],
+            batch_size=options['batch_size'],
+        )
+        for model_name, count in created.items():
+            self.stdout.write(f'{model_name:<12} {count}')
+        self.stdout.write(self.style.SUCCESS(f'Done in {time.perf_counter() - started:.1f}s'))
@@ -0,0 +1,35 @@
+import os
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from main import transfer
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream portfolio content from a JSON Lines file or a directory of CSV files written by '
+        'export_portfolio. Rows are upserted by primary key in batches, all in one transaction.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='.jsonl file or directory of CSV files')
+        parser.add_argument('--format', choices=['jsonl', 'csv'],
+                            help='Input format (default: csv for directories, jsonl otherwise)')
+        parser.add_argument('--batch-size', type=int, default=transfer.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options['input']
+        if not os.path.exists(path):
+            raise CommandError(f'{path} does not exist')
+        fmt = options['format'] or ('csv' if os.path.isdir(path) else 'jsonl')
+        records = transfer.read_csv(path) if fmt == 'csv' else transfer.read_jsonl(path)
+
+        try:
+            counts = transfer.import_records(records, options['batch_size'])
+        except (ValueError, KeyError, ValidationError) as exc:
+            raise CommandError(f'Invalid import data: {exc}')
+
+        for name, count in counts.items():
+            self.stdout.write(f'{name:<12} {count}')
+        self.stdout.write(self.style.SUCCESS('Import complete'))
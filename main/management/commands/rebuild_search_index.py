@@ -0,0 +1,14 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from main import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index from the database'
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError('Full-text search requires the SQLite database backend')
+        search.rebuild([apps.get_model('main', name) for name in search.INDEXED_FIELDS])
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy the primary SQLite database into each replica file (a local stand-in for replication). '
+        'Real replicas are kept in sync by the database server.'
+    )
+
+    def handle(self, *args, **options):
+        if not settings.REPLICA_DATABASES:
+            raise CommandError('No replicas configured; set DB_REPLICAS')
+        primary = connections['default']
+        if primary.vendor != 'sqlite':
+            raise CommandError('sync_replicas only copies SQLite files')
+
+        primary.ensure_connection()
+        for alias in settings.REPLICA_DATABASES:
+            replica = connections[alias]
+            replica.ensure_connection()
+            # Online backup: consistent snapshot, readers of the replica are not interrupted for long
+            primary.connection.backup(replica.connection)
+            replica.close()
+            self.stdout.write(f"{alias}: copied from {primary.settings_dict['NAME']} "
+                              f"to {replica.settings_dict['NAME']}")
+        self.stdout.write(self.style.SUCCESS('Replicas synced'))
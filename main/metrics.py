@@ -0,0 +1,302 @@
+"""
+Request instrumentation.
+
+``RequestMetricsMiddleware`` measures, per request, the SQL query count and
+time, template render time, page cache result and total time. It can expose
+them in a ``Server-Timing`` header and aggregates them per URL name into
+Prometheus histograms/counters served by the ``metrics`` view.
+
+Aggregation is sharded per thread: each thread only ever writes to its own
+shard, so recording a request takes no lock. Shards are merged when
+``/metrics`` is scraped. When a thread exits, its shard is folded into one
+shard of retired counts, so servers that start a thread per request don't
+grow the registry. Each worker process keeps its own registry, so the
+endpoint reports the worker that answered the scrape.
+"""
+
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template import base as template_base
+
+# Prometheus' default latency buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+UNMATCHED = '<unmatched>'
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestStats:
+    """Timings collected while one request is processed"""
+
+    __slots__ = ('sql_count', 'sql_seconds', 'template_seconds', 'template_depth')
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        self.template_depth = 0
+
+
+class _Shard:
+    """One thread's aggregated metrics; only that thread writes to it"""
+
+    def __init__(self):
+        # view -> [bucket counts..., +Inf count], sum, count
+        self.histograms = {}
+        # (metric, labels) -> value
+        self.counters = {}
+
+    def observe(self, view, seconds):
+        hist = self.histograms.get(view)
+        if hist is None:
+            hist = self.histograms[view] = [[0] * (len(BUCKETS) + 1), 0.0, 0]
+        hist[0][bisect_left(BUCKETS, seconds)] += 1
+        hist[1] += seconds
+        hist[2] += 1
+
+    def inc(self, name, labels, value=1):
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def merge(self, other):
+        """Add another shard's counts to this one"""
+        for view, (buckets, total, count) in list(other.histograms.items()):
+            hist = self.histograms.setdefault(view, [[0] * (len(BUCKETS) + 1), 0.0, 0])
+            hist[0] = [a + b for a, b in zip(hist[0], buckets)]
+            hist[1] += total
+            hist[2] += count
+        for (name, labels), value in list(other.counters.items()):
+            self.inc(name, labels, value)
+
+
+class _ShardHandle:
+    """Holds a thread's shard in thread-local storage, which drops it when the thread exits"""
+
+    __slots__ = ('shard', '__weakref__')
+
+    def __init__(self):
+        self.shard = _Shard()
+
+
+class Registry:
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        # Counts of threads that have exited
+        self._retired = _Shard()
+        self._lock = threading.Lock()
+
+    def shard(self):
+        handle = getattr(self._local, 'handle', None)
+        if handle is None:
+            handle = self._local.handle = _ShardHandle()
+            weakref.finalize(handle, self._retire, handle.shard)
+            with self._lock:
+                self._shards.append(handle.shard)
+        return handle.shard
+
+    def _retire(self, shard):
+        with self._lock:
+            # Gone already if the registry was reset since
+            if shard in self._shards:
+                self._shards.remove(shard)
+                self._retired.merge(shard)
+
+    def record(self, view, total_seconds, stats, cache_result):
+        shard = self.shard()
+        shard.observe(view, total_seconds)
+        labels = (('view', view),)
+        shard.inc('portfolio_requests_total', labels)
+        shard.inc('portfolio_sql_queries_total', labels, stats.sql_count)
+        shard.inc('portfolio_sql_seconds_total', labels, stats.sql_seconds)
+        shard.inc('portfolio_template_render_seconds_total', labels, stats.template_seconds)
+        if cache_result:
+            shard.inc('portfolio_page_cache_total', labels + (('result', cache_result.lower()),))
+
+    def merged(self):
+        """Return merged (histograms, counters) across all thread shards"""
+        total = _Shard()
+        # Under the lock, so an exiting thread's counts are seen exactly once
+        with self._lock:
+            for shard in [self._retired, *self._shards]:
+                total.merge(shard)
+        return total.histograms, total.counters
+
+    def reset(self):
+        with self._lock:
+            self._shards = []
+            self._retired = _Shard()
+        self._local = threading.local()
+
+
+registry = Registry()
+
+
+def _labels(pairs):
+    return ','.join('{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in pairs)
+
+
+def render_prometheus():
+    """Render the registry in the Prometheus text exposition format"""
+    histograms, counters = registry.merged()
+    lines = [
+        '# HELP portfolio_request_duration_seconds Time spent handling requests, by URL name.',
+        '# TYPE portfolio_request_duration_seconds histogram',
+    ]
+    for view in sorted(histograms):
+        buckets, total, count = histograms[view]
+        cumulative = 0
+        for bound, value in zip(BUCKETS + (float('inf'),), buckets):
+            cumulative += value
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'portfolio_request_duration_seconds_bucket{{{_labels([("view", view), ("le", le)])}}} {cumulative}')
+        lines.append(f'portfolio_request_duration_seconds_sum{{{_labels([("view", view)])}}} {total}')
+        lines.append(f'portfolio_request_duration_seconds_count{{{_labels([("view", view)])}}} {count}')
+
+    names = sorted({name for name, _labels_ in counters})
+    for name in names:
+        lines.append(f'# TYPE {name} counter')
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f'{metric}{{{_labels(labels)}}} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def _sql_timer(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.sql_seconds += time.perf_counter() - started
+        stats.sql_count += 1
+
+
+def install_sql_timer(sender=None, connection=None, **kwargs):
+    """
+    Attach the query timer to a connection for its whole lifetime.
+
+    Connections are per thread, and under ASGI a request's queries run on
+    threads other than the middleware's, so the timer finds the request's
+    stats through the context instead of being installed per request.
+    """
+    if _sql_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_sql_timer)
+
+
+_original_template_render = template_base.Template.render
+
+
+def _timed_template_render(self, context):
+    stats = _current.get()
+    if stats is None:
+        return _original_template_render(self, context)
+    stats.template_depth += 1
+    started = time.perf_counter()
+    try:
+        return _original_template_render(self, context)
+    finally:
+        stats.template_depth -= 1
+        if stats.template_depth == 0:
+            stats.template_seconds += time.perf_counter() - started
+
+
+def current_stats():
+    """Stats of the request being processed in this context, or None"""
+    return _current.get()
+
+
+@contextmanager
+def collecting(stats):
+    """Attribute queries and template renders in this context to ``stats``"""
+    token = _current.set(stats)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def install_template_timer():
+    template_base.Template.render = _timed_template_render
+
+
+class RequestMetricsMiddleware:
+    """Time each request and export the numbers as Server-Timing and Prometheus metrics"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install_template_timer()
+        connection_created.connect(install_sql_timer, dispatch_uid='request_metrics_sql_timer')
+        for connection in connections.all(initialized_only=True):
+            install_sql_timer(connection=connection)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        started = time.perf_counter()
+        with collecting(stats):
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+        return self._finish(request, response, stats, total, self._show_server_timing(request))
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        started = time.perf_counter()
+        with collecting(stats):
+            response = await self.get_response(request)
+        total = time.perf_counter() - started
+        return self._finish(request, response, stats, total, await self._ashow_server_timing(request))
+
+    def _finish(self, request, response, stats, total, show_server_timing):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else UNMATCHED
+        cache_result = response.get('X-Page-Cache')
+        registry.record(view, total, stats, cache_result)
+
+        if show_server_timing:
+            response['Server-Timing'] = self._server_timing(total, stats, cache_result)
+        return response
+
+    @staticmethod
+    def _show_server_timing(request):
+        if getattr(settings, 'SERVER_TIMING_ENABLED', False):
+            return True
+        user = getattr(request, 'user', None)
+        return bool(user and user.is_staff)
+
+    @staticmethod
+    async def _ashow_server_timing(request):
+        if getattr(settings, 'SERVER_TIMING_ENABLED', False):
+            return True
+        auser = getattr(request, 'auser', None)
+        user = await auser() if auser else None
+        return bool(user and user.is_staff)
+
+    @staticmethod
+    def _server_timing(total, stats, cache_result):
+        parts = [
+            f'sql;dur={stats.sql_seconds * 1000:.2f};desc="{stats.sql_count} queries"',
+            f'tpl;dur={stats.template_seconds * 1000:.2f}',
+        ]
+        if cache_result:
+            parts.append(f'cache;desc="{cache_result.lower()}"')
+        parts.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(parts)
@@ -0,0 +1,44 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that can also run in an async middleware chain.
+
+    WhiteNoise 6.6 is sync-only; under ASGI a single sync middleware makes
+    Django run the rest of the chain, async views included, through thread
+    hops. Non-static requests here go straight to the next async handler.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            response = await sync_to_async(self.serve)(static_file, request)
+            if response.streaming and not response.is_async:
+                response.streaming_content = _read_async(iter(response.streaming_content))
+            return response
+        return await self.get_response(request)
+
+
+async def _read_async(chunks):
+    """Read a file response's chunks off the event loop"""
+    read = sync_to_async(next)
+    while (chunk := await read(chunks, None)) is not None:
+        yield chunk
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.3 on 2025-11-24 10:15
+
+from django.db import migrations, models
+
+
+def backfill_technologies(apps, schema_editor):
+    Project = apps.get_model('main', 'Project')
+    Technology = apps.get_model('main', 'Technology')
+    Through = Project.tech_catalogue.through
+
+    project_techs = {}
+    for pk, technologies in Project.objects.values_list('pk', 'technologies').iterator():
+        names = [tech.strip()[:100] for tech in technologies.split(',') if tech.strip()]
+        project_techs[pk] = list(dict.fromkeys(names))
+
+    all_names = {name for names in project_techs.values() for name in names}
+    Technology.objects.bulk_create([Technology(name=name) for name in all_names], ignore_conflicts=True)
+    tech_ids = dict(Technology.objects.values_list('name', 'pk'))
+
+    Through.objects.bulk_create([
+        Through(project_id=pk, technology_id=tech_ids[name])
+        for pk, names in project_techs.items()
+        for name in names
+    ], batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_certificate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Technology',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Technology',
+                'verbose_name_plural': 'Technologies',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='tech_catalogue',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='projects', to='main.technology'),
+        ),
+        migrations.RunPython(backfill_technologies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.3 on 2025-11-25 09:30
+
+from django.db import migrations
+
+# Frozen copies of main.search as it was when the index was introduced; later
+# changes to the index need their own migration.
+CREATE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS main_search_index USING fts5("
+    "kind UNINDEXED, object_id UNINDEXED, title, body, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+DROP_SQL = "DROP TABLE IF EXISTS main_search_index"
+
+# Same documents as main.search.document_for: title fields joined by spaces,
+# body fields by newlines
+BACKFILL_SQL = [
+    "INSERT INTO main_search_index (kind, object_id, title, body) "
+    "SELECT 'Project', id, title, description || char(10) || technologies FROM main_project",
+    "INSERT INTO main_search_index (kind, object_id, title, body) "
+    "SELECT 'Experience', id, position || ' ' || company, description || char(10) || achievements "
+    "FROM main_experience",
+    "INSERT INTO main_search_index (kind, object_id, title, body) "
+    "SELECT 'Certificate', id, title, issuing_organization || char(10) || description FROM main_certificate",
+    "INSERT INTO main_search_index (kind, object_id, title, body) "
+    "SELECT 'Skill', id, name, '' FROM main_skill",
+]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(CREATE_SQL)
+    for sql in BACKFILL_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
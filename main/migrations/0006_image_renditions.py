@@ -0,0 +1,28 @@
+# Generated by Django 5.1.3 on 2025-11-26 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='about',
+            name='profile_image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='certificate_image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
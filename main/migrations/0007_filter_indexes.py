@@ -0,0 +1,33 @@
+# Generated by Django 5.1.3 on 2025-11-29 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_image_renditions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='certificate',
+            name='issuing_organization',
+            field=models.CharField(db_index=True, help_text='e.g., Coursera, Udemy, AWS, etc.', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='education',
+            name='degree',
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='education',
+            name='institution',
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='experience',
+            name='company',
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2025-11-30 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-date_created', '-id'], name='project_date_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.3 on 2026-10-18 03:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_contact_message'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('kind', models.CharField(choices=[('view', 'Page view'), ('click', 'Outbound click')], max_length=10)),
+                ('key', models.CharField(help_text="URL name for views, '<project id>:<link>' for clicks", max_length=200)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='main.project')),
+            ],
+            options={
+                'verbose_name': 'Daily Stat',
+                'verbose_name_plural': 'Daily Stats',
+                'ordering': ['-date', 'kind', 'key'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'kind', 'key'), name='dailystat_unique_key')],
+            },
+        ),
+    ]
@@ -1,5 +1,28 @@
-from django.db import models
+import copy
+import time
+
+from django.core.cache import cache
+from django.db import DatabaseError, models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
+
+
+class Technology(models.Model):
+    """Normalized technology name, maintained from Project.technologies"""
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Technology'
+        verbose_name_plural = 'Technologies'
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def prune_unused(cls):
+        """Delete technologies no longer referenced by any project"""
+        cls.objects.filter(projects__isnull=True).delete()
 
 
 class Project(models.Model):
@@ -10,28 +33,52 @@ class Project(models.Model):
     github_link = models.URLField(max_length=500, blank=True)
     demo_link = models.URLField(max_length=500, blank=True)
     image = models.ImageField(upload_to='projects/', blank=True, null=True)
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     is_featured = models.BooleanField(default=False, help_text="Display on homepage")
     order = models.IntegerField(default=0, help_text="Display order (lower numbers first)")
     date_created = models.DateField()
+    tech_catalogue = models.ManyToManyField(Technology, related_name='projects', blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order', '-date_created']
+        indexes = [
+            models.Index(fields=['order', '-date_created'], name='project_order_idx'),
+            models.Index(fields=['order', '-date_created'], name='project_featured_idx',
+                         condition=models.Q(is_featured=True)),
+            # Atom feed: newest projects first
+            models.Index(fields=['-date_created', '-id'], name='project_date_idx'),
+        ]
         verbose_name = 'Project'
         verbose_name_plural = 'Projects'
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """Keep the technology catalogue in sync with the technologies field"""
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        # Partial saves (e.g. admin reordering) that leave technologies alone skip the sync
+        if update_fields is None or 'technologies' in update_fields:
+            self.sync_technologies()
+
     def get_tech_list(self):
         """Return technologies as a list"""
         return [tech.strip() for tech in self.technologies.split(',') if tech.strip()]
 
+    def sync_technologies(self):
+        """Link this project to a Technology row for each listed technology"""
+        names = list(dict.fromkeys(tech[:100] for tech in self.get_tech_list()))
+        Technology.objects.bulk_create([Technology(name=name) for name in names], ignore_conflicts=True)
+        self.tech_catalogue.set(Technology.objects.filter(name__in=names))
+        Technology.prune_unused()
+
 
 class Experience(models.Model):
     """Model for work experience"""
-    company = models.CharField(max_length=200)
+    company = models.CharField(max_length=200, db_index=True)
     position = models.CharField(max_length=200)
     start_date = models.DateField()
     end_date = models.DateField(blank=True, null=True, help_text="Leave blank if current position")
@@ -43,6 +90,9 @@ class Experience(models.Model):
 
     class Meta:
         ordering = ['order', '-start_date']
+        indexes = [
+            models.Index(fields=['order', '-start_date'], name='experience_order_idx'),
+        ]
         verbose_name = 'Experience'
         verbose_name_plural = 'Experiences'
 
@@ -67,8 +117,8 @@ class Experience(models.Model):
 
 class Education(models.Model):
     """Model for education"""
-    institution = models.CharField(max_length=200)
-    degree = models.CharField(max_length=200)
+    institution = models.CharField(max_length=200, db_index=True)
+    degree = models.CharField(max_length=200, db_index=True)
     field_of_study = models.CharField(max_length=200)
     start_date = models.DateField()
     end_date = models.DateField(blank=True, null=True, help_text="Leave blank if currently studying")
@@ -80,6 +130,9 @@ class Education(models.Model):
 
     class Meta:
         ordering = ['order', '-start_date']
+        indexes = [
+            models.Index(fields=['order', '-start_date'], name='education_order_idx'),
+        ]
         verbose_name = 'Education'
         verbose_name_plural = 'Education'
 
@@ -96,12 +149,13 @@ class Education(models.Model):
 class Certificate(models.Model):
     """Model for professional certificates and course completions"""
     title = models.CharField(max_length=200, help_text="Certificate title or course name")
-    issuing_organization = models.CharField(max_length=200, help_text="e.g., Coursera, Udemy, AWS, etc.")
+    issuing_organization = models.CharField(max_length=200, db_index=True, help_text="e.g., Coursera, Udemy, AWS, etc.")
     issue_date = models.DateField()
     expiry_date = models.DateField(blank=True, null=True, help_text="Leave blank if no expiry")
     credential_id = models.CharField(max_length=200, blank=True, help_text="Certificate ID or credential number")
     credential_url = models.URLField(max_length=500, blank=True, help_text="Link to verify certificate")
     certificate_image = models.ImageField(upload_to='certificates/', blank=True, null=True, help_text="Upload certificate image")
+    certificate_image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     description = models.TextField(blank=True, help_text="Additional details about the certificate")
     order = models.IntegerField(default=0, help_text="Display order (lower numbers first)")
     created_at = models.DateTimeField(auto_now_add=True)
@@ -109,6 +163,9 @@ class Certificate(models.Model):
 
     class Meta:
         ordering = ['order', '-issue_date']
+        indexes = [
+            models.Index(fields=['order', '-issue_date'], name='certificate_order_idx'),
+        ]
         verbose_name = 'Certificate'
         verbose_name_plural = 'Certificates'
 
@@ -162,6 +219,9 @@ class Skill(models.Model):
 
     class Meta:
         ordering = ['category', 'order', 'name']
+        indexes = [
+            models.Index(fields=['category', 'order', 'name'], name='skill_order_idx'),
+        ]
         verbose_name = 'Skill'
         verbose_name_plural = 'Skills'
 
@@ -179,6 +239,7 @@ class About(models.Model):
     tagline = models.CharField(max_length=300, help_text="Short description/tagline")
     bio = models.TextField()
     profile_image = models.ImageField(upload_to='profile/', blank=True, null=True)
+    profile_image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     email = models.EmailField()
     phone = models.CharField(max_length=50, blank=True)
     location = models.CharField(max_length=200, blank=True)
@@ -197,24 +258,144 @@ class About(models.Model):
     def __str__(self):
         return self.name
 
+    SOLO_PK = 1
+    SOLO_VERSION_KEY = 'about:solo:version'
+
+    # Process-local (version, instance) pair; see get_solo()
+    _solo_cache = None
+
     def save(self, *args, **kwargs):
         """Ensure only one instance exists (Singleton pattern)"""
-        if not self.pk and About.objects.exists():
-            # If trying to create a new instance when one exists, update existing instead
-            existing = About.objects.first()
-            self.pk = existing.pk
+        if not self.pk:
+            # The singleton always lives at SOLO_PK: update that row in place,
+            # keeping its created_at, and only insert if it doesn't exist yet
+            self.pk = self.SOLO_PK
+            requested = kwargs.pop('update_fields', None)
+            if not kwargs.get('force_insert'):
+                fields = requested or [
+                    f.name for f in self._meta.concrete_fields if not f.primary_key and f.name != 'created_at'
+                ]
+                try:
+                    super().save(*args, update_fields=fields, **kwargs)
+                except DatabaseError:
+                    kwargs['force_insert'] = True
+                else:
+                    self.bump_solo_version_on_commit(self._state.db)
+                    return
         super().save(*args, **kwargs)
+        self.bump_solo_version_on_commit(self._state.db)
+
+    @classmethod
+    def bump_solo_version_on_commit(cls, using=None):
+        """Bump the version once the current transaction commits"""
+        # Bumped earlier, a concurrent request could cache the old row under the new version
+        transaction.on_commit(cls.bump_solo_version, using=using)
+
+    @classmethod
+    def bump_solo_version(cls):
+        """Tell every worker to drop its cached singleton"""
+        try:
+            cache.incr(cls.SOLO_VERSION_KEY)
+        except ValueError:
+            cache.set(cls.SOLO_VERSION_KEY, time.time_ns(), timeout=None)
+        cls._solo_cache = None
+
+    @classmethod
+    def _get_solo_version(cls):
+        version = cache.get(cls.SOLO_VERSION_KEY)
+        if version is None:
+            # Seed from the clock so an evicted counter never matches a stale copy
+            cache.add(cls.SOLO_VERSION_KEY, time.time_ns(), timeout=None)
+            version = cache.get(cls.SOLO_VERSION_KEY)
+        return version
 
     @classmethod
     def get_solo(cls):
-        """Get the singleton instance"""
-        obj, created = cls.objects.get_or_create(
-            pk=1,
-            defaults={
-                'name': 'Your Name',
-                'tagline': 'Your tagline here',
-                'bio': 'Your bio here',
-                'email': 'your.email@example.com',
-            }
-        )
-        return obj
+        """Get the singleton instance, served from a process-local cache"""
+        version = cls._get_solo_version()
+        cached = cls._solo_cache
+        if cached is not None and cached[0] == version:
+            return copy.copy(cached[1])
+
+        obj = cls.objects.filter(pk=cls.SOLO_PK).first()
+        if obj is None:
+            # get_or_create retries the lookup if a concurrent request inserted first
+            obj, created = cls.objects.get_or_create(
+                pk=cls.SOLO_PK,
+                defaults={
+                    'name': 'Your Name',
+                    'tagline': 'Your tagline here',
+                    'bio': 'Your bio here',
+                    'email': 'your.email@example.com',
+                }
+            )
+            if created:
+                # save() bumps the version on commit; cache on the next call
+                return obj
+        cls._solo_cache = (version, obj)
+        return copy.copy(obj)
+
+
+class ContactMessage(models.Model):
+    """Contact form submission, delivered by email in the background (see main.mailqueue)"""
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    email = models.EmailField()
+    subject = models.CharField(max_length=200, blank=True)
+    message = models.TextField(max_length=5000)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now,
+                                           help_text="Not delivered before this time (retry backoff or worker lease)")
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Delivery worker: due pending messages, oldest first
+            models.Index(fields=['next_attempt_at'], name='contact_due_idx',
+                         condition=models.Q(status='pending')),
+        ]
+        verbose_name = 'Contact Message'
+        verbose_name_plural = 'Contact Messages'
+
+    def __str__(self):
+        return f"{self.name} <{self.email}>: {self.subject or self.message[:50]}"
+
+
+class DailyStat(models.Model):
+    """Page views and outbound clicks per day, upserted in batches by main.analytics"""
+    KIND_VIEW = 'view'
+    KIND_CLICK = 'click'
+    KIND_CHOICES = [
+        (KIND_VIEW, 'Page view'),
+        (KIND_CLICK, 'Outbound click'),
+    ]
+
+    date = models.DateField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    key = models.CharField(max_length=200, help_text="URL name for views, '<project id>:<link>' for clicks")
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='daily_stats', null=True, blank=True)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-date', 'kind', 'key']
+        constraints = [
+            # Flushes add to the existing row with ON CONFLICT (date, kind, key)
+            models.UniqueConstraint(fields=['date', 'kind', 'key'], name='dailystat_unique_key'),
+        ]
+        verbose_name = 'Daily Stat'
+        verbose_name_plural = 'Daily Stats'
+
+    def __str__(self):
+        return f"{self.date} {self.kind} {self.key}: {self.count}"
@@ -0,0 +1,193 @@
+"""
+Preload hints for the public pages.
+
+Every page built on ``base.html`` needs the site stylesheet, the Google Fonts
+stylesheet and ``main.js``, and home and projects show a large image above
+the fold. The browser only finds these after parsing the HTML.
+``PreloadMiddleware`` announces them up front in ``Link: rel=preload``
+headers. Under ASGI servers that support the Early Hints extension (e.g.
+Hypercorn), ``EarlyHintsMiddleware`` also sends them in a 103 response
+before Django starts on the page.
+
+Image hints need a query, so they are memoized in the cache under the page
+cache version of the view, like the conditional GET validators.
+"""
+
+import hashlib
+from functools import cache as memoize
+from urllib.parse import parse_qs
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.templatetags.static import static
+from django.urls import Resolver404, resolve
+
+from . import cache as page_cache
+from .images import FORMATS
+from .models import About, Project
+
+# Keep in step with base.html
+FONTS_ORIGIN = 'https://fonts.gstatic.com'
+FONTS_CSS = 'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700&family=Press+Start+2P&display=swap'
+
+# Pages rendered from base.html
+PAGE_VIEWS = {'main:home', 'main:projects', 'main:resume', 'main:contact', 'main:search'}
+
+# `sizes` of the above-the-fold image of each view; keep in step with the templates
+IMAGE_SIZES = {
+    'home': '(max-width: 768px) 80vw, 400px',
+    'projects': '(max-width: 768px) 100vw, 400px',
+}
+
+EARLY_HINT = 'http.response.early_hint'
+
+
+@memoize
+def asset_links():
+    """Links for the assets every page needs; static URLs only change on deploy"""
+    return [
+        f'<{static("css/style.css")}>; rel=preload; as=style',
+        f'<{FONTS_CSS}>; rel=preload; as=style',
+        f'<{FONTS_ORIGIN}>; rel=preconnect; crossorigin',
+        f'<{static("js/main.js")}>; rel=preload; as=script',
+    ]
+
+
+def image_link(image_name, renditions, sizes):
+    """Preload link for an image as ``{% responsive_image %}`` renders it"""
+    if not renditions or renditions.get('name') != image_name:
+        return f'<{default_storage.url(image_name)}>; rel=preload; as=image; fetchpriority=high'
+    # The first format with derivatives is the <picture> source browsers pick
+    fmt = next(fmt for fmt in FORMATS if renditions.get(fmt))
+    variants = renditions[fmt]
+    srcset = ', '.join(f'{default_storage.url(name)} {width}w' for width, name in variants)
+    return (f'<{default_storage.url(variants[-1][1])}>; rel=preload; as=image; type="image/{fmt}"; '
+            f'imagesrcset="{srcset}"; imagesizes="{sizes}"; fetchpriority=high')
+
+
+def _hero_image(view_name, query_string):
+    """(image name, renditions) shown above the fold of a view, or None"""
+    if view_name == 'home':
+        about = About.get_solo()
+        if about.profile_image:
+            return about.profile_image.name, about.profile_image_renditions
+        projects = Project.objects.filter(is_featured=True)
+    elif view_name == 'projects':
+        projects = Project.objects.all()
+        tech = parse_qs(query_string).get('tech', [''])[0]
+        if tech:
+            projects = projects.filter(tech_catalogue__name=tech)
+    else:
+        return None
+    return projects.exclude(image='').values_list('image', 'image_renditions').first()
+
+
+def _image_key(view_name, query_string):
+    query = hashlib.md5(query_string.encode()).hexdigest()
+    return f'{page_cache.KEY_PREFIX}:preload:{view_name}:{page_cache.get_view_version(view_name)}:{query}'
+
+
+def cached_image_links(view_name, query_string):
+    """Memoized image links of a view, or None if they are not known yet"""
+    if view_name not in IMAGE_SIZES:
+        return []
+    return cache.get(_image_key(view_name, query_string))
+
+
+def image_links(view_name, query_string):
+    """Image links of a view, computed on a miss"""
+    links = cached_image_links(view_name, query_string)
+    if links is None:
+        hero = _hero_image(view_name, query_string)
+        links = [image_link(*hero, IMAGE_SIZES[view_name])] if hero else []
+        cache.set(_image_key(view_name, query_string), links, timeout=None)
+    return links
+
+
+def _url_name(path_info):
+    try:
+        return resolve(path_info).view_name
+    except Resolver404:
+        return None
+
+
+def response_links(request, response):
+    """Links to add to a response, or [] if it is not a public page"""
+    match = getattr(request, 'resolver_match', None)
+    if (
+        match is None or match.view_name not in PAGE_VIEWS or response.status_code != 200
+        or not response.get('Content-Type', '').startswith('text/html')
+    ):
+        return []
+    view_name = match.view_name.split(':')[-1]
+    return asset_links() + image_links(view_name, request.META.get('QUERY_STRING', ''))
+
+
+def _add_links(response, links):
+    if links:
+        existing = response.get('Link')
+        response['Link'] = ', '.join([existing, *links] if existing else links)
+    return response
+
+
+class PreloadMiddleware:
+    """Add ``Link: rel=preload`` headers for the critical resources of public pages"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if not getattr(settings, 'PRELOAD_LINKS', True):
+            return response
+        return _add_links(response, response_links(request, response))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if not getattr(settings, 'PRELOAD_LINKS', True):
+            return response
+        return _add_links(response, await sync_to_async(response_links)(request, response))
+
+
+def early_hint_links(path_info, query_string):
+    """Links for a 103 response: assets, plus the view's image links if already memoized"""
+    url_name = _url_name(path_info)
+    if url_name not in PAGE_VIEWS:
+        return []
+    # Never query here: the hint must go out before the page's own work
+    return asset_links() + (cached_image_links(url_name.split(':')[-1], query_string) or [])
+
+
+class EarlyHintsMiddleware:
+    """
+    ASGI wrapper that sends 103 Early Hints ahead of the Django response.
+
+    Only servers advertising the ``http.response.early_hint`` extension in
+    the scope get hints, and only when ``EARLY_HINTS`` is on; otherwise
+    requests pass straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD')
+            and EARLY_HINT in scope.get('extensions', {}) and getattr(settings, 'EARLY_HINTS', False)
+        ):
+            path_info = scope['path'].removeprefix(scope.get('root_path', '')) or '/'
+            # Cache lookups only: no need to wait for the request's sync thread
+            links = await sync_to_async(early_hint_links, thread_sensitive=False)(
+                path_info, scope.get('query_string', b'').decode('latin-1'))
+            if links:
+                await send({'type': EARLY_HINT, 'links': [link.encode() for link in links]})
+        await self.app(scope, receive, send)
@@ -0,0 +1,124 @@
+"""
+Primary/replica database routing.
+
+Writes always go to ``default``. Reads go to the replica that
+``ReplicaRoutingMiddleware`` picked at random from
+``settings.REPLICA_DATABASES`` for the current request, so one page is
+rendered from a single snapshot. Everything else (admin, management
+commands, background jobs) reads from the primary. The middleware keeps a
+client on the primary for ``REPLICA_STICKY_SECONDS`` after it writes
+(read-your-writes), and every client after any content change, so pages
+rendered into the shared page cache never come from a lagging replica.
+
+Locally, replicas can be SQLite files refreshed from the primary with
+``python manage.py sync_replicas``.
+"""
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.urls import reverse
+
+LAST_WRITE_KEY = 'db:last_write'
+STICKY_COOKIE = 'use_primary'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Unsafe requests that write nothing a later page reads (the analytics beacon
+# only counts in memory), so they don't pin the client to the primary
+UNPINNED_VIEWS = {'main:track_click'}
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def current_replica():
+    """Alias reads in this context go to, or None for the primary"""
+    return _read_alias.get()
+
+
+@contextmanager
+def read_from(alias):
+    """Send reads in this context to a replica alias (None: the primary)"""
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def record_write():
+    """Note that content changed, pinning every client to the primary for a while"""
+    if getattr(settings, 'REPLICA_DATABASES', []):
+        cache.set(LAST_WRITE_KEY, time.time(), getattr(settings, 'REPLICA_STICKY_SECONDS', 5))
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Reads inside a write transaction must see its changes
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """Let safe public requests read from replicas unless read-your-writes requires the primary"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REPLICA_DATABASES', []):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.aliases = settings.REPLICA_DATABASES
+        self.sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        use_replica = self._may_use_replicas(request) and cache.get(LAST_WRITE_KEY) is None
+        with read_from(random.choice(self.aliases) if use_replica else None):
+            response = self.get_response(request)
+        return self._pin_writer(request, response)
+
+    async def __acall__(self, request):
+        use_replica = self._may_use_replicas(request) and await cache.aget(LAST_WRITE_KEY) is None
+        with read_from(random.choice(self.aliases) if use_replica else None):
+            response = await self.get_response(request)
+        return self._pin_writer(request, response)
+
+    @staticmethod
+    def _may_use_replicas(request):
+        return (
+            request.method in SAFE_METHODS
+            and STICKY_COOKIE not in request.COOKIES
+            and not request.path.startswith(reverse('admin:index'))
+        )
+
+    def _pin_writer(self, request, response):
+        match = getattr(request, 'resolver_match', None)
+        if request.method not in SAFE_METHODS and (match is None or match.view_name not in UNPINNED_VIEWS):
+            # This client reads its own writes from the primary until replicas catch up
+            response.set_cookie(STICKY_COOKIE, '1', max_age=self.sticky_seconds, httponly=True,
+                                samesite='Lax', secure=request.is_secure())
+        return response
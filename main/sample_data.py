@@ -0,0 +1,230 @@
+"""
+Synthetic portfolio content for load testing and benchmarks.
+
+Rows are built from a seeded RNG and written with ``bulk_create`` in batched
+transactions. bulk_create skips ``save()`` and signals, so the technology
+catalogue, search index, image renditions, page cache and admin filter
+choices are brought up to date in bulk afterwards.
+"""
+
+import random
+from datetime import date, timedelta
+from io import BytesIO
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from PIL import Image, ImageDraw
+
+from . import cache as page_cache
+from . import admin_tools, images, search
+from .models import Project, Experience, Education, Certificate, Skill, About, Technology, DailyStat
+
+BATCH_SIZE = 2000
+
+TECHNOLOGIES = [
+    'Python', 'Django', 'Flask', 'FastAPI', 'JavaScript', 'TypeScript', 'React', 'Vue', 'Svelte',
+    'Node.js', 'Go', 'Rust', 'Java', 'Kotlin', 'C#', 'PostgreSQL', 'MySQL', 'SQLite', 'Redis',
+    'MongoDB', 'Docker', 'Kubernetes', 'AWS', 'GCP', 'Terraform', 'Celery', 'GraphQL', 'Tailwind CSS',
+]
+ADJECTIVES = ['Realtime', 'Distributed', 'Minimal', 'Scalable', 'Serverless', 'Open', 'Smart', 'Secure', 'Tiny']
+NOUNS = ['Dashboard', 'Tracker', 'API', 'Scheduler', 'Chat', 'Blog Engine', 'CLI', 'Store', 'Pipeline', 'Monitor']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Stark Industries', 'Wayne Tech', 'Soylent']
+POSITIONS = ['Software Engineer', 'Backend Developer', 'Full Stack Developer', 'Data Engineer', 'Tech Lead', 'SRE']
+INSTITUTIONS = ['University of Technology', 'State University', 'Polytechnic Institute', 'Online Academy']
+DEGREES = ['Bachelor of Science', 'Master of Science', 'Professional Certificate', 'Diploma']
+FIELDS = ['Computer Science', 'Software Engineering', 'Data Science', 'Information Systems']
+ISSUERS = ['Coursera', 'Udemy', 'AWS', 'Google Cloud', 'Microsoft', 'Linux Foundation', 'edX']
+SENTENCES = [
+    'Designed and implemented the core architecture.',
+    'Reduced p95 latency by caching hot paths.',
+    'Built a responsive UI backed by a REST API.',
+    'Automated deployments with a CI/CD pipeline.',
+    'Wrote integration tests covering critical flows.',
+    'Migrated legacy services to containers.',
+    'Collaborated with designers on accessibility.',
+]
+PLACEHOLDER_COLORS = ['#00f9ff', '#ff006e', '#ffbe0b', '#8338ec', '#1e2442', '#3a86ff']
+
+
+def _paragraph(rng, sentences=3):
+    return ' '.join(rng.choice(SENTENCES) for _ in range(sentences))
+
+
+def _day(rng, start=date(2012, 1, 1), span=4500):
+    return start + timedelta(days=rng.randrange(span))
+
+
+def _bulk(model, rows, batch_size):
+    """Insert rows in batches, one transaction per batch; returns the row count"""
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        total += len(batch)
+    return total
+
+
+def make_placeholder_images(count, rng, size=(1200, 675)):
+    """Save ``count`` placeholder images to storage and return their (name, renditions) pairs"""
+    placeholders = []
+    for i in range(count):
+        image = Image.new('RGB', size, PLACEHOLDER_COLORS[i % len(PLACEHOLDER_COLORS)])
+        draw = ImageDraw.Draw(image)
+        for _ in range(12):
+            x, y = rng.randrange(size[0]), rng.randrange(size[1])
+            draw.rectangle([x, y, x + rng.randrange(40, 300), y + rng.randrange(20, 150)],
+                           fill=rng.choice(PLACEHOLDER_COLORS))
+        buffer = BytesIO()
+        image.save(buffer, 'PNG')
+        name = default_storage.save(f'projects/placeholder-{i}.png', ContentFile(buffer.getvalue()))
+        placeholders.append((name, images.generate_renditions(name)))
+    return placeholders
+
+
+def _invalidate_caches():
+    """Drop the cached pages and admin filter choices the skipped signals would have dropped"""
+    for model_name in page_cache.VIEW_DEPENDENCIES:
+        page_cache.invalidate_model(model_name)
+        admin_tools.invalidate_choices(apps.get_model('main', model_name))
+
+
+def clear():
+    """
+    Delete all generated content (the About singleton is kept).
+
+    Rows are removed with plain DELETE statements: QuerySet.delete() would
+    load every row to send post_delete signals one object at a time. Click
+    stats of the deleted projects go too; page view stats are kept.
+    """
+    models = (Project.tech_catalogue.through, Project, Technology, Experience, Education, Certificate, Skill)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {connection.ops.quote_name(DailyStat._meta.db_table)} '
+                       f'WHERE {connection.ops.quote_name("project_id")} IS NOT NULL')
+        for model in models:
+            cursor.execute(f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}')
+    search.rebuild([])
+    _invalidate_caches()
+
+
+def generate(projects=0, experiences=0, educations=0, skills=0, certificates=0,
+             seed=0, placeholder_images=0, batch_size=BATCH_SIZE, rebuild_search=True):
+    """Generate synthetic rows for each model and return {model name: rows created}"""
+    rng = random.Random(seed)
+    About.get_solo()
+    placeholders = make_placeholder_images(placeholder_images, rng) if placeholder_images else []
+
+    def project_rows():
+        for i in range(projects):
+            image, renditions = rng.choice(placeholders) if placeholders else (None, {})
+            yield Project(
+                title=f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}',
+                description=_paragraph(rng, 4),
+                technologies=', '.join(rng.sample(TECHNOLOGIES, rng.randint(2, 5))),
+                github_link=f'https://github.com/example/project-{i}',
+                demo_link=f'https://example.com/demo/{i}' if rng.random() < 0.3 else '',
+                image=image,
+                image_renditions=renditions,
+                is_featured=rng.random() < 0.01,
+                order=rng.randrange(100),
+                date_created=_day(rng),
+            )
+
+    def experience_rows():
+        for i in range(experiences):
+            start = _day(rng)
+            yield Experience(
+                company=rng.choice(COMPANIES),
+                position=rng.choice(POSITIONS),
+                start_date=start,
+                end_date=None if rng.random() < 0.05 else start + timedelta(days=rng.randrange(90, 1500)),
+                description=_paragraph(rng),
+                achievements='\n'.join(rng.sample(SENTENCES, 3)),
+                order=rng.randrange(100),
+            )
+
+    def education_rows():
+        for i in range(educations):
+            start = _day(rng)
+            yield Education(
+                institution=rng.choice(INSTITUTIONS),
+                degree=rng.choice(DEGREES),
+                field_of_study=rng.choice(FIELDS),
+                start_date=start,
+                end_date=start + timedelta(days=rng.randrange(180, 1500)),
+                description=_paragraph(rng, 2),
+                gpa=f'{rng.uniform(2.5, 4.0):.1f}/4.0',
+                order=rng.randrange(100),
+            )
+
+    def certificate_rows():
+        for i in range(certificates):
+            issued = _day(rng)
+            yield Certificate(
+                title=f'{rng.choice(TECHNOLOGIES)} {rng.choice(["Fundamentals", "Professional", "Associate"])}',
+                issuing_organization=rng.choice(ISSUERS),
+                issue_date=issued,
+                expiry_date=issued + timedelta(days=1095) if rng.random() < 0.4 else None,
+                credential_id=f'CRED-{seed}-{i}',
+                credential_url=f'https://example.com/verify/{i}',
+                description=_paragraph(rng, 1),
+                order=rng.randrange(100),
+            )
+
+    def skill_rows():
+        categories = [value for value, _label in Skill.CATEGORY_CHOICES]
+        for i in range(skills):
+            yield Skill(
+                name=f'{rng.choice(TECHNOLOGIES)} {i}',
+                category=rng.choice(categories),
+                proficiency=rng.randint(1, 4),
+                order=rng.randrange(100),
+            )
+
+    created = {
+        'Project': _bulk(Project, project_rows(), batch_size),
+        'Experience': _bulk(Experience, experience_rows(), batch_size),
+        'Education': _bulk(Education, education_rows(), batch_size),
+        'Certificate': _bulk(Certificate, certificate_rows(), batch_size),
+        'Skill': _bulk(Skill, skill_rows(), batch_size),
+    }
+
+    if projects:
+        sync_technology_catalogue(batch_size)
+    if rebuild_search:
+        search.rebuild([apps.get_model('main', name) for name in search.INDEXED_FIELDS])
+    _invalidate_caches()
+    return created
+
+
+def sync_technology_catalogue(batch_size=BATCH_SIZE):
+    """Link every project without catalogue entries to its technologies in bulk"""
+    through = Project.tech_catalogue.through
+    pending = Project.objects.filter(tech_catalogue__isnull=True).values_list('pk', 'technologies')
+
+    names = set()
+    for _pk, technologies in pending.iterator():
+        names.update(tech.strip()[:100] for tech in technologies.split(',') if tech.strip())
+    Technology.objects.bulk_create([Technology(name=name) for name in names], ignore_conflicts=True)
+    tech_ids = dict(Technology.objects.values_list('name', 'pk'))
+
+    def links():
+        for pk, technologies in pending.iterator():
+            seen = set()
+            for tech in technologies.split(','):
+                name = tech.strip()[:100]
+                if name and name not in seen:
+                    seen.add(name)
+                    yield through(project_id=pk, technology_id=tech_ids[name])
+
+    # Materialize before inserting: the pending queryset changes as links are added
+    return _bulk(through, list(links()), batch_size)
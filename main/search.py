@@ -0,0 +1,166 @@
+"""
+Full-text search over portfolio content using an SQLite FTS5 table.
+
+Every indexed object is one row in ``main_search_index`` with a short
+``title`` column and a longer ``body`` column. Rows are kept in sync by the
+signal handlers in ``main.signals``. On databases other than SQLite the
+index is not created and searches return no results.
+"""
+
+import re
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+TABLE_NAME = 'main_search_index'
+
+CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE_NAME} USING fts5("
+    "kind UNINDEXED, object_id UNINDEXED, title, body, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+DROP_SQL = f"DROP TABLE IF EXISTS {TABLE_NAME}"
+
+# Model name -> (title fields, body fields, page the result links to)
+INDEXED_FIELDS = {
+    'Project': (['title'], ['description', 'technologies'], 'main:projects'),
+    'Experience': (['position', 'company'], ['description', 'achievements'], 'main:resume'),
+    'Certificate': (['title'], ['issuing_organization', 'description'], 'main:resume'),
+    'Skill': (['name'], [], 'main:resume'),
+}
+
+# Titles weigh more than body text when ranking
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+# Control characters used as highlight markers, swapped for <mark> after escaping
+_MARK_OPEN = '\x02'
+_MARK_CLOSE = '\x03'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def is_available(using=connection):
+    return using.vendor == 'sqlite'
+
+
+def indexed_fields(model):
+    """Names of the fields of a model that are in the index"""
+    title_fields, body_fields, _url = INDEXED_FIELDS.get(model.__name__, ([], [], None))
+    return {*title_fields, *body_fields}
+
+
+def document_for(instance):
+    """Return the (title, body) text indexed for a model instance"""
+    title_fields, body_fields, _url = INDEXED_FIELDS[instance.__class__.__name__]
+    title = ' '.join(str(getattr(instance, f) or '') for f in title_fields)
+    body = '\n'.join(str(getattr(instance, f) or '') for f in body_fields)
+    return title, body
+
+
+def index_object(instance):
+    """Insert or replace the search row for an instance"""
+    if not is_available():
+        return
+    kind = instance.__class__.__name__
+    title, body = document_for(instance)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE_NAME} WHERE kind = %s AND object_id = %s", [kind, instance.pk])
+        cursor.execute(
+            f"INSERT INTO {TABLE_NAME} (kind, object_id, title, body) VALUES (%s, %s, %s, %s)",
+            [kind, instance.pk, title, body],
+        )
+
+
+def remove_object(instance):
+    """Delete the search row for an instance"""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {TABLE_NAME} WHERE kind = %s AND object_id = %s",
+            [instance.__class__.__name__, instance.pk],
+        )
+
+
+def rebuild(models):
+    """Rebuild the whole index from the given model classes"""
+    if not is_available():
+        return
+    # One transaction: in autocommit mode every inserted row would be its own commit
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE_NAME}")
+        for model in models:
+            kind = model.__name__
+            rows = ((kind, obj.pk, *document_for(obj)) for obj in model.objects.order_by().iterator())
+            cursor.executemany(
+                f"INSERT INTO {TABLE_NAME} (kind, object_id, title, body) VALUES (%s, %s, %s, %s)",
+                list(rows),
+            )
+
+
+def build_match_query(text):
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Every word is quoted so FTS5 operators in user input are treated as
+    literals, and the last word is matched as a prefix for search-as-you-type.
+    """
+    tokens = _TOKEN_RE.findall(text)
+    if not tokens:
+        return ''
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def match_condition(model, text):
+    """Q matching rows of an indexed model whose document matches the text, or None"""
+    match = build_match_query(text)
+    if not match:
+        return None
+    return Q(pk__in=RawSQL(
+        f"SELECT object_id FROM {TABLE_NAME} WHERE {TABLE_NAME} MATCH %s AND kind = %s",
+        [match, model.__name__],
+    ))
+
+
+def filter_queryset(queryset, text):
+    """Restrict a queryset of an indexed model to rows matching the text"""
+    condition = match_condition(queryset.model, text)
+    return queryset.none() if condition is None else queryset.filter(condition)
+
+
+def _highlight(text):
+    return mark_safe(escape(text).replace(_MARK_OPEN, '<mark>').replace(_MARK_CLOSE, '</mark>'))
+
+
+def search(text, limit=20):
+    """Return ranked results as dicts with kind, object_id, title, snippet and url"""
+    match = build_match_query(text)
+    if not match or not is_available():
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT kind, object_id, "
+            f"highlight({TABLE_NAME}, 2, %s, %s), "
+            f"snippet({TABLE_NAME}, 3, %s, %s, '…', 24) "
+            f"FROM {TABLE_NAME} WHERE {TABLE_NAME} MATCH %s "
+            f"ORDER BY bm25({TABLE_NAME}, 0, 0, %s, %s) LIMIT %s",
+            [_MARK_OPEN, _MARK_CLOSE, _MARK_OPEN, _MARK_CLOSE, match, TITLE_WEIGHT, BODY_WEIGHT, limit],
+        )
+        rows = cursor.fetchall()
+    return [
+        {
+            'kind': kind,
+            'object_id': object_id,
+            'title': _highlight(title),
+            'snippet': _highlight(snippet),
+            'url': reverse(INDEXED_FIELDS[kind][2]),
+        }
+        for kind, object_id, title, snippet in rows
+    ]
@@ -0,0 +1,86 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache as page_cache
+from . import admin_tools, images, search
+from .models import Project, Experience, Education, Certificate, Skill, About, Technology
+
+CACHED_MODELS = [Project, Experience, Education, Certificate, Skill, About]
+SEARCH_MODELS = [Project, Experience, Certificate, Skill]
+IMAGE_MODELS = [Project, Certificate, About]
+
+
+@receiver(post_delete, sender=Project)
+def prune_project_technologies(sender, instance, **kwargs):
+    """Drop catalogue entries orphaned by a deleted project"""
+    Technology.prune_unused()
+
+
+@receiver(post_delete, sender=About)
+def drop_cached_about(sender, instance, using=None, **kwargs):
+    """Make every worker reload the singleton after it is deleted"""
+    About.bump_solo_version_on_commit(using)
+
+
+def update_search_index(sender, instance, **kwargs):
+    """Reindex a saved object"""
+    search.index_object(instance)
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    """Drop a deleted object from the index"""
+    search.remove_object(instance)
+
+
+def _invalidate_on_commit(model_name, using):
+    # A bump before commit lets a concurrent request render the old rows
+    # and cache them under the new version
+    transaction.on_commit(partial(page_cache.invalidate_model, model_name), using=using)
+
+
+def refresh_image_renditions(sender, instance, raw=False, using=None, **kwargs):
+    """Build responsive derivatives when an image is uploaded or replaced"""
+    if not raw and images.refresh_instance(instance):
+        _invalidate_on_commit(sender.__name__, using)
+
+
+def delete_image_renditions(sender, instance, **kwargs):
+    """Remove derivative files of a deleted object"""
+    meta_field = images.IMAGE_FIELDS[sender.__name__][1]
+    images.delete_renditions(getattr(instance, meta_field) or {})
+
+
+def invalidate_page_cache(sender, instance, using=None, **kwargs):
+    """Drop cached pages that render the changed model once the change is committed"""
+    _invalidate_on_commit(sender.__name__, using)
+
+
+def invalidate_filter_choices(sender, instance, **kwargs):
+    """Drop cached admin filter choices of the changed model"""
+    admin_tools.invalidate_choices(sender)
+
+
+def invalidate_project_techs(sender, instance, action, using=None, **kwargs):
+    """Drop cached project pages once the technology catalogue changes"""
+    if action.startswith('post_'):
+        _invalidate_on_commit('Project', using)
+
+
+for model in CACHED_MODELS:
+    post_save.connect(invalidate_page_cache, sender=model, dispatch_uid=f'page_cache_save_{model.__name__}')
+    post_delete.connect(invalidate_page_cache, sender=model, dispatch_uid=f'page_cache_delete_{model.__name__}')
+    post_save.connect(invalidate_filter_choices, sender=model, dispatch_uid=f'admin_choices_save_{model.__name__}')
+    post_delete.connect(invalidate_filter_choices, sender=model, dispatch_uid=f'admin_choices_delete_{model.__name__}')
+
+m2m_changed.connect(invalidate_project_techs, sender=Project.tech_catalogue.through, dispatch_uid='page_cache_project_techs')
+
+for model in SEARCH_MODELS:
+    post_save.connect(update_search_index, sender=model, dispatch_uid=f'search_save_{model.__name__}')
+    post_delete.connect(remove_from_search_index, sender=model, dispatch_uid=f'search_delete_{model.__name__}')
+
+for model in IMAGE_MODELS:
+    post_save.connect(refresh_image_renditions, sender=model, dispatch_uid=f'images_save_{model.__name__}')
+    post_delete.connect(delete_image_renditions, sender=model, dispatch_uid=f'images_delete_{model.__name__}')
@@ -0,0 +1,63 @@
+"""
+SVG icon sprite.
+
+Icons live as standalone SVG files in ``main/icons/``. ``render`` combines
+them into one sprite of ``<symbol>`` elements, which ``manage.py
+build_icon_sprite`` writes to ``main/static/icons/sprite.svg``; it is served
+(fingerprinted, in production) like any other static file. Templates
+reference its symbols with ``{% icon %}`` (see ``main/templatetags/icons.py``),
+so the path data of an icon is downloaded and cached once instead of being
+repeated in every project card. ``<use>`` only loads same-origin sprites, so
+STATIC_URL must not point at another domain.
+"""
+
+import xml.etree.ElementTree as ET
+from functools import cache
+from pathlib import Path
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+
+SOURCE_DIR = Path(__file__).resolve().parent / 'icons'
+STATIC_NAME = 'icons/sprite.svg'
+SPRITE_PATH = Path(__file__).resolve().parent / 'static' / STATIC_NAME
+
+# Styling attributes of each icon's <svg>, kept on a <g> inside its symbol
+PRESENTATION_ATTRIBUTES = ('fill', 'stroke', 'stroke-width', 'stroke-linecap', 'stroke-linejoin')
+
+
+@cache
+def icon_names():
+    """Names of the available icons (source file stems)"""
+    return frozenset(path.stem for path in SOURCE_DIR.glob('*.svg'))
+
+
+def _symbol(path):
+    root = ET.parse(path).getroot()
+    symbol = ET.Element(f'{{{SVG_NS}}}symbol', {'id': path.stem, 'viewBox': root.get('viewBox', '0 0 24 24')})
+    group = ET.SubElement(symbol, f'{{{SVG_NS}}}g',
+                          {name: root.get(name) for name in PRESENTATION_ATTRIBUTES if root.get(name)})
+    group.extend(root)
+    for element in symbol.iter():
+        # Drop the source files' indentation
+        element.tail = None
+        if element.text and not element.text.strip():
+            element.text = None
+    return symbol
+
+
+def render():
+    """Return the sprite built from every icon in SOURCE_DIR"""
+    ET.register_namespace('', SVG_NS)
+    sprite = ET.Element(f'{{{SVG_NS}}}svg')
+    sprite.extend(_symbol(path) for path in sorted(SOURCE_DIR.glob('*.svg')))
+    return ET.tostring(sprite, encoding='unicode') + '\n'
+
+
+def build():
+    """Write the sprite to SPRITE_PATH; return True if it changed"""
+    content = render()
+    if SPRITE_PATH.exists() and SPRITE_PATH.read_text() == content:
+        return False
+    SPRITE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    SPRITE_PATH.write_text(content)
+    return True
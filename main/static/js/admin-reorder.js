@@ -0,0 +1,74 @@
+// Drag-and-drop reordering for admin changelists (see main/admin_tools.py).
+// Rows can be dragged while the list uses its default ordering; the new
+// order of the visible rows is posted to <changelist>/reorder/ in one request.
+document.addEventListener('DOMContentLoaded', function() {
+    const tbody = document.querySelector('#result_list tbody');
+    const params = new URLSearchParams(window.location.search);
+    if (!tbody || params.has('o') || params.has('q')) {
+        return;
+    }
+
+    const csrfToken = (document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/) || [])[1]
+        || (document.querySelector('[name=csrfmiddlewaretoken]') || {}).value;
+    let dragged = null;
+    let initialIds = [];
+
+    function rowId(row) {
+        const checkbox = row.querySelector('input.action-select');
+        return checkbox ? parseInt(checkbox.value, 10) : null;
+    }
+
+    function currentIds() {
+        return Array.from(tbody.rows).map(rowId).filter(id => id !== null);
+    }
+
+    function save() {
+        const ids = currentIds();
+        if (ids.join() === initialIds.join()) {
+            return;
+        }
+        fetch(window.location.pathname + 'reorder/', {
+            method: 'POST',
+            credentials: 'same-origin',
+            headers: {'Content-Type': 'application/json', 'X-CSRFToken': csrfToken},
+            body: JSON.stringify({ids: ids})
+        }).then(response => {
+            if (response.ok) {
+                window.location.reload();
+            } else {
+                alert('Could not save the new order.');
+            }
+        });
+    }
+
+    Array.from(tbody.rows).forEach(row => {
+        if (rowId(row) === null) {
+            return;
+        }
+        row.draggable = true;
+        row.style.cursor = 'move';
+
+        row.addEventListener('dragstart', function(e) {
+            dragged = this;
+            initialIds = currentIds();
+            e.dataTransfer.effectAllowed = 'move';
+            this.style.opacity = '0.5';
+        });
+
+        row.addEventListener('dragover', function(e) {
+            e.preventDefault();
+            if (!dragged || dragged === this) {
+                return;
+            }
+            const rect = this.getBoundingClientRect();
+            const after = e.clientY > rect.top + rect.height / 2;
+            tbody.insertBefore(dragged, after ? this.nextSibling : this);
+        });
+
+        row.addEventListener('dragend', function() {
+            this.style.opacity = '';
+            dragged = null;
+            save();
+        });
+    });
+});
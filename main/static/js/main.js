@@ -72,5 +72,28 @@ document.addEventListener('DOMContentLoaded', function() {
         el.style.transition = 'opacity 0.6s ease, transform 0.6s ease';
         observer.observe(el);
     });
-});
 
+    // Cached pages carry no per-visitor CSRF token; copy it from the cookie
+    document.querySelectorAll('form[data-csrf-cookie]').forEach(form => {
+        form.addEventListener('submit', function() {
+            const match = document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/);
+            if (match) {
+                this.querySelector('input[name="csrfmiddlewaretoken"]').value = decodeURIComponent(match[1]);
+            }
+        });
+    });
+
+    // Report project link clicks without delaying the navigation
+    const analyticsUrl = document.body.dataset.analyticsUrl;
+    if (analyticsUrl && navigator.sendBeacon) {
+        document.addEventListener('click', function(e) {
+            const link = e.target.closest('a[data-track]');
+            if (link) {
+                const data = new FormData();
+                data.append('project', link.dataset.project);
+                data.append('link', link.dataset.track);
+                navigator.sendBeacon(analyticsUrl, data);
+            }
+        });
+    }
+});
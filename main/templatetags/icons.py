@@ -0,0 +1,29 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from main import sprite
+
+register = template.Library()
+
+
+@register.simple_tag
+def icon(name, size=24, **attrs):
+    """
+    Render an icon as a reference into the SVG sprite.
+
+    Usage::
+
+        {% icon "github" %}
+        {% icon "email" size=20 class="contact-svg" %}
+
+    Icons are the files in ``main/icons/``; extra keyword arguments become
+    attributes of the <svg>.
+    """
+    if name not in sprite.icon_names():
+        raise template.TemplateSyntaxError(f'Unknown icon {name!r}; icons are the files in main/icons/')
+    extra = format_html_join('', ' {}="{}"', ((key.replace('_', '-'), value) for key, value in attrs.items()))
+    return format_html(
+        '<svg width="{}" height="{}" aria-hidden="true" focusable="false"{}><use href="{}#{}"></use></svg>',
+        size, size, extra, static(sprite.STATIC_NAME), name,
+    )
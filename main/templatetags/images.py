@@ -0,0 +1,45 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+from main.images import FORMATS
+
+register = template.Library()
+
+
+def _srcset(variants):
+    return ', '.join(f'{default_storage.url(name)} {width}w' for width, name in variants)
+
+
+@register.simple_tag
+def responsive_image(image, renditions, alt='', sizes='100vw', loading='lazy', **attrs):
+    """
+    Render an uploaded image as a <picture> with WebP and JPEG srcsets.
+
+    Usage::
+
+        {% responsive_image project.image project.image_renditions alt=project.title sizes="(max-width: 768px) 100vw, 400px" %}
+
+    Falls back to a plain <img> of the original until derivatives exist.
+    Extra keyword arguments become attributes of the <img>.
+    """
+    if not image:
+        return ''
+    extra = format_html_join('', ' {}="{}"', ((key.replace('_', '-'), value) for key, value in attrs.items()))
+
+    if not renditions or renditions.get('name') != image.name or not renditions.get('jpeg'):
+        return format_html('<img src="{}" alt="{}" loading="{}" decoding="async"{}>', image.url, alt, loading, extra)
+
+    jpeg = renditions['jpeg']
+    largest_width = jpeg[-1][0]
+    height = round(renditions['height'] * largest_width / renditions['width'])
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((f'image/{fmt}', _srcset(renditions[fmt]), sizes) for fmt in FORMATS if fmt != 'jpeg' and renditions.get(fmt)),
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" '
+        'loading="{}" decoding="async"{}></picture>',
+        sources, default_storage.url(jpeg[-1][1]), _srcset(jpeg), sizes,
+        largest_width, height, alt, loading, extra,
+    )
@@ -0,0 +1,26 @@
+"""
+Test runner with an existing, empty STATIC_ROOT.
+
+Tests run with DEBUG off, so WhiteNoise serves only collected files from
+STATIC_ROOT and warns on every start when that directory is missing, as it
+is in a checkout that never ran ``collectstatic``.
+"""
+
+import shutil
+import tempfile
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._static_root = tempfile.mkdtemp()
+        self._static_settings = override_settings(STATIC_ROOT=self._static_root)
+        self._static_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._static_settings.disable()
+        shutil.rmtree(self._static_root, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
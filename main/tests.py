@@ -1,3 +1,1229 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import importlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import ExitStack
+from datetime import date
+from io import BytesIO, StringIO
+from smtplib import SMTPException
+from unittest import mock, skipUnless
+from xml.etree import ElementTree
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.admin.sites import site as admin_site
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.db import connection, transaction
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.core.mail.backends.base import BaseEmailBackend
+from django.http import HttpResponse
+from django.test import (AsyncClient, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase,
+                         override_settings)
+from django.template import Template, TemplateSyntaxError, Context
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from django.utils.http import parse_http_date
+from PIL import Image
+
+from . import (admin_tools, analytics, benchmark, checks, compression, images, mailqueue, metrics, preload,
+               routers, sample_data, search, sprite, throttle, transfer)
+from . import cache as page_cache
+from .middleware import StaticFilesMiddleware
+from .models import (Project, Experience, Education, Certificate, Skill, About, ContactMessage, DailyStat,
+                     Technology)
+
+
+def explain(sql, params=()):
+    """Return the detail column of SQLite's EXPLAIN QUERY PLAN for a query"""
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+@override_settings(PAGE_CACHE_ENABLED=False)
+class QueryPlanIndexTests(TestCase):
+    """The list queries behind the public views should be served by the ordering indexes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(5):
+            Project.objects.create(title=f'Project {i}', description='d', technologies='Python',
+                                   is_featured=i % 2 == 0, order=i, date_created=date(2024, 1, i + 1))
+            Experience.objects.create(company='Co', position='Dev', start_date=date(2020, 1, i + 1),
+                                      description='d', order=i)
+            Education.objects.create(institution='Uni', degree='BSc', field_of_study='CS',
+                                     start_date=date(2015, 1, i + 1), order=i)
+            Certificate.objects.create(title='Cert', issuing_organization='Org',
+                                       issue_date=date(2023, 1, i + 1), order=i)
+            Skill.objects.create(name=f'Skill {i}', category='tools', order=i)
+
+    def assertUsesIndex(self, queryset, index_name):
+        sql, params = queryset.query.sql_with_params()
+        plan = ' '.join(explain(sql, params))
+        self.assertIn(f'USING INDEX {index_name}', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_list_queries_use_ordering_indexes(self):
+        self.assertUsesIndex(Project.objects.all(), 'project_order_idx')
+        self.assertUsesIndex(Experience.objects.all(), 'experience_order_idx')
+        self.assertUsesIndex(Education.objects.all(), 'education_order_idx')
+        self.assertUsesIndex(Certificate.objects.all(), 'certificate_order_idx')
+        self.assertUsesIndex(Skill.objects.all(), 'skill_order_idx')
+
+    def test_featured_projects_use_partial_index(self):
+        self.assertUsesIndex(Project.objects.filter(is_featured=True)[:3], 'project_featured_idx')
+
+    def test_view_queries_do_not_sort_in_temp_btree(self):
+        for name in ('home', 'projects', 'resume', 'contact'):
+            with self.subTest(view=name), CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(self.client.get(reverse(f'main:{name}')).status_code, 200)
+                for query in ctx.captured_queries:
+                    if query['sql'].startswith('SELECT') and 'ORDER BY' in query['sql']:
+                        self.assertNotIn('TEMP B-TREE', ' '.join(explain(query['sql'])), query['sql'])
+
+
+class ViewQueryCountTests(TestCase):
+    """Query counts of the public views must not grow with the amount of content"""
+
+    def test_query_counts_are_constant_across_dataset_sizes(self):
+        results = benchmark.run([5, 100], repeat=2)
+        self.assertEqual(benchmark.find_regressions(results), [])
+        for size, views in results.items():
+            for label, stats in views.items():
+                self.assertLessEqual(stats['queries'], 5, f'{label} @ {size}')
+
+    def test_latency_regression_against_baseline_is_reported(self):
+        results = {10: {label: {'p95_ms': 30.0, 'queries': 1} for label, _name, _query in benchmark.SCENARIOS}}
+        baseline = {'10': {'home': {'p95_ms': 10.0}}}
+        failures = benchmark.find_regressions(results, baseline, tolerance=1.5)
+        self.assertEqual(len(failures), 1)
+        self.assertIn('home @ 10', failures[0])
+
+
+class AsyncViewTests(TransactionTestCase):
+    """The async views, fetching on worker connections, must render the same pages as the sync views"""
+
+    def setUp(self):
+        sample_data.generate(projects=20, experiences=5, educations=5, certificates=5, skills=10)
+
+    def test_async_views_match_sync_views(self):
+        pages = {}
+        for async_views in (False, True):
+            with benchmark.serving_mode(async_views):
+                for label, url_name, query in benchmark.SCENARIOS:
+                    url = reverse(url_name) + (f'?{query}' if query else '')
+                    if async_views:
+                        response = async_to_sync(AsyncClient().get)(url)
+                    else:
+                        response = self.client.get(url)
+                    self.assertEqual(response.status_code, 200, url)
+                    pages.setdefault(label, []).append(response.content)
+        for label, (sync_page, async_page) in pages.items():
+            self.assertEqual(sync_page, async_page, label)
+
+
+@skipUnless(settings.SQLITE_TUNING, 'SQLITE_TUNING is off')
+class SQLiteTuningTests(TestCase):
+    """Connections should be initialised with the pragmas from settings"""
+
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_are_applied(self):
+        pragmas = settings.SQLITE_PRAGMAS
+        self.assertEqual(self.pragma('busy_timeout'), pragmas['busy_timeout'])
+        self.assertEqual(self.pragma('cache_size'), pragmas['cache_size'])
+        self.assertEqual(self.pragma('synchronous'), {'OFF': 0, 'NORMAL': 1, 'FULL': 2, 'EXTRA': 3}[pragmas['synchronous'].upper()])
+        self.assertEqual(self.pragma('temp_store'), {'DEFAULT': 0, 'FILE': 1, 'MEMORY': 2}[pragmas['temp_store'].upper()])
+
+
+@override_settings(REPLICA_DATABASES=['replica1'], REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Public reads go to a replica; admin, writers and recent changes stay on the primary"""
+
+    def setUp(self):
+        cache.delete(routers.LAST_WRITE_KEY)
+        self.factory = RequestFactory()
+        self.seen = []
+
+        def get_response(request):
+            self.seen.append(routers.PrimaryReplicaRouter().db_for_read(Project))
+            return HttpResponse()
+        self.middleware = routers.ReplicaRoutingMiddleware(get_response)
+
+    def test_router(self):
+        router = routers.PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(Project), 'default')
+        with routers.read_from('replica1'):
+            self.assertEqual(router.db_for_read(Project), 'replica1')
+            self.assertEqual(router.db_for_write(Project), 'default')
+        self.assertFalse(router.allow_migrate('replica1', 'main'))
+
+    def test_public_reads_use_replica(self):
+        self.middleware(self.factory.get(reverse('main:resume')))
+        self.assertEqual(self.seen, ['replica1'])
+
+    def test_admin_and_writes_use_primary(self):
+        self.middleware(self.factory.get(reverse('admin:index')))
+        response = self.middleware(self.factory.post(reverse('main:contact')))
+        self.assertEqual(self.seen, ['default', 'default'])
+        self.assertEqual(response.cookies[routers.STICKY_COOKIE]['max-age'], 5)
+
+    def test_analytics_beacon_does_not_pin_client(self):
+        request = self.factory.post(reverse('main:track_click'))
+        request.resolver_match = resolve(request.path_info)
+        self.assertNotIn(routers.STICKY_COOKIE, self.middleware(request).cookies)
+
+    def test_writer_and_recent_changes_stick_to_primary(self):
+        request = self.factory.get(reverse('main:home'))
+        request.COOKIES[routers.STICKY_COOKIE] = '1'
+        self.middleware(request)
+        routers.record_write()
+        self.middleware(self.factory.get(reverse('main:home')))
+        self.assertEqual(self.seen, ['default', 'default'])
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException('mail server unavailable')
+
+
+@override_settings(CONTACT_RECIPIENTS=['owner@example.com'])
+class ContactQueueTests(TestCase):
+    """Submissions are stored at once and emailed later in batches, with retries"""
+
+    def submit(self, **data):
+        fields = {'name': 'Ada', 'email': 'ada@example.com', 'subject': 'Hello', 'message': 'Hi there'}
+        return self.client.post(reverse('main:contact'), {**fields, **data})
+
+    def test_submission_is_queued_without_sending(self):
+        response = self.submit()
+        self.assertRedirects(response, f"{reverse('main:contact')}?sent=1#contact-form",
+                             fetch_redirect_response=False)
+        self.assertEqual(ContactMessage.objects.get().status, ContactMessage.STATUS_PENDING)
+        self.assertEqual(mail.outbox, [])
+
+        self.submit(website='http://spam.example.com')
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    def test_batches_are_delivered(self):
+        for i in range(3):
+            self.submit(subject=f'Message {i}')
+        unlimited = mailqueue.RateLimiter(0)
+        self.assertEqual(mailqueue.deliver(2, unlimited), {'sent': 2, 'retrying': 0, 'failed': 0})
+        self.assertEqual(mailqueue.deliver(2, unlimited), {'sent': 1, 'retrying': 0, 'failed': 0})
+        self.assertEqual([email.subject for email in mail.outbox],
+                         ['Contact form: Message 0', 'Contact form: Message 1', 'Contact form: Message 2'])
+        self.assertEqual(mail.outbox[0].to, ['owner@example.com'])
+        self.assertEqual(mail.outbox[0].reply_to, ['ada@example.com'])
+        self.assertFalse(ContactMessage.objects.exclude(status=ContactMessage.STATUS_SENT).exists())
+
+    @override_settings(EMAIL_BACKEND='main.tests.FailingEmailBackend', CONTACT_MAIL_MAX_ATTEMPTS=2)
+    def test_failures_back_off_then_give_up(self):
+        self.submit()
+        unlimited = mailqueue.RateLimiter(0)
+        self.assertEqual(mailqueue.deliver(10, unlimited)['retrying'], 1)
+        message = ContactMessage.objects.get()
+        self.assertGreater(message.next_attempt_at, timezone.now())
+        self.assertIn('mail server unavailable', message.last_error)
+        # Not due yet
+        self.assertEqual(mailqueue.deliver(10, unlimited)['retrying'], 0)
+
+        ContactMessage.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(mailqueue.deliver(10, unlimited)['failed'], 1)
+        self.assertEqual(ContactMessage.objects.get().status, ContactMessage.STATUS_FAILED)
+
+    def test_rate_limiter_spaces_sends(self):
+        now, slept = [100.0], []
+
+        def sleep(seconds):
+            slept.append(seconds)
+            now[0] += seconds
+        limiter = mailqueue.RateLimiter(30, clock=lambda: now[0], sleep=sleep)
+        for _ in range(3):
+            limiter.wait()
+        self.assertEqual(slept, [2.0, 2.0])
+
+
+@override_settings(THROTTLE_ENABLED=True, THROTTLE_RULES={'*': (5, 60), 'main:projects': (2, 60)})
+class ThrottleTests(SimpleTestCase):
+    """Clients that drain a token bucket get a 429 with Retry-After; other clients are unaffected"""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.middleware = throttle.ThrottleMiddleware(lambda request: HttpResponse())
+
+    def get(self, url, ip='10.0.0.1'):
+        return self.middleware(self.factory.get(url, REMOTE_ADDR=ip))
+
+    def test_route_bucket_limits_client(self):
+        url = reverse('main:projects') + '?tech=Python'
+        self.assertEqual([self.get(url).status_code for _ in range(3)], [200, 200, 429])
+        response = self.get(url)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        self.assertEqual(self.get(url, ip='10.0.0.2').status_code, 200)
+        # The site-wide bucket still has tokens for other pages
+        self.assertEqual(self.get(reverse('main:resume')).status_code, 200)
+
+    @override_settings(THROTTLE_RULES={'*': (3, 60), 'main:projects': (1, 60)})
+    def test_rejected_request_keeps_site_tokens(self):
+        projects = reverse('main:projects')
+        self.assertEqual([self.get(projects).status_code for _ in range(3)], [200, 429, 429])
+        self.assertEqual([self.get(reverse('main:resume')).status_code for _ in range(3)], [200, 200, 429])
+
+    def test_bucket_refills(self):
+        bucket = throttle.TokenBucket('test', '10.0.0.1', burst=2, per_minute=60)
+        self.assertEqual([bucket.take(now=100.0) for _ in range(2)], [0, 0])
+        self.assertGreater(bucket.take(now=100.0), 0)
+        # Halfway into the next window, half of the earlier burst still counts
+        self.assertEqual(bucket.take(now=103.0), 0)
+        self.assertGreater(bucket.take(now=103.0), 0)
+
+
+class PreloadTests(TestCase):
+    """Public pages announce their critical assets and hero image; other responses don't"""
+
+    @classmethod
+    def setUpTestData(cls):
+        project = Project.objects.create(title='Shot', description='d', technologies='Python', date_created=date(2024, 1, 1))
+        # Set directly: saving an image would build real derivatives
+        Project.objects.filter(pk=project.pk).update(image='projects/shot.png', image_renditions={
+            'name': 'projects/shot.png', 'width': 640, 'height': 480,
+            'webp': [[320, 'projects/renditions/shot-320w.webp'], [640, 'projects/renditions/shot-640w.webp']],
+            'jpeg': [[320, 'projects/renditions/shot-320w.jpg'], [640, 'projects/renditions/shot-640w.jpg']],
+        })
+
+    def test_pages_send_preload_links(self):
+        cache.clear()
+        link = self.client.get(reverse('main:projects'))['Link']
+        self.assertIn('/static/css/style.css>; rel=preload; as=style', link)
+        self.assertIn('/static/js/main.js>; rel=preload; as=script', link)
+        self.assertIn('type="image/webp"; imagesrcset="/media/projects/renditions/shot-320w.webp 320w, '
+                      '/media/projects/renditions/shot-640w.webp 640w"', link)
+        self.assertNotIn('Link', self.client.get(reverse('main:resume_json')))
+
+    @override_settings(EARLY_HINTS=True)
+    def test_early_hints_precede_response(self):
+        sent = []
+
+        async def app(scope, receive, send):
+            await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+
+        async def send(message):
+            sent.append(message)
+        scope = {'type': 'http', 'method': 'GET', 'path': reverse('main:home'), 'query_string': b'',
+                 'extensions': {preload.EARLY_HINT: {}}}
+        async_to_sync(preload.EarlyHintsMiddleware(app))(scope, None, send)
+        self.assertEqual([message['type'] for message in sent], [preload.EARLY_HINT, 'http.response.start'])
+        self.assertIn(b'rel=preload; as=style', sent[0]['links'][0])
+
+        sent.clear()
+        async_to_sync(preload.EarlyHintsMiddleware(app))({**scope, 'extensions': {}}, None, send)
+        self.assertEqual([message['type'] for message in sent], ['http.response.start'])
+
+
+class CompressionTests(TestCase):
+    """Pages go out minified and compressed; cached pages are compressed once per version"""
+
+    def test_minify_keeps_whitespace_sensitive_content(self):
+        html = ('<p>a   b</p>\n\n  <!-- note --><pre>  x\n   y</pre>'
+                '<textarea>\n  t  </textarea><script>var s = "  <b> ";</script><input value="a  b">')
+        self.assertEqual(compression.minify_html(html),
+                         '<p>a b</p>\n<pre>  x\n   y</pre><textarea>\n  t  </textarea>'
+                         '<script>var s = "  <b> ";</script><input value="a  b">')
+
+    def test_cached_page_variants(self):
+        cache.clear()
+        url = reverse('main:resume')
+        identity = self.client.get(url, HTTP_ACCEPT_ENCODING='identity')
+        self.assertNotIn('Content-Encoding', identity)
+        self.assertNotIn('\n\n', identity.content.decode())
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=1, br;q=0')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].startswith('W/'))
+        self.assertEqual(gzip.decompress(response.content), identity.content)
+        self.assertEqual(page_cache.get_encoded(response.page_cache_key, 'gzip'), response.content)
+
+
+class IconSpriteTests(SimpleTestCase):
+    """The committed sprite matches main/icons/ and {% icon %} references its symbols"""
+
+    def test_sprite_is_up_to_date(self):
+        self.assertEqual(sprite.SPRITE_PATH.read_text(), sprite.render(),
+                         'main/static/icons/sprite.svg is stale; run manage.py build_icon_sprite')
+        for name in sprite.icon_names():
+            self.assertIn(f'<symbol id="{name}"', sprite.render())
+
+    def test_icon_tag(self):
+        html = Template('{% load icons %}{% icon "github" size=20 class="x" %}').render(Context())
+        self.assertEqual(html, '<svg width="20" height="20" aria-hidden="true" focusable="false" class="x">'
+                               '<use href="/static/icons/sprite.svg#github"></use></svg>')
+        with self.assertRaises(TemplateSyntaxError):
+            Template('{% load icons %}{% icon "nope" %}').render(Context())
+
+
+@override_settings(PAGE_CACHE_ENABLED=False, ANALYTICS_FLUSH_INTERVAL=0)
+class AnalyticsTests(TestCase):
+    """Hits are counted in memory and flushed as upserts into the daily roll-up"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = Project.objects.create(title='Tracked', description='d', technologies='Python', date_created=date(2024, 1, 1),
+                                             github_link='https://example.com/code')
+
+    def setUp(self):
+        analytics.buffer.drain()
+
+    def counts(self):
+        return {(stat.kind, stat.key): stat.count for stat in DailyStat.objects.all()}
+
+    def test_views_are_buffered_then_upserted(self):
+        with self.assertNumQueries(0):
+            analytics.record_view('main:home')
+        self.client.get(reverse('main:projects'))
+        self.client.get(reverse('main:projects'), HTTP_USER_AGENT='Googlebot/2.1')
+        self.assertFalse(DailyStat.objects.exists())
+
+        self.assertEqual(analytics.flush(), 2)
+        self.client.get(reverse('main:projects'))
+        analytics.flush()
+        self.assertEqual(self.counts(), {('view', 'main:home'): 1, ('view', 'main:projects'): 2})
+        self.assertEqual(analytics.flush(), 0)
+
+    def test_click_beacon(self):
+        url = reverse('main:track_click')
+        self.assertEqual(self.client.post(url, {'project': self.project.pk, 'link': 'github'}).status_code, 204)
+        self.client.post(url, {'project': self.project.pk + 1, 'link': 'github'})
+        self.assertEqual(self.client.post(url, {'project': 'x', 'link': 'github'}).status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 405)
+
+        analytics.flush()
+        stat = DailyStat.objects.get()
+        self.assertEqual((stat.kind, stat.key, stat.project, stat.count),
+                         ('click', f'{self.project.pk}:github', self.project, 1))
+        dashboard = analytics.dashboard()
+        self.assertEqual(list(dashboard['projects']), [{'project__title': 'Tracked', 'total': 1}])
+
+    def test_invalid_project_ids_are_rejected(self):
+        url = reverse('main:track_click')
+        for project in ('\u00b2', '1' * 4301, str(2 ** 63)):
+            with self.subTest(project=project[:20]):
+                self.assertEqual(self.client.post(url, {'project': project, 'link': 'demo'}).status_code, 400)
+        self.assertEqual(analytics.buffer.drain(), {})
+
+    def test_failed_flush_keeps_counts_and_flusher(self):
+        analytics.record_view('main:home')
+        flusher = analytics.Flusher(interval=60)
+        with mock.patch.object(analytics, '_database', flusher.database), \
+                mock.patch.object(analytics.connections, 'close_all'), \
+                mock.patch.object(analytics, '_upsert_sql', side_effect=OverflowError), \
+                self.assertLogs('main.analytics', 'ERROR'):
+            flusher.flush()
+        analytics.flush()
+        self.assertEqual(self.counts(), {('view', 'main:home'): 1})
+
+    def test_sample_data_clear_removes_click_stats(self):
+        analytics.record_view('main:home')
+        analytics.record_click(self.project.pk, 'demo')
+        analytics.flush()
+        sample_data.clear()
+        # SQLite checks foreign keys at commit, which TestCase never reaches
+        connection.check_constraints()
+        self.assertEqual(self.counts(), {('view', 'main:home'): 1})
+
+
+@skipUnless(connection.vendor == 'sqlite', 'FTS5 index is SQLite only')
+class SearchIndexTests(TestCase):
+    """The FTS5 index follows saves and deletes, ranks titles first and backs admin search"""
+
+    def setUp(self):
+        self.cert = Certificate.objects.create(title='Cloud Architect', issuing_organization='AWS',
+                                               issue_date=date(2024, 1, 1), credential_id='ABC-123-XYZ',
+                                               description='Designing <b>resilient</b> cloud systems')
+
+    def test_index_follows_save_and_delete(self):
+        self.assertEqual([r['object_id'] for r in search.search('architect')], [self.cert.pk])
+        self.cert.title = 'Solutions Engineer'
+        self.cert.save()
+        self.assertEqual(search.search('architect'), [])
+        self.assertEqual(len(search.search('solutions')), 1)
+        self.cert.delete()
+        self.assertEqual(search.search('solutions'), [])
+
+    def test_ranking_and_highlighting(self):
+        Skill.objects.create(name='Resilient design', category='tools', proficiency=4)
+        results = search.search('resilient')
+        self.assertEqual([r['kind'] for r in results], ['Skill', 'Certificate'])
+        self.assertEqual(results[0]['title'], '<mark>Resilient</mark> design')
+        # Indexed text is escaped; only the markers become tags
+        self.assertIn('&lt;b&gt;<mark>resilient</mark>&lt;/b&gt;', results[1]['snippet'])
+
+    def test_migration_backfill_matches_live_documents(self):
+        Project.objects.create(title='Site', description='Django', technologies='Python', date_created=date(2024, 1, 1))
+        Experience.objects.create(company='Acme', position='Dev', start_date=date(2020, 1, 1), description='Work')
+        Skill.objects.create(name='SQL', category='databases', proficiency=4)
+        migration = importlib.import_module('main.migrations.0005_search_index')
+        query = f'SELECT kind, object_id, title, body FROM {search.TABLE_NAME} ORDER BY kind, object_id'
+        with connection.cursor() as cursor:
+            cursor.execute(query)
+            live = cursor.fetchall()
+            cursor.execute(f'DELETE FROM {search.TABLE_NAME}')
+            for sql in migration.BACKFILL_SQL:
+                cursor.execute(sql)
+            cursor.execute(query)
+            self.assertEqual(cursor.fetchall(), live)
+
+    def test_admin_search_covers_unindexed_fields(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        url = reverse('admin:main_certificate_changelist')
+        for term in ('architect', 'ABC-123', 'aws cloud'):
+            with self.subTest(term=term):
+                response = self.client.get(url, {'q': term})
+                self.assertEqual(list(response.context['cl'].result_list), [self.cert])
+        self.assertEqual(list(self.client.get(url, {'q': 'nothing'}).context['cl'].result_list), [])
+
+
+class ConditionalGetTests(TestCase):
+    """Validators answer revalidations with 304 and change whenever rendered content does"""
+
+    def setUp(self):
+        cache.clear()
+        About.get_solo()
+        self.url = reverse('main:resume')
+
+    def revalidate(self, response):
+        return (self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']),
+                self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']))
+
+    def test_unchanged_content_is_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual([r.status_code for r in self.revalidate(response)], [304, 304])
+
+    def test_save_and_delete_invalidate_validators(self):
+        first = self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            skill = Skill.objects.create(name='Go', category='languages', proficiency=3)
+        self.assertEqual([r.status_code for r in self.revalidate(first)], [200, 200])
+
+        second = self.client.get(self.url)
+        # Deleting the most recently edited row must not move Last-Modified backwards
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.delete()
+        self.assertEqual([r.status_code for r in self.revalidate(second)], [200, 200])
+        third = self.client.get(self.url)
+        self.assertGreater(parse_http_date(third['Last-Modified']), parse_http_date(second['Last-Modified']))
+        self.assertGreater(parse_http_date(second['Last-Modified']), parse_http_date(first['Last-Modified']))
+
+
+class PageCacheTests(TestCase):
+    """Pages are served from the cache until a save or delete bumps their view's version"""
+
+    def setUp(self):
+        cache.clear()
+        About.get_solo()
+        self.url = reverse('main:projects')
+
+    def test_hits_misses_and_invalidation(self):
+        metrics.registry.reset()
+        self.assertEqual(self.client.get(self.url)['X-Page-Cache'], 'MISS')
+        with CaptureQueriesContext(connection) as queries, ExitStack() as stack:
+            writes = [stack.enter_context(mock.patch.object(cache, method, wraps=getattr(cache, method)))
+                      for method in ('set', 'add', 'incr', 'set_many')]
+            self.assertEqual(self.client.get(self.url)['X-Page-Cache'], 'HIT')
+        # A hit costs no queries and writes nothing to the page cache
+        self.assertEqual(len(queries), 0)
+        keys = [str(call.args[0]) for write in writes for call in write.call_args_list]
+        self.assertEqual([key for key in keys if key.startswith(page_cache.KEY_PREFIX)], [])
+        counters = metrics.registry.merged()[1]
+        self.assertEqual([counters[('portfolio_page_cache_total', (('view', 'main:projects'), ('result', result)))]
+                          for result in ('hit', 'miss')], [1, 1])
+        self.client.get(reverse('main:resume'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(title='Fresh Project', description='d', technologies='Python',
+                                             date_created=date(2024, 1, 1))
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, 'Fresh Project')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertNotContains(response, 'Fresh Project')
+        # Views that don't render projects keep their pages
+        self.assertEqual(self.client.get(reverse('main:resume'))['X-Page-Cache'], 'HIT')
+
+    def test_invalidation_waits_for_commit(self):
+        version = page_cache.get_view_version('projects')
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Project.objects.create(title='Pending', description='d', technologies='Python',
+                                       date_created=date(2024, 1, 1))
+                # Until commit, other requests would render the old rows under a new version
+                self.assertEqual(page_cache.get_view_version('projects'), version)
+            self.assertEqual(page_cache.get_view_version('projects'), version)
+        self.assertNotEqual(page_cache.get_view_version('projects'), version)
+
+    def test_deploy_check_requires_shared_cache(self):
+        for backend in ('locmem.LocMemCache', 'filebased.FileBasedCache'):
+            with override_settings(CACHES={'default': {'BACKEND': f'django.core.cache.backends.{backend}'}}):
+                self.assertEqual([error.id for error in checks.check_shared_cache(None)], ['main.E001'])
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                              'LOCATION': 'redis://127.0.0.1:6379'}}
+        with override_settings(CACHES=shared):
+            self.assertEqual(checks.check_shared_cache(None), [])
+
+    def test_deploy_check_requires_atomic_throttle_cache(self):
+        file_cache = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                                  'LOCATION': '/tmp/portfolio-cache'}}
+        with override_settings(CACHES=file_cache):
+            self.assertEqual([error.id for error in checks.check_throttle_cache(None)], ['main.E002'])
+            with override_settings(THROTTLE_ENABLED=False):
+                self.assertEqual(checks.check_throttle_cache(None), [])
+        self.assertEqual(checks.check_throttle_cache(None), [])
+
+
+class AboutSingletonTests(TestCase):
+    """About.get_solo() serves a per-process copy until any worker bumps the shared version"""
+
+    def setUp(self):
+        cache.clear()
+        About._solo_cache = None
+
+    def test_create_then_update_in_place(self):
+        about = About.get_solo()
+        self.assertEqual((about.pk, about.name), (About.SOLO_PK, 'Your Name'))
+        About(name='New', tagline='t', bio='b', email='new@example.com').save()
+        About(name='Partial', tagline='ignored', bio='b', email='x@example.com').save(update_fields=['name'])
+        about = About.objects.get()
+        self.assertEqual((about.name, about.tagline, about.email), ('Partial', 't', 'new@example.com'))
+
+    def test_cached_copy_follows_shared_version(self):
+        About.get_solo()  # creates the row
+        About.get_solo()  # caches it
+        with self.assertNumQueries(0):
+            About.get_solo().name = 'changed on a copy'
+        self.assertEqual(About.get_solo().name, 'Your Name')
+
+        # Another worker saves: the row changes and the shared version is bumped
+        About.objects.update(name='Elsewhere')
+        cache.incr(About.SOLO_VERSION_KEY)
+        self.assertEqual(About.get_solo().name, 'Elsewhere')
+
+    def test_version_is_bumped_on_commit(self):
+        about = About.get_solo()
+        About.get_solo()
+        version = cache.get(About.SOLO_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                about.name = 'Pending'
+                about.save()
+                self.assertEqual(cache.get(About.SOLO_VERSION_KEY), version)
+            self.assertEqual(cache.get(About.SOLO_VERSION_KEY), version)
+        self.assertNotEqual(cache.get(About.SOLO_VERSION_KEY), version)
+        self.assertEqual(About.get_solo().name, 'Pending')
+
+
+def uploaded_image(name, size=(400, 200), color='red', fmt='PNG'):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, fmt)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@override_settings(IMAGE_RENDITION_WIDTHS=[100, 200])
+class ImageRenditionTests(TestCase):
+    """Derivatives are named per original and content, shared safely, and rendered as srcsets"""
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        self.enterContext(override_settings(MEDIA_ROOT=media))
+
+    def project(self, image, **fields):
+        return Project.objects.create(title='P', description='d', technologies='Python',
+                                      date_created=date(2024, 1, 1), image=image, **fields)
+
+    def test_same_stem_different_extensions_do_not_collide(self):
+        png = self.project(uploaded_image('a.png'))
+        jpg = self.project(uploaded_image('a.jpg', color='blue', fmt='JPEG'))
+        png.refresh_from_db()
+        jpg.refresh_from_db()
+        png_files = images.rendition_files(png.image_renditions)
+        jpg_files = images.rendition_files(jpg.image_renditions)
+        self.assertEqual(len(png_files), 4)
+        self.assertFalse(png_files & jpg_files)
+        self.assertEqual([width for width, _name in png.image_renditions['webp']], [100, 200])
+
+        jpg.delete()
+        self.assertTrue(all(default_storage.exists(name) for name in png_files))
+        self.assertFalse(any(default_storage.exists(name) for name in jpg_files))
+
+    def test_shared_original_keeps_files_until_last_row_goes(self):
+        first = self.project(uploaded_image('shared.png'))
+        first.refresh_from_db()
+        second = self.project(first.image.name)
+        second.refresh_from_db()
+        files = images.rendition_files(first.image_renditions)
+        self.assertEqual(images.rendition_files(second.image_renditions), files)
+
+        # Replacing the image of one row leaves the other's derivatives alone
+        second.image = uploaded_image('other.png', color='green')
+        second.save()
+        self.assertTrue(all(default_storage.exists(name) for name in files))
+        first.delete()
+        self.assertFalse(any(default_storage.exists(name) for name in files))
+
+    def test_responsive_image_tag(self):
+        project = self.project(uploaded_image('tag.png'))
+        project.refresh_from_db()
+        html = Template('{% load images %}{% responsive_image p.image p.image_renditions alt="Shot" '
+                        'sizes="50vw" %}').render(Context({'p': project}))
+        webp, jpeg = project.image_renditions['webp'], project.image_renditions['jpeg']
+        self.assertIn(f'<source type="image/webp" srcset="/media/{webp[0][1]} 100w, /media/{webp[1][1]} 200w" '
+                      f'sizes="50vw">', html)
+        self.assertIn(f'<img src="/media/{jpeg[1][1]}" srcset="/media/{jpeg[0][1]} 100w, /media/{jpeg[1][1]} 200w" '
+                      f'sizes="50vw" width="200" height="100" alt="Shot" loading="lazy" decoding="async">', html)
+
+        # Until derivatives exist, the original is rendered as is
+        Project.objects.filter(pk=project.pk).update(image_renditions={})
+        project.refresh_from_db()
+        html = Template('{% load images %}{% responsive_image p.image p.image_renditions %}').render(
+            Context({'p': project}))
+        self.assertEqual(html, f'<img src="/media/{project.image.name}" alt="" loading="lazy" decoding="async">')
+
+    def test_backfill_command(self):
+        project = self.project(uploaded_image('backfill.png'))
+        Project.objects.filter(pk=project.pk).update(image_renditions={})
+        call_command('generate_image_renditions', workers=1, stdout=StringIO())
+        project.refresh_from_db()
+        files = images.rendition_files(project.image_renditions)
+        self.assertEqual(project.image_renditions['name'], project.image.name)
+        self.assertTrue(files and all(default_storage.exists(name) for name in files))
+
+        out = StringIO()
+        call_command('generate_image_renditions', workers=1, stdout=out)
+        self.assertIn('up to date', out.getvalue())
+
+
+class ScalableAdminTests(TestCase):
+    """Keyset pages, capped counts, cached filter choices and drag-and-drop reordering"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # All at the default order 0: the changelist sorts them newest first
+        cls.jobs = [
+            Experience.objects.create(company=f'Co {i % 2}', position=f'Job {i}', start_date=date(2020 - i, 1, 1),
+                                      description='d')
+            for i in range(6)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        self.url = reverse('admin:main_experience_changelist')
+        self.model_admin = admin_site._registry[Experience]
+
+    def ordered(self):
+        return [job.position for job in Experience.objects.order_by('order', '-start_date', '-pk')]
+
+    def reorder(self, jobs):
+        return self.client.post(reverse('admin:main_experience_reorder'),
+                                json.dumps({'ids': [job.pk for job in jobs]}), content_type='application/json')
+
+    def test_keyset_pagination(self):
+        with mock.patch.object(self.model_admin, 'list_per_page', 4):
+            cl = self.client.get(self.url).context['cl']
+            self.assertEqual([job.position for job in cl.result_list], ['Job 0', 'Job 1', 'Job 2', 'Job 3'])
+            self.assertIn('cursor=', cl.keyset['next_url'])
+            cl = self.client.get(self.url + cl.keyset['next_url']).context['cl']
+            self.assertEqual([job.position for job in cl.result_list], ['Job 4', 'Job 5'])
+            self.assertIsNone(cl.keyset['next_url'])
+
+    def test_estimated_count(self):
+        with mock.patch.object(admin_tools, 'COUNT_THRESHOLD', 3):
+            paginator = admin_tools.EstimatedCountPaginator(Experience.objects.all(), 2)
+            self.assertEqual((paginator.count, paginator.is_estimate), (6, True))
+            paginator = admin_tools.EstimatedCountPaginator(Experience.objects.filter(company='Co 0'), 2)
+            self.assertEqual((paginator.count, paginator.is_estimate), (3, False))
+
+    def test_cached_choices_filter(self):
+        key = admin_tools._choices_key(Experience, 'company')
+        self.client.get(self.url)
+        self.assertEqual(cache.get(key), ['Co 0', 'Co 1'])
+        self.assertEqual(len(self.client.get(self.url, {'company': 'Co 1'}).context['cl'].result_list), 3)
+        Experience.objects.create(company='Co 2', position='New', start_date=date(2010, 1, 1), description='d')
+        self.assertIsNone(cache.get(key))
+
+    def test_sample_data_drops_cached_choices(self):
+        key = admin_tools._choices_key(Experience, 'company')
+        for write in (lambda: sample_data.generate(experiences=2), sample_data.clear):
+            self.client.get(self.url)
+            self.assertIsNotNone(cache.get(key))
+            write()
+            self.assertIsNone(cache.get(key))
+
+    def test_reorder_first_page_does_not_interleave(self):
+        self.assertEqual(self.reorder(self.jobs[2::-1]).json(), {'updated': 3})
+        self.assertEqual(self.ordered(), ['Job 2', 'Job 1', 'Job 0', 'Job 3', 'Job 4', 'Job 5'])
+
+    def test_reorder_later_page(self):
+        self.reorder(self.jobs[:2])
+        self.reorder(self.jobs[5:1:-1])
+        self.assertEqual(self.ordered(), ['Job 0', 'Job 1', 'Job 5', 'Job 4', 'Job 3', 'Job 2'])
+        self.assertEqual(self.reorder([self.jobs[0], self.jobs[0]]).status_code, 400)
+
+
+@override_settings(METRICS_TOKEN='s3cret')
+class RequestMetricsTests(TestCase):
+    """Requests feed per-view histograms, Server-Timing and the token-protected /metrics"""
+
+    def setUp(self):
+        cache.clear()
+        About.get_solo()
+        metrics.registry.reset()
+
+    def test_metrics_endpoint_requires_token(self):
+        url = reverse('main:metrics')
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer s\u00e9cret').status_code, 401)
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+    def test_latency_histogram(self):
+        self.client.get(reverse('main:resume'))
+        self.client.get(reverse('main:resume'))
+        text = metrics.render_prometheus()
+        self.assertIn('portfolio_request_duration_seconds_bucket{view="main:resume",le="+Inf"} 2', text)
+        self.assertIn('portfolio_request_duration_seconds_count{view="main:resume"} 2', text)
+        self.assertIn('portfolio_requests_total{view="main:resume"} 2', text)
+        self.assertIn('portfolio_page_cache_total{view="main:resume",result="hit"} 1', text)
+
+    def test_server_timing(self):
+        self.assertNotIn('Server-Timing', self.client.get(reverse('main:resume')))
+        with override_settings(SERVER_TIMING_ENABLED=True):
+            timing = self.client.get(reverse('main:resume'))['Server-Timing']
+        self.assertRegex(timing, r'^sql;dur=[0-9.]+;desc="\d+ queries", tpl;dur=[0-9.]+, '
+                                 r'cache;desc="hit", total;dur=[0-9.]+$')
+
+    def test_exited_threads_fold_into_one_shard(self):
+        def request():
+            metrics.registry.record('main:resume', 0.01, metrics.RequestStats(), 'HIT')
+        for _ in range(3):
+            thread = threading.Thread(target=request)
+            thread.start()
+            thread.join()
+        self.assertEqual(metrics.registry._shards, [])
+        _histograms, counters = metrics.registry.merged()
+        self.assertEqual(counters[('portfolio_requests_total', (('view', 'main:resume'),))], 3)
+
+
+class TechnologyCatalogueTests(TestCase):
+    """Project.technologies is mirrored into Technology rows used for exact ?tech= filtering"""
+
+    def setUp(self):
+        cache.clear()
+        About.get_solo()
+
+    def project(self, title, technologies):
+        return Project.objects.create(title=title, description='d', technologies=technologies,
+                                      date_created=date(2024, 1, 1))
+
+    def catalogue(self):
+        return list(Technology.objects.values_list('name', flat=True))
+
+    def test_sync_on_save_and_delete(self):
+        web = self.project('Web', 'Python, Django, Python')
+        cli = self.project('CLI', 'Rust')
+        self.assertEqual(self.catalogue(), ['Django', 'Python', 'Rust'])
+        self.assertEqual(list(web.tech_catalogue.values_list('name', flat=True)), ['Django', 'Python'])
+
+        web.technologies = 'Python'
+        web.save()
+        self.assertEqual(self.catalogue(), ['Python', 'Rust'])
+        cli.delete()
+        self.assertEqual(self.catalogue(), ['Python'])
+
+    def test_partial_save_skips_sync(self):
+        project = self.project('Web', 'Python')
+        project.order = 3
+        with CaptureQueriesContext(connection) as queries:
+            project.save(update_fields=['order'])
+        self.assertFalse([q['sql'] for q in queries.captured_queries if 'main_technology' in q['sql']])
+        project.technologies = 'Go'
+        project.save(update_fields=['technologies'])
+        self.assertEqual(self.catalogue(), ['Go'])
+
+    def test_tech_filter_is_exact(self):
+        self.project('Java app', 'Java')
+        self.project('Frontend', 'JavaScript')
+        response = self.client.get(reverse('main:projects'), {'tech': 'Java'})
+        self.assertContains(response, 'Java app')
+        self.assertNotContains(response, 'Frontend')
+
+    def test_migration_backfill(self):
+        self.project('Web', 'Python, Django')
+        Project.tech_catalogue.through.objects.all().delete()
+        Technology.objects.all().delete()
+        migration = importlib.import_module('main.migrations.0003_technology_catalogue')
+        migration.backfill_technologies(django_apps, None)
+        self.assertEqual(self.catalogue(), ['Django', 'Python'])
+        self.assertEqual(Project.objects.get().tech_catalogue.count(), 2)
+
+
+class TransferTests(TestCase):
+    """export_portfolio / import_portfolio round-trip content and upsert by primary key"""
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.directory = directory
+        about = About.get_solo()
+        about.name = 'Ada'
+        about.save()
+        self.project = Project.objects.create(
+            title='Web', description='d', technologies='Python, Django', date_created=date(2024, 1, 1),
+            image_renditions={'name': 'projects/a.png', 'webp': [[100, 'projects/renditions/a-100w.webp']]})
+        self.experience = Experience.objects.create(company='Acme', position='Dev', start_date=date(2020, 1, 1),
+                                                    description='d')
+        Skill.objects.create(name='Python', category='languages', proficiency=4)
+
+    def snapshot(self):
+        return {model._meta.model_name: list(model.objects.order_by('pk').values(
+                    'pk', *[f.attname for f in transfer.export_fields(model)]))
+                for model in transfer.MODELS}
+
+    def delete_content(self):
+        for model in (Project, Experience, Skill):
+            model.objects.all().delete()
+
+    def round_trip(self, output, fmt):
+        before = self.snapshot()
+        call_command('export_portfolio', output, format=fmt, stdout=StringIO())
+        self.delete_content()
+        call_command('import_portfolio', output, stdout=StringIO())
+        self.assertEqual(self.snapshot(), before)
+        # Derived data is rebuilt from the imported rows
+        self.assertEqual(list(Technology.objects.values_list('name', flat=True)), ['Django', 'Python'])
+        if search.is_available():
+            self.assertEqual(search.filter_queryset(Project.objects.all(), 'Web').get(), self.project)
+
+    def test_jsonl_round_trip(self):
+        self.round_trip(f'{self.directory}/portfolio.jsonl', 'jsonl')
+
+    def test_csv_round_trip(self):
+        self.round_trip(f'{self.directory}/csv', 'csv')
+        self.assertIsNone(Experience.objects.get().end_date)
+
+    def test_reimport_updates_rows_in_place(self):
+        path = f'{self.directory}/portfolio.jsonl'
+        call_command('export_portfolio', path, stdout=StringIO())
+        Project.objects.filter(pk=self.project.pk).update(title='Renamed', technologies='Go')
+        call_command('import_portfolio', path, stdout=StringIO())
+        call_command('import_portfolio', path, stdout=StringIO())
+        self.assertEqual(Project.objects.count(), 1)
+        self.assertEqual(Experience.objects.count(), 1)
+        project = Project.objects.get()
+        self.assertEqual((project.pk, project.title), (self.project.pk, 'Web'))
+        self.assertEqual(list(project.tech_catalogue.values_list('name', flat=True)), ['Django', 'Python'])
+
+    def test_import_drops_cached_admin_choices(self):
+        path = f'{self.directory}/portfolio.jsonl'
+        call_command('export_portfolio', path, stdout=StringIO())
+        key = admin_tools._choices_key(Experience, 'company')
+        cache.set(key, ['Stale'])
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('import_portfolio', path, stdout=StringIO())
+        self.assertIsNone(cache.get(key))
+
+    def test_bad_rows_raise_command_error(self):
+        bad_rows = {
+            'unknown model': {'model': 'user', 'pk': 1, 'fields': {}},
+            'invalid date': {'model': 'experience', 'pk': 9, 'fields': {'company': 'X', 'position': 'Y',
+                                                                         'start_date': 'not a date'}},
+        }
+        for label, record in bad_rows.items():
+            with self.subTest(label):
+                path = f'{self.directory}/bad.jsonl'
+                with open(path, 'w', encoding='utf-8') as fh:
+                    fh.write(json.dumps(record) + '\n')
+                with self.assertRaisesMessage(CommandError, 'Invalid import data'):
+                    call_command('import_portfolio', path, stdout=StringIO())
+        self.assertEqual(Experience.objects.count(), 1)
+
+        with self.assertRaisesMessage(CommandError, 'does not exist'):
+            call_command('import_portfolio', f'{self.directory}/missing.jsonl', stdout=StringIO())
+
+    def test_bad_row_rolls_back_the_whole_import(self):
+        path = f'{self.directory}/portfolio.jsonl'
+        call_command('export_portfolio', path, stdout=StringIO())
+        with open(path, 'a', encoding='utf-8') as fh:
+            fh.write(json.dumps({'model': 'experience', 'pk': 9, 'fields': {'start_date': 'not a date'}}) + '\n')
+        Project.objects.filter(pk=self.project.pk).update(title='Renamed')
+
+        # Earlier batches were already written when the bad row is read
+        with self.assertRaises(CommandError):
+            call_command('import_portfolio', path, batch_size=1, stdout=StringIO())
+        project = Project.objects.get()
+        self.assertEqual(project.title, 'Renamed')
+        self.assertEqual(list(project.tech_catalogue.values_list('name', flat=True)), ['Django', 'Python'])
+
+
+class StaticExportTests(TransactionTestCase):
+    """export_static writes every public page and re-renders only what changed"""
+
+    def setUp(self):
+        cache.clear()
+        sample_data.generate(projects=3, experiences=1, educations=1, certificates=1, skills=2)
+        self.output = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output)
+
+    def export(self):
+        out = StringIO()
+        call_command('export_static', output=self.output, skip_assets=True, stdout=out)
+        return out.getvalue()
+
+    def test_incremental_rebuild_skips_unchanged_pages(self):
+        techs = Technology.objects.count()
+        self.assertIn(f'Rendered {7 + techs + 1} page(s)', self.export())
+        home = f'{self.output}/index.html'
+        home_mtime = os.stat(home).st_mtime_ns
+
+        self.assertIn('Rendered 0 page(s)', self.export())
+
+        skill = Skill.objects.first()
+        skill.name = 'Renamed skill'
+        skill.save()
+        # resume, resume.json and sitemap.xml render skills; nothing else does
+        self.assertIn('Rendered 3 page(s)', self.export())
+        self.assertEqual(os.stat(home).st_mtime_ns, home_mtime)
+        with open(f'{self.output}/resume/index.html', encoding='utf-8') as fh:
+            self.assertIn('Renamed skill', fh.read())
+
+    def test_async_views(self):
+        with benchmark.serving_mode(True):
+            self.assertTrue(asyncio.iscoroutinefunction(resolve(reverse('main:home')).func))
+            self.export()
+        with open(f'{self.output}/index.html', encoding='utf-8') as fh:
+            self.assertIn('<html', fh.read())
+        with open(f'{self.output}/resume.json', encoding='utf-8') as fh:
+            self.assertIn('basics', json.load(fh))
+
+
+class JsonResumeTests(TestCase):
+    """resume.json follows the JSON Resume schema and revalidates like the HTML pages"""
+
+    def setUp(self):
+        cache.clear()
+        about = About.get_solo()
+        about.name = 'Ada Lovelace'
+        about.tagline = 'Engineer'
+        about.github_url = 'https://github.com/ada/'
+        about.save()
+        Experience.objects.create(company='Acme', position='Dev', start_date=date(2020, 1, 1),
+                                  description='Built things', achievements='Shipped\n\nScaled')
+        Education.objects.create(institution='Uni', degree='BSc', field_of_study='CS', start_date=date(2015, 9, 1),
+                                 end_date=date(2019, 6, 30))
+        Skill.objects.create(name='Python', category='languages', proficiency=4)
+        self.url = reverse('main:resume_json')
+
+    @override_settings(SITE_URL='https://ada.example/')
+    def test_schema_shape(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        resume = response.json()
+        self.assertEqual(set(resume), {'$schema', 'basics', 'work', 'education', 'certificates', 'skills', 'meta'})
+        self.assertEqual(resume['basics']['name'], 'Ada Lovelace')
+        self.assertEqual(resume['basics']['url'], 'https://ada.example/')
+        self.assertEqual(resume['basics']['profiles'],
+                         [{'network': 'GitHub', 'username': 'ada', 'url': 'https://github.com/ada/'}])
+        # Empty values are left out rather than sent as nulls
+        self.assertEqual(resume['work'], [{'name': 'Acme', 'position': 'Dev', 'startDate': '2020-01-01',
+                                           'summary': 'Built things', 'highlights': ['Shipped', 'Scaled']}])
+        self.assertEqual(resume['education'][0]['endDate'], '2019-06-30')
+        self.assertEqual(resume['certificates'], [])
+        self.assertEqual(resume['skills'], [{'name': 'Python', 'level': 'Expert',
+                                             'keywords': ['Programming Languages']}])
+        self.assertEqual(resume['meta']['canonical'], 'https://ada.example/resume.json')
+
+    def test_conditional_get_and_invalidation(self):
+        first = self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        # Projects are not part of the resume
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(title='P', description='d', technologies='Go', date_created=date(2024, 1, 1))
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Certificate.objects.create(title='AWS', issuing_organization='Amazon', issue_date=date(2023, 5, 1))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(response.json()['certificates'],
+                         [{'name': 'AWS', 'date': '2023-05-01', 'issuer': 'Amazon'}])
+
+
+class ProjectsFeedTests(TestCase):
+    """The Atom feed lists the newest projects and revalidates like the HTML pages"""
+
+    ATOM = '{http://www.w3.org/2005/Atom}'
+
+    def setUp(self):
+        cache.clear()
+        about = About.get_solo()
+        about.name = 'Ada'
+        about.save()
+        self.url = reverse('main:projects_feed')
+
+    def project(self, title, created, **fields):
+        return Project.objects.create(title=title, description='d', technologies='Python, Django',
+                                      date_created=created, **fields)
+
+    def entries(self, response):
+        root = ElementTree.fromstring(response.content)
+        return root, root.findall(f'{self.ATOM}entry')
+
+    def test_feed_shape(self):
+        old = self.project('Old', date(2022, 1, 1), demo_link='https://demo.example/old')
+        new = self.project('New', date(2024, 1, 1))
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'application/atom+xml; charset=utf-8')
+        root, entries = self.entries(response)
+        self.assertEqual(root.findtext(f'{self.ATOM}title'), 'Ada – Projects')
+        self.assertEqual([entry.findtext(f'{self.ATOM}title') for entry in entries], ['New', 'Old'])
+
+        projects_url = f"http://testserver{reverse('main:projects')}"
+        newest = entries[0]
+        self.assertEqual(newest.findtext(f'{self.ATOM}id'), f'{projects_url}#project-{new.pk}')
+        self.assertEqual(newest.find(f'{self.ATOM}link').get('href'), f'{projects_url}#project-{new.pk}')
+        self.assertEqual(newest.findtext(f'{self.ATOM}published'), '2024-01-01T00:00:00+00:00')
+        self.assertEqual([c.get('term') for c in newest.findall(f'{self.ATOM}category')], ['Python', 'Django'])
+        self.assertEqual(entries[1].find(f'{self.ATOM}link').get('href'), old.demo_link)
+
+    def test_conditional_get_and_invalidation(self):
+        self.project('First', date(2024, 1, 1))
+        first = self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        # Resume content is not part of the feed
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(name='Go', category='languages', proficiency=3)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project('Second', date(2024, 2, 1))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([entry.findtext(f'{self.ATOM}title') for entry in self.entries(response)[1]],
+                         ['Second', 'First'])
+
+        # The feed title comes from About
+        about = About.get_solo()
+        about.name = 'Ada L'
+        with self.captureOnCommitCallbacks(execute=True):
+            about.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(self.entries(response)[0].findtext(f'{self.ATOM}title'), 'Ada L – Projects')
+
+
+class SitemapTests(TestCase):
+    """sitemap.xml lists the public pages and one projects listing per technology, with lastmod"""
+
+    NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+    def setUp(self):
+        cache.clear()
+        About.get_solo()
+
+    def urls(self):
+        response = self.client.get(reverse('main:sitemap'))
+        self.assertEqual(response['Content-Type'], 'application/xml')
+        root = ElementTree.fromstring(response.content)
+        return {url.findtext(f'{self.NS}loc'): url.findtext(f'{self.NS}lastmod')
+                for url in root.findall(f'{self.NS}url')}
+
+    def test_sitemap_lists_pages_and_technologies(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(title='Web', description='d', technologies='Python, Django',
+                                   date_created=date(2024, 1, 1))
+            newer = Project.objects.create(title='CLI', description='d', technologies='Python',
+                                           date_created=date(2024, 2, 1))
+        urls = self.urls()
+        projects_url = f"http://testserver{reverse('main:projects')}"
+        self.assertEqual(list(urls), [f'http://testserver{reverse(f"main:{name}")}'
+                                      for name in ('home', 'projects', 'resume', 'contact')]
+                         + [f'{projects_url}?tech=Django', f'{projects_url}?tech=Python'])
+        self.assertTrue(all(urls.values()))
+        self.assertEqual(urls[f'{projects_url}?tech=Python'], newer.updated_at.isoformat())
+
+        # A project edit moves the lastmod of its technologies
+        newer.title = 'CLI 2'
+        with self.captureOnCommitCallbacks(execute=True):
+            newer.save()
+        newer.refresh_from_db()
+        self.assertEqual(self.urls()[f'{projects_url}?tech=Python'], newer.updated_at.isoformat())
+
+
+class StaticFilesTests(SimpleTestCase):
+    """Collected static files are served by WhiteNoise, compressed and cached for good, on both middleware paths"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        static_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, static_root)
+        storages = {**settings.STORAGES,
+                    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'}}
+        overrides = override_settings(STATIC_ROOT=static_root, STORAGES=storages)
+        overrides.enable()
+        cls.addClassCleanup(overrides.disable)
+        # The admin's own files would only slow the compression down
+        call_command('collectstatic', interactive=False, verbosity=0, ignore_patterns=['admin'])
+        cls.url = staticfiles_storage.url('css/style.css')
+        cls.factory = RequestFactory()
+
+    def assertServedForever(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'max-age=315360000, public, immutable')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response['Content-Type'], 'text/css; charset="utf-8"')
+
+    def test_serves_fingerprinted_files(self):
+        self.assertNotEqual(self.url, '/static/css/style.css')
+        middleware = StaticFilesMiddleware(lambda request: HttpResponse(status=404))
+        self.assertServedForever(middleware(self.factory.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br')))
+        self.assertEqual(middleware(self.factory.get('/projects/')).status_code, 404)
+
+    def test_async_path(self):
+        async def get_response(request):
+            return HttpResponse(status=404)
+
+        async def fetch():
+            middleware = StaticFilesMiddleware(get_response)
+            response = await middleware(self.factory.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br'))
+            body = b''.join([chunk async for chunk in response.streaming_content])
+            return response, body
+
+        response, body = async_to_sync(fetch)()
+        self.assertServedForever(response)
+        self.assertTrue(body)
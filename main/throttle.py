@@ -0,0 +1,186 @@
+"""
+Per-client request throttling.
+
+``ThrottleMiddleware`` gives every client IP a token bucket for the whole
+site (the ``'*'`` rule) and one per URL name listed in
+``settings.THROTTLE_RULES``. A rule ``(burst, per_minute)`` lets a client
+make ``burst`` requests at once, then ``per_minute`` a minute as the bucket
+refills. Clients with an empty bucket get a bodyless 429 with
+``Retry-After`` before any session, database or template work is done.
+
+Buckets live in the default cache so that every worker process shares them
+(use Redis or Memcached in production; LocMemCache is per process). Counting
+relies on the backend's atomic ``add``/``incr``, which the file and database
+caches emulate with a read and a write (``check --deploy`` reports main.E002
+for them). Those are the only atomic operations, so a bucket is kept as two
+fixed-window counters, each window lasting one full refill
+(``burst / rate``): the previous window's count decays linearly while the
+current one fills, which drains at exactly the refill rate. A bucket that
+rejects a request keeps its tokens.
+"""
+
+import ipaddress
+import math
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+
+KEY_PREFIX = 'throttle'
+
+SITE_RULE = '*'
+
+
+def client_ip(request):
+    """Client address, taken from X-Forwarded-For behind THROTTLE_PROXY_COUNT trusted proxies"""
+    proxies = getattr(settings, 'THROTTLE_PROXY_COUNT', 0)
+    address = request.META.get('REMOTE_ADDR', '')
+    if proxies:
+        forwarded = [part.strip() for part in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if part.strip()]
+        if len(forwarded) >= proxies:
+            address = forwarded[-proxies]
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return address
+    if ip.version == 6:
+        # One IPv6 client usually owns a whole /64
+        return str(ipaddress.ip_network(f'{ip}/64', strict=False).network_address)
+    return str(ip)
+
+
+class TokenBucket:
+    """A (burst, per_minute) bucket for one rule and client"""
+
+    def __init__(self, rule, client, burst, per_minute):
+        self.burst = burst
+        self.window = burst * 60 / per_minute
+        self.prefix = f'{KEY_PREFIX}:{rule}:{client}'
+
+    def _keys(self, now):
+        index = int(now // self.window)
+        return f'{self.prefix}:{index - 1}', f'{self.prefix}:{index}', (now % self.window) / self.window
+
+    def _level(self, previous, current, elapsed):
+        return previous * (1 - elapsed) + current
+
+    def wait(self, counts, now):
+        """Seconds until a token is available, given the ``get_many`` of both windows (0 if one is)"""
+        previous_key, current_key, elapsed = self._keys(now)
+        previous, current = counts.get(previous_key, 0), counts.get(current_key, 0)
+        if self._level(previous, current, elapsed) + 1 > self.burst:
+            return self._retry_after(previous, current, elapsed)
+        return 0
+
+    def spend(self, counts, now):
+        """Take the token ``wait`` found; return 0, or seconds to wait if a concurrent request got it first"""
+        previous_key, current_key, elapsed = self._keys(now)
+        previous = counts.get(previous_key, 0)
+        # Both windows must outlive the current one
+        if cache.add(current_key, 1, timeout=math.ceil(2 * self.window) + 1):
+            current = 1
+        else:
+            try:
+                current = cache.incr(current_key)
+            except ValueError:
+                cache.set(current_key, 1, timeout=math.ceil(2 * self.window) + 1)
+                current = 1
+        if self._level(previous, current, elapsed) > self.burst:
+            # Lost a race with another request from the same client: give the token back
+            self.refund(now)
+            return self._retry_after(previous, current - 1, elapsed)
+        return 0
+
+    def refund(self, now):
+        try:
+            cache.decr(self._keys(now)[1])
+        except ValueError:
+            # The window expired in between
+            pass
+
+    def take(self, now=None):
+        """Take a token; return 0 if one was available, else seconds until one is"""
+        now = time.time() if now is None else now
+        counts = cache.get_many(self._keys(now)[:2])
+        return self.wait(counts, now) or self.spend(counts, now)
+
+    def _retry_after(self, previous, current, elapsed):
+        excess = self._level(previous, current, elapsed) + 1 - self.burst
+        remaining = previous * (1 - elapsed)
+        if previous and excess <= remaining:
+            # The previous window alone drains enough
+            return excess * self.window / previous
+        # Wait for the current window to roll over and start draining
+        return (1 - elapsed) * self.window + max(0, current + 1 - self.burst) * self.window / max(current, 1)
+
+
+def rules_for(url_name):
+    """(rule, burst, per_minute) for the site-wide bucket and the route's own, if any"""
+    rules = getattr(settings, 'THROTTLE_RULES', {})
+    return [(name, *rules[name]) for name in (SITE_RULE, url_name) if name in rules]
+
+
+def check(request):
+    """Return seconds the client must wait, or 0 if the request may proceed"""
+    try:
+        url_name = resolve(request.path_info).view_name
+    except Resolver404:
+        url_name = None
+    client = client_ip(request)
+    now = time.time()
+    buckets = [TokenBucket(rule, client, burst, per_minute) for rule, burst, per_minute in rules_for(url_name)]
+    counts = cache.get_many([key for bucket in buckets for key in bucket._keys(now)[:2]])
+    # Check every bucket before spending, so one that rejects the request doesn't drain the others
+    wait = max((bucket.wait(counts, now) for bucket in buckets), default=0)
+    if wait:
+        return wait
+    spent = []
+    for bucket in buckets:
+        wait = bucket.spend(counts, now)
+        if wait:
+            for earlier in spent:
+                earlier.refund(now)
+            return wait
+        spent.append(bucket)
+    return 0
+
+
+def too_many_requests(wait):
+    response = HttpResponse(status=429)
+    response['Retry-After'] = str(max(1, math.ceil(wait)))
+    response['Cache-Control'] = 'no-store'
+    # Don't write a django.request warning per rejected request during a flood
+    response._has_been_logged = True
+    return response
+
+
+class ThrottleMiddleware:
+    """Answer clients that exhausted a token bucket with 429 Too Many Requests"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if getattr(settings, 'THROTTLE_ENABLED', True):
+            wait = check(request)
+            if wait:
+                return too_many_requests(wait)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if getattr(settings, 'THROTTLE_ENABLED', True):
+            # One thread hop for all cache round trips
+            wait = await sync_to_async(check)(request)
+            if wait:
+                return too_many_requests(wait)
+        return await self.get_response(request)
@@ -0,0 +1,200 @@
+"""
+Streaming import/export of portfolio content.
+
+Exports write one record per row, reading each table with a server-side
+iterator, so memory use does not grow with the row count:
+
+* JSON Lines: one file, ``{"model": "project", "pk": 1, "fields": {...}}`` per line
+* CSV: a directory with one ``<model>.csv`` per model, ``id`` first
+
+Imports read the same formats in batches and upsert each batch with a single
+``bulk_create(update_conflicts=True)``, so re-importing a file updates rows in
+place. The whole import is one transaction: a bad row leaves the database as
+it was. File fields are exported as their storage names; copy MEDIA_ROOT
+alongside the export. Derived data (technology catalogue, search index, page
+cache, About cache, admin filter choices) is refreshed once after the import.
+"""
+
+import csv
+import json
+from functools import partial
+from pathlib import Path
+
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+
+from . import cache as page_cache
+from . import admin_tools, sample_data, search
+from .models import Project, Experience, Education, Certificate, Skill, About, Technology
+
+MODELS = [About, Project, Experience, Education, Certificate, Skill]
+MODELS_BY_NAME = {model._meta.model_name: model for model in MODELS}
+
+# Maintained automatically and never exported
+SKIPPED_FIELDS = {'id', 'created_at', 'updated_at'}
+
+BATCH_SIZE = 1000
+CHUNK_SIZE = 2000
+
+
+def export_fields(model):
+    """Concrete fields that are written to and read from exports"""
+    return [f for f in model._meta.concrete_fields if f.name not in SKIPPED_FIELDS]
+
+
+def iter_rows(model):
+    """Yield (pk, {field name: python value}) for every row, streamed from the database"""
+    fields = export_fields(model)
+    queryset = model.objects.order_by('pk').values_list('pk', *[f.attname for f in fields])
+    for row in queryset.iterator(chunk_size=CHUNK_SIZE):
+        yield row[0], {f.name: value for f, value in zip(fields, row[1:])}
+
+
+def _csv_value(field, value):
+    if value is None:
+        return ''
+    if isinstance(field, models.JSONField):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def _from_csv(field, value):
+    if value == '' and field.null:
+        return None
+    if isinstance(field, models.JSONField):
+        return json.loads(value) if value else field.get_default()
+    return value
+
+
+def export_jsonl(path):
+    """Write every model to a JSON Lines file; returns {model name: rows}"""
+    counts = {}
+    with open(path, 'w', encoding='utf-8') as fh:
+        for model in MODELS:
+            name = model._meta.model_name
+            counts[name] = 0
+            for pk, fields in iter_rows(model):
+                fh.write(json.dumps({'model': name, 'pk': pk, 'fields': fields}, cls=DjangoJSONEncoder))
+                fh.write('\n')
+                counts[name] += 1
+    return counts
+
+
+def export_csv(directory):
+    """Write one CSV file per model into a directory; returns {model name: rows}"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    counts = {}
+    for model in MODELS:
+        name = model._meta.model_name
+        fields = export_fields(model)
+        counts[name] = 0
+        with open(directory / f'{name}.csv', 'w', encoding='utf-8', newline='') as fh:
+            writer = csv.writer(fh)
+            writer.writerow(['id'] + [f.name for f in fields])
+            for pk, values in iter_rows(model):
+                writer.writerow([pk] + [_csv_value(f, values[f.name]) for f in fields])
+                counts[name] += 1
+    return counts
+
+
+def read_jsonl(path):
+    """Yield (model, pk, raw field dict) from a JSON Lines export"""
+    with open(path, encoding='utf-8') as fh:
+        for line_number, line in enumerate(fh, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            try:
+                model = MODELS_BY_NAME[record['model']]
+            except KeyError:
+                raise ValueError(f"Line {line_number}: unknown model {record.get('model')!r}")
+            yield model, record['pk'], record['fields']
+
+
+def read_csv(directory):
+    """Yield (model, pk, raw field dict) from a directory of CSV exports"""
+    directory = Path(directory)
+    for model in MODELS:
+        path = directory / f'{model._meta.model_name}.csv'
+        if not path.exists():
+            continue
+        fields = {f.name: f for f in export_fields(model)}
+        with open(path, encoding='utf-8', newline='') as fh:
+            for row in csv.DictReader(fh):
+                pk = row.pop('id')
+                yield model, int(pk), {
+                    name: _from_csv(fields[name], value) for name, value in row.items() if name in fields
+                }
+
+
+def _build(model, pk, raw_fields):
+    fields = {f.name: f for f in export_fields(model)}
+    values = {}
+    for name, value in raw_fields.items():
+        field = fields.get(name)
+        if field is None:
+            continue
+        if isinstance(field, models.FileField):
+            values[name] = value or ''
+        elif isinstance(field, models.JSONField):
+            values[name] = value if value is not None else field.get_default()
+        else:
+            values[name] = field.to_python(value)
+    return model(pk=pk, **values)
+
+
+def _flush(model, batch):
+    """Upsert one batch of instances of a model"""
+    update_fields = [f.name for f in export_fields(model)] + ['updated_at']
+    model.objects.bulk_create(batch, update_conflicts=True, unique_fields=['id'], update_fields=update_fields)
+    if model is Project:
+        # Relink these projects from their (possibly changed) technologies afterwards
+        Project.tech_catalogue.through.objects.filter(project_id__in=[obj.pk for obj in batch]).delete()
+
+
+def import_records(records, batch_size=BATCH_SIZE):
+    """Upsert (model, pk, fields) records in batches, in one transaction; returns {model name: rows}"""
+    counts = {}
+    batches = {}
+    with transaction.atomic():
+        for model, pk, raw_fields in records:
+            batch = batches.setdefault(model, [])
+            batch.append(_build(model, pk, raw_fields))
+            counts[model._meta.model_name] = counts.get(model._meta.model_name, 0) + 1
+            if len(batch) >= batch_size:
+                _flush(model, batch)
+                batches[model] = []
+        for model, batch in batches.items():
+            if batch:
+                _flush(model, batch)
+
+        _refresh_derived_data(list(batches))
+    return counts
+
+
+def _refresh_derived_data(imported_models):
+    # Let auto-increment continue after the imported primary keys (no-op on SQLite)
+    sequence_sql = connection.ops.sequence_reset_sql(no_style(), list(imported_models))
+    if sequence_sql:
+        with connection.cursor() as cursor:
+            for sql in sequence_sql:
+                cursor.execute(sql)
+
+    if Project in imported_models:
+        sample_data.sync_technology_catalogue()
+        Technology.prune_unused()
+    search.rebuild([apps.get_model('main', name) for name in search.INDEXED_FIELDS])
+    transaction.on_commit(partial(_invalidate_caches, imported_models))
+
+
+def _invalidate_caches(imported_models):
+    About.bump_solo_version()
+    for model_name in page_cache.VIEW_DEPENDENCIES:
+        page_cache.invalidate_model(model_name)
+    for model in imported_models:
+        admin_tools.invalidate_choices(model)
@@ -1,12 +1,21 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 
 app_name = 'main'
 
+# ASGI deployments serve the async versions of the public views
+public = async_views if getattr(settings, 'ASYNC_VIEWS', False) else views
+
 urlpatterns = [
-    path('', views.home, name='home'),
-    path('projects/', views.projects, name='projects'),
-    path('resume/', views.resume, name='resume'),
-    path('contact/', views.contact, name='contact'),
+    path('', public.home, name='home'),
+    path('projects/', public.projects, name='projects'),
+    path('projects/feed.xml', views.projects_feed, name='projects_feed'),
+    path('resume/', public.resume, name='resume'),
+    path('resume.json', public.resume_json, name='resume_json'),
+    path('contact/', public.contact, name='contact'),
+    path('search/', public.search, name='search'),
+    path('sitemap.xml', views.sitemap, name='sitemap'),
+    path('metrics', views.metrics, name='metrics'),
+    path('analytics/click', views.track_click, name='track_click'),
 ]
-
@@ -1,6 +1,19 @@
-from django.shortcuts import render
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.shortcuts import redirect, render
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
+from django.views.decorators.http import require_POST
 from django.views.defaults import page_not_found, server_error
-from .models import Project, Experience, Education, Skill, About, Certificate
+from . import analytics, feeds, json_resume
+from . import search as search_index
+from . import metrics as request_metrics
+from .cache import cache_page_view
+from .conditional import conditional_view
+from .forms import ContactForm
+from .models import Project, Experience, Education, Skill, About, Certificate, Technology
 
 
 def custom_404(request, exception):
@@ -13,6 +26,8 @@ def custom_500(request):
     return render(request, '500.html', status=500)
 
 
+@conditional_view('home')
+@cache_page_view('home')
 def home(request):
     """Homepage with intro and featured projects"""
     about = About.get_solo()
@@ -25,6 +40,8 @@ def home(request):
     return render(request, 'home.html', context)
 
 
+@conditional_view('projects')
+@cache_page_view('projects')
 def projects(request):
     """Projects page with all projects and filtering"""
     all_projects = Project.objects.all()
@@ -32,15 +49,12 @@ def projects(request):
     # Get filter parameter
     tech_filter = request.GET.get('tech', '')
     
-    # Filter by technology if specified
+    # Filter by technology if specified (exact match on the catalogue)
     if tech_filter:
-        all_projects = all_projects.filter(technologies__icontains=tech_filter)
+        all_projects = all_projects.filter(tech_catalogue__name=tech_filter)
     
     # Get all unique technologies for filter dropdown
-    all_techs = set()
-    for project in Project.objects.all():
-        all_techs.update(project.get_tech_list())
-    all_techs = sorted(all_techs)
+    all_techs = list(Technology.objects.values_list('name', flat=True))
     
     context = {
         'projects': all_projects,
@@ -50,6 +64,8 @@ def projects(request):
     return render(request, 'projects.html', context)
 
 
+@conditional_view('resume')
+@cache_page_view('resume')
 def resume(request):
     """Resume page with experience, education, certificates, and skills"""
     experiences = Experience.objects.all()
@@ -76,11 +92,98 @@ def resume(request):
     return render(request, 'resume.html', context)
 
 
+@conditional_view('resume_json')
+@cache_page_view('resume_json')
+def resume_json(request):
+    """Resume in the JSON Resume schema, for recruiters' tools and other sites"""
+    resume = json_resume.build(
+        About.get_solo(),
+        Experience.objects.all(),
+        Education.objects.all(),
+        Certificate.objects.all(),
+        Skill.objects.all(),
+        json_resume.base_url(request),
+    )
+    return HttpResponse(json_resume.dumps(resume), content_type='application/json')
+
+
+def contact_sent_url():
+    return f"{reverse('main:contact')}?sent=1#contact-form"
+
+
+# The cached page cannot embed a per-visitor CSRF token, so main.js copies it
+# into the form from the cookie that ensure_csrf_cookie sets on every response
+@ensure_csrf_cookie
+@conditional_view('contact')
+@cache_page_view('contact')
 def contact(request):
-    """Contact page with contact information"""
+    """Contact page with contact information and a form queued for background delivery"""
+    form = ContactForm(request.POST or None)
+    if request.method == 'POST' and form.is_valid():
+        if not form.is_spam():
+            # Stored only; main.mailqueue emails it outside the request
+            form.save()
+        return redirect(contact_sent_url())
+
     about = About.get_solo()
     
     context = {
         'about': about,
+        'form': form,
+        'sent': 'sent' in request.GET,
     }
     return render(request, 'contact.html', context)
+
+
+@conditional_view('sitemap')
+@cache_page_view('sitemap')
+def sitemap(request):
+    """sitemap.xml with the public pages and every ?tech= projects listing"""
+    return HttpResponse(feeds.render_sitemap(json_resume.base_url(request)), content_type='application/xml')
+
+
+@conditional_view('projects_feed')
+@cache_page_view('projects_feed')
+def projects_feed(request):
+    """Atom feed of projects, newest first"""
+    return HttpResponse(feeds.render_projects_feed(json_resume.base_url(request)),
+                        content_type='application/atom+xml; charset=utf-8')
+
+
+def search(request):
+    """Full-text search across projects, experience, certificates and skills"""
+    query = request.GET.get('q', '').strip()
+    results = search_index.search(query) if query else []
+    
+    context = {
+        'query': query,
+        'results': results,
+    }
+    return render(request, 'search.html', context)
+
+
+def metrics(request):
+    """Prometheus metrics for this worker process"""
+    token = settings.METRICS_TOKEN
+    if token:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        # compare_digest only takes ASCII str; headers may carry anything
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+    elif not settings.DEBUG:
+        raise Http404
+    return HttpResponse(request_metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@csrf_exempt
+@require_POST
+def track_click(request):
+    """Count a click on a project link, reported by main.js with navigator.sendBeacon"""
+    project_id = analytics.parse_project_id(request.POST.get('project', ''))
+    link = request.POST.get('link')
+    if project_id is None or link not in analytics.CLICK_LINKS:
+        return HttpResponse(status=400)
+    if getattr(settings, 'ANALYTICS_ENABLED', True) and not analytics.is_bot(request):
+        # Counted in memory; unknown project ids are dropped when the buffer is flushed
+        analytics.record_click(project_id, link)
+    return HttpResponse(status=204)
@@ -5,6 +5,14 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+
+Served with uvicorn, e.g.::
+
+    uvicorn portfolio_project.asgi:application --workers 4 --lifespan off
+
+Under ASGI the public views default to their async versions (``ASYNC_VIEWS``).
+With ``EARLY_HINTS`` on, servers supporting the ASGI Early Hints extension
+(e.g. Hypercorn) also send 103 responses listing the page's critical assets.
 """
 
 import os
@@ -12,5 +20,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_project.settings')
+os.environ.setdefault('ASYNC_VIEWS', 'True')
+
+django_application = get_asgi_application()
+
+from main.preload import EarlyHintsMiddleware  # noqa: E402  (needs the app registry)
 
-application = get_asgi_application()
+application = EarlyHintsMiddleware(django_application)
@@ -44,13 +44,20 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'main.metrics.RequestMetricsMiddleware',
+    'main.routers.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'main.middleware.StaticFilesMiddleware',
+    'main.throttle.ThrottleMiddleware',
+    'main.compression.CompressionMiddleware',
+    'main.analytics.AnalyticsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'main.preload.PreloadMiddleware',
 ]
 
 ROOT_URLCONF = 'portfolio_project.urls'
@@ -77,13 +84,184 @@ WSGI_APPLICATION = 'portfolio_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# SQLite connection tuning, applied to every new connection. WAL lets readers
+# run alongside a writer, busy_timeout/IMMEDIATE transactions make writers
+# queue instead of failing with "database is locked", and CONN_MAX_AGE keeps
+# connections open across requests. Set SQLITE_TUNING=False for the defaults.
+SQLITE_TUNING = config('SQLITE_TUNING', default=True, cast=bool)
+SQLITE_PRAGMAS = {
+    'journal_mode': config('SQLITE_JOURNAL_MODE', default='WAL'),
+    'synchronous': config('SQLITE_SYNCHRONOUS', default='NORMAL'),
+    'mmap_size': config('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024, cast=int),
+    'cache_size': config('SQLITE_CACHE_SIZE', default=-20000, cast=int),  # negative: KiB
+    'busy_timeout': config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int),  # ms
+    'temp_store': config('SQLITE_TEMP_STORE', default='MEMORY'),
+}
+SQLITE_OPTIONS = {
+    'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+    'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000,
+    'transaction_mode': config('SQLITE_TRANSACTION_MODE', default='IMMEDIATE'),
+} if SQLITE_TUNING else {}
+
+# Database. SQLite by default; DB_ENGINE/DB_NAME/DB_HOST/... select another
+# backend. On PostgreSQL, DB_POOL=True uses psycopg 3's connection pool
+# (pip install "psycopg[pool]") instead of persistent connections.
+DB_ENGINE = config('DB_ENGINE', default='django.db.backends.sqlite3')
+DB_IS_SQLITE = DB_ENGINE == 'django.db.backends.sqlite3'
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=600 if SQLITE_TUNING else 0, cast=int)
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+DB_POOL_OPTIONS = {
+    'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+    'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+    'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+}
+
+
+def database_settings(name, host=''):
+    if DB_IS_SQLITE:
+        return {
+            'ENGINE': DB_ENGINE,
+            'NAME': name,
+            'OPTIONS': SQLITE_OPTIONS,
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': SQLITE_TUNING,
+        }
+    return {
+        'ENGINE': DB_ENGINE,
+        'NAME': name,
+        'USER': config('DB_USER', default=''),
+        'PASSWORD': config('DB_PASSWORD', default=''),
+        'HOST': host,
+        'PORT': config('DB_PORT', default=''),
+        'OPTIONS': {'pool': DB_POOL_OPTIONS} if DB_POOL else {},
+        # Pooled connections are returned to the pool instead of being kept open
+        'CONN_MAX_AGE': 0 if DB_POOL else DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+    }
+
+
 DATABASES = {
+    'default': database_settings(
+        config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3') if DB_IS_SQLITE else 'portfolio'),
+        config('DB_HOST', default=''),
+    ),
+}
+
+# Read replicas (see main/routers.py): comma-separated hosts, or SQLite file
+# paths as local stand-ins refreshed with "manage.py sync_replicas". Public
+# page reads are spread over them; admin requests and anyone who just wrote
+# stay on the primary for REPLICA_STICKY_SECONDS.
+for _number, _replica in enumerate(config('DB_REPLICAS', default='', cast=Csv()), 1):
+    DATABASES[f'replica{_number}'] = {
+        **(database_settings(_replica) if DB_IS_SQLITE else database_settings(DATABASES['default']['NAME'], _replica)),
+        'TEST': {'MIRROR': 'default'},
+    }
+REPLICA_DATABASES = [alias for alias in DATABASES if alias != 'default']
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=5, cast=int)
+DATABASE_ROUTERS = ['main.routers.PrimaryReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+# Page cache versions, the About singleton version and throttle buckets must be
+# shared by every worker process, or edits only reach the worker that saved
+# them. The LocMemCache default is private to one process: deploy with Redis or
+# Memcached ("manage.py check --deploy" fails otherwise, see main/checks.py).
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='portfolio'),
     }
 }
 
+# Absolute site root used where pages need full URLs (resume.json, sitemap,
+# feeds), e.g. https://example.com. Defaults to the host of each request.
+SITE_URL = config('SITE_URL', default='')
+
+# Full-page cache for the public views (see main/cache.py). Edits invalidate
+# pages at once; the timeout only bounds how long unused pages are kept.
+PAGE_CACHE_ENABLED = config('PAGE_CACHE_ENABLED', default=True, cast=bool)
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=5 * 60, cast=int)
+
+# Request instrumentation (see main/metrics.py). Server-Timing is always sent
+# to staff users; SERVER_TIMING_ENABLED sends it to everyone. /metrics needs
+# "Authorization: Bearer <METRICS_TOKEN>" and is disabled without a token
+# outside DEBUG.
+SERVER_TIMING_ENABLED = config('SERVER_TIMING_ENABLED', default=False, cast=bool)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Route the public views to their async versions (main/async_views.py).
+# portfolio_project/asgi.py turns this on unless ASYNC_VIEWS is set;
+# ASYNC_ORM_WORKERS threads run their independent queries in parallel.
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
+ASYNC_ORM_WORKERS = config('ASYNC_ORM_WORKERS', default=8, cast=int)
+
+
+# Rendered pages are minified and sent brotli/gzip compressed (see
+# main/compression.py); compressed copies of cached pages are cached too.
+HTML_MINIFY = config('HTML_MINIFY', default=True, cast=bool)
+COMPRESSION_ENABLED = config('COMPRESSION_ENABLED', default=True, cast=bool)
+
+# Preload hints for critical CSS, fonts, scripts and above-the-fold images
+# (see main/preload.py): "Link: rel=preload" headers on public pages and,
+# with EARLY_HINTS under an ASGI server that supports them, 103 responses.
+PRELOAD_LINKS = config('PRELOAD_LINKS', default=True, cast=bool)
+EARLY_HINTS = config('EARLY_HINTS', default=False, cast=bool)
+
+# Per-client rate limiting (see main/throttle.py). URL name -> (burst, tokens
+# refilled per minute), per client IP; '*' is a site-wide bucket every
+# request also draws from. Buckets are shared through CACHES, so use a shared
+# backend (Redis, Memcached) with more than one worker process. Behind a
+# reverse proxy, set THROTTLE_PROXY_COUNT to the number of proxies that append
+# to X-Forwarded-For.
+THROTTLE_ENABLED = config('THROTTLE_ENABLED', default=True, cast=bool)
+THROTTLE_PROXY_COUNT = config('THROTTLE_PROXY_COUNT', default=0, cast=int)
+THROTTLE_RULES = {
+    '*': (120, 120),
+    'main:projects': (30, 30),
+    'main:search': (20, 20),
+    'main:contact': (20, 10),
+    'admin:login': (10, 2),
+}
+
+# First-party analytics (see main/analytics.py). Page views and project link
+# clicks are counted in memory per worker process and added to the DailyStat
+# table every ANALYTICS_FLUSH_INTERVAL seconds (0 disables the background
+# flush), or sooner once ANALYTICS_MAX_PENDING distinct counters are pending.
+ANALYTICS_ENABLED = config('ANALYTICS_ENABLED', default=True, cast=bool)
+ANALYTICS_FLUSH_INTERVAL = config('ANALYTICS_FLUSH_INTERVAL', default=30, cast=int)
+ANALYTICS_MAX_PENDING = config('ANALYTICS_MAX_PENDING', default=10000, cast=int)
+
+
+# Email
+# https://docs.djangoproject.com/en/5.1/topics/email/
+
+EMAIL_BACKEND = config('EMAIL_BACKEND', default=(
+    'django.core.mail.backends.console.EmailBackend' if DEBUG else 'django.core.mail.backends.smtp.EmailBackend'
+))
+EMAIL_HOST = config('EMAIL_HOST', default='localhost')
+EMAIL_PORT = config('EMAIL_PORT', default=25, cast=int)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=False, cast=bool)
+EMAIL_USE_SSL = config('EMAIL_USE_SSL', default=False, cast=bool)
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=30, cast=int)
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='webmaster@localhost')
+
+# Contact form delivery (see main/mailqueue.py). Submissions are queued in
+# the database and emailed by "manage.py deliver_contact_messages" to
+# CONTACT_RECIPIENTS (default: the About email), CONTACT_MAIL_BATCH_SIZE per
+# connection and at most CONTACT_MAIL_RATE per minute. Failures are retried
+# after CONTACT_MAIL_RETRY_DELAY seconds, doubling each time up to
+# CONTACT_MAIL_MAX_RETRY_DELAY, for CONTACT_MAIL_MAX_ATTEMPTS attempts.
+CONTACT_RECIPIENTS = config('CONTACT_RECIPIENTS', default='', cast=Csv())
+CONTACT_MAIL_BATCH_SIZE = config('CONTACT_MAIL_BATCH_SIZE', default=20, cast=int)
+CONTACT_MAIL_RATE = config('CONTACT_MAIL_RATE', default=30, cast=int)
+CONTACT_MAIL_RETRY_DELAY = config('CONTACT_MAIL_RETRY_DELAY', default=60, cast=int)
+CONTACT_MAIL_MAX_RETRY_DELAY = config('CONTACT_MAIL_MAX_RETRY_DELAY', default=6 * 60 * 60, cast=int)
+CONTACT_MAIL_MAX_ATTEMPTS = config('CONTACT_MAIL_MAX_ATTEMPTS', default=6, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -125,6 +303,26 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'main/static'),
 ]
 
+# Fingerprinted, pre-compressed (gzip + brotli) static files served by WhiteNoise
+# with far-future immutable caching. Needs `collectstatic`, so it is off in DEBUG.
+STATICFILES_MANIFEST = config('STATICFILES_MANIFEST', default=not DEBUG, cast=bool)
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'whitenoise.storage.CompressedManifestStaticFilesStorage'
+            if STATICFILES_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
+# Gives the tests an empty STATIC_ROOT (see main/test_runner.py)
+TEST_RUNNER = 'main.test_runner.TestRunner'
+
 # Media files (User uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')